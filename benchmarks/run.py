@@ -0,0 +1,212 @@
+"""
+Benchmarks of representative SDK workflows against a local stand-in for the modeltest API
+
+Run from the repository root, results are written as JSON for comparison between SDK versions:
+
+    python -m benchmarks.run --samples 100000 --output results.json
+
+Requests go over a local socket by default, use `--transport wsgi` or `--transport asgi` to measure the SDK alone
+with the API called in-process.
+
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+from modeltestsdk import Client, utils
+from modeltestsdk.config import CacheConfig, Config
+from modeltestsdk.transport import ASGITransport, WSGITransport
+from tests.fake_api import FakeAPI, FakeDatabase, serve
+
+
+def measure(func: Callable, repeat: int = 5, setup: Callable = None) -> dict:
+    """
+    Time repeated calls of function.
+
+    Parameters
+    ----------
+    func : Callable
+        Function without arguments, returning the number of items processed (e.g. data points)
+    repeat : int, optional
+        Number of timed calls
+    setup : Callable, optional
+        Function called before each timed call, not included in the timing (e.g. clearing a cache)
+
+    Returns
+    -------
+    dict
+        Wall clock time (s) per call, and throughput (items/s) based on the median time
+    """
+    times, items = [], 0
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        items = func()
+        times.append(time.perf_counter() - start)
+    median = statistics.median(times)
+    return dict(repeat=repeat, items=items, min=min(times), median=median, mean=statistics.mean(times),
+                max=max(times), throughput=items / median if median > 0 else None)
+
+
+def workflows(client: Client, db: FakeDatabase) -> Dict[str, Tuple[Callable, Callable]]:
+    """
+    Representative workflows.
+
+    Parameters
+    ----------
+    client : Client
+        Client connected to the stand-in API
+    db : FakeDatabase
+        Database served by the stand-in API
+
+    Returns
+    -------
+    dict
+        Workflow and setup function (or None) by name, the workflow returns the number of items processed
+    """
+    test = client.floater_test.get()[0]
+    tss = test.timeseries(paginate=True)
+    ts_id = tss[0].id
+    dps = tss.get_data(all_data=True)
+    uploads = {ts.id: db.datapoints[ts.id] for ts in tss[:4]}
+
+    def n_points(data_points) -> int:
+        return sum(len(dp) for dp in data_points)
+
+    def upload() -> int:
+        uploaded = client.timeseries.upload_data_points(uploads)
+        return sum(len(uploads[ts_id][0]) for ts_id, done in uploaded.items() if done)
+
+    # request body of data points with some missing values, and the same values all finite
+    value = np.concatenate([dp.value for dp in dps])
+    value[::100] = np.nan
+    finite = np.nan_to_num(value)
+
+    def to_json_without_orjson() -> int:
+        orjson, utils.orjson = utils.orjson, None
+        try:
+            utils.to_json(dict(data=dict(value=value)))
+        finally:
+            utils.orjson = orjson
+        return len(value)
+
+    def json_dumps() -> int:
+        json.dumps(dict(data=dict(value=finite.tolist())), separators=(",", ":"))
+        return len(finite)
+
+    return {
+        "list_tests": (lambda: len(client.test.get(paginate=True)), None),
+        "list_timeseries": (lambda: len(test.timeseries(paginate=True)), None),
+        "get_data_points_no_cache": (
+            lambda: len(client.timeseries.get_data_points(ts_id, all_data=True, cache=False)), None),
+        "get_data_points_cold_cache": (
+            lambda: len(client.timeseries.get_data_points(ts_id, all_data=True)), client.clear_cache),
+        "get_data_points_warm_cache": (
+            lambda: len(client.timeseries.get_data_points(ts_id, all_data=True)), None),
+        "timeseries_list_get_data": (lambda: n_points(tss.get_data(all_data=True)), client.clear_cache),
+        "to_pandas": (lambda: dps.to_pandas().size, None),
+        "upload_data_points": (upload, None),
+        "to_json_without_orjson": (to_json_without_orjson, None),
+        "json_dumps_finite": (json_dumps, None),
+    }
+
+
+def run(n_sensors: int = 10, n_tests: int = 2, n_samples: int = 10_000, repeat: int = 5, latency: float = 0.,
+        datapoints_format: str = "auto", only: list = None, transport: str = "http") -> dict:
+    """
+    Run benchmarks.
+
+    Parameters
+    ----------
+    n_sensors : int, optional
+        Number of sensors, and time series per test
+    n_tests : int, optional
+        Number of floater tests
+    n_samples : int, optional
+        Number of data points per time series
+    repeat : int, optional
+        Number of timed runs of each workflow
+    latency : float, optional
+        Delay (s) of each response, imitating a remote API
+    datapoints_format : {'auto', 'json', 'npy'}, optional
+        Wire format of data points, see `Config.datapoints_format`
+    only : list, optional
+        Names of the workflows to run, all by default
+    transport : {'http', 'wsgi', 'asgi'}, optional
+        Requests over a local socket, or passed to the API in-process by the WSGI or ASGI transport
+
+    Returns
+    -------
+    dict
+        Parameters, environment and results by workflow
+    """
+    db = FakeDatabase().populate(n_sensors=n_sensors, n_tests=n_tests, n_samples=n_samples)
+    api = FakeAPI(db, latency=latency, binary=datapoints_format != "json")
+    results = dict()
+    transports = dict(http=None, wsgi=WSGITransport(api), asgi=ASGITransport(api.asgi))
+    server = serve(api) if transport == "http" else nullcontext("http://modeltest.local")
+    with server as host, tempfile.TemporaryDirectory() as tmp:
+        config = Config(api_host=host, api_user="benchmark", api_password="benchmark", metrics=True,
+                        datapoints_format=datapoints_format,
+                        cache_settings=CacheConfig(cache_name=f"{tmp}/mtdb", use_cache_dir=False))
+        with Client(config, transport=transports[transport]) as client:
+            for name, (func, setup) in workflows(client, db).items():
+                if only and name not in only:
+                    continue
+                client.reset_stats()
+                results[name] = measure(func, repeat=repeat, setup=setup)
+                results[name]["requests"] = sum(m["count"] for m in client.stats()["requests"].values()) // repeat
+                print(f"{name:<28} median {results[name]['median'] * 1e3:10.2f} ms  "
+                      f"{results[name]['throughput'] or 0:14.0f} items/s", file=sys.stderr)
+
+    try:
+        sdk_version = version("modeltestsdk")
+    except PackageNotFoundError:  # pragma: no cover
+        sdk_version = None
+    return dict(
+        created=datetime.now(timezone.utc).isoformat(),
+        parameters=dict(n_sensors=n_sensors, n_tests=n_tests, n_samples=n_samples, repeat=repeat, latency=latency,
+                        datapoints_format=datapoints_format, transport=transport),
+        environment=dict(modeltestsdk=sdk_version, python=platform.python_version(), numpy=np.__version__,
+                         platform=platform.platform()),
+        results=results,
+    )
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sensors", type=int, default=10, help="sensors, and time series per test")
+    parser.add_argument("--tests", type=int, default=2, help="floater tests")
+    parser.add_argument("--samples", type=int, default=10_000, help="data points per time series")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs of each workflow")
+    parser.add_argument("--latency", type=float, default=0., help="delay (s) of each response")
+    parser.add_argument("--format", choices=("auto", "json", "npy"), default="auto", help="wire format of data points")
+    parser.add_argument("--transport", choices=("http", "wsgi", "asgi"), default="http",
+                        help="requests over a local socket, or to the API in-process")
+    parser.add_argument("--only", nargs="*", help="workflows to run")
+    parser.add_argument("--output", help="JSON file receiving the results, printed if not given")
+    args = parser.parse_args(argv)
+
+    results = run(n_sensors=args.sensors, n_tests=args.tests, n_samples=args.samples, repeat=args.repeat,
+                  latency=args.latency, datapoints_format=args.format, only=args.only,
+                  transport=args.transport)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
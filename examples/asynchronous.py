@@ -0,0 +1,16 @@
+"""
+Fetch data points for all time series of a test concurrently with the asynchronous client.
+"""
+import asyncio
+from modeltestsdk import AsyncClient
+
+
+async def main(test_id: str):
+    async with AsyncClient(max_concurrency=10) as client:
+        timeseries = await client.timeseries.get_by_test_id(test_id)
+        data = await asyncio.gather(*[client.timeseries.get_data_points(ts.id) for ts in timeseries])
+        for dps in data:
+            print(dps.timeseries_id, len(dps))
+
+
+asyncio.run(main(test_id=UUID))
@@ -2,3 +2,4 @@
 Python SDK for inquire modeltest API
 """
 from .client import Client
+from .async_client import AsyncClient
@@ -4,3 +4,5 @@ from .sensor import SensorAPI
 from .timeseries import TimeseriesAPI
 from .tag import TagsAPI
 from .floater_config import FloaterConfigAPI
+from .asynchronous import (AsyncCampaignAPI, AsyncSensorAPI, AsyncTestAPI, AsyncFloaterTestAPI, AsyncWaveCalibrationAPI,
+                           AsyncWindCalibrationAPI, AsyncTimeseriesAPI, AsyncTagsAPI, AsyncFloaterConfigAPI)
@@ -0,0 +1,93 @@
+import functools
+import inspect
+from .campaign import CampaignAPI
+from .test import TestAPI, FloaterTestAPI, WindCalibrationAPI, WaveCalibrationAPI
+from .sensor import SensorAPI
+from .timeseries import TimeseriesAPI
+from .tag import TagsAPI
+from .floater_config import FloaterConfigAPI
+
+
+def _make_async(name: str, func):
+    """Create coroutine function running the synchronous API method in the client's worker pool."""
+    @functools.wraps(func)
+    async def method(self, *args, **kwargs):
+        return await self.client.run(getattr(self.api, name), *args, **kwargs)
+    return method
+
+
+class AsyncBaseAPI:
+    """
+    Base for asynchronous APIs, mirrors every public method of the synchronous API as a coroutine and the iterators
+    as asynchronous generators.
+
+    Parameters
+    ----------
+    client : AsyncClient
+        Asynchronous client
+    api : BaseAPI
+        Synchronous API doing the actual work
+    """
+    api_class = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name, func in inspect.getmembers(cls.api_class, inspect.isfunction):
+            if not name.startswith("_") and not inspect.isgeneratorfunction(func):
+                setattr(cls, name, _make_async(name, func))
+
+    def __init__(self, client, api):
+        self.client = client
+        self.api = api
+
+    async def iter_pages(self, *args, **kwargs):
+        """Iterate over all hits page by page, see `BaseAPI.iter_pages`."""
+        pages = self.api.iter_pages(*args, **kwargs)
+        done = object()
+        while True:
+            page = await self.client.run(next, pages, done)
+            if page is done:
+                return
+            yield page
+
+    async def iter_all(self, *args, **kwargs):
+        """Iterate over all hits, fetching them page by page, see `BaseAPI.iter_all`."""
+        async for page in self.iter_pages(*args, **kwargs):
+            for item in page:
+                yield item
+
+
+class AsyncCampaignAPI(AsyncBaseAPI):
+    api_class = CampaignAPI
+
+
+class AsyncSensorAPI(AsyncBaseAPI):
+    api_class = SensorAPI
+
+
+class AsyncTestAPI(AsyncBaseAPI):
+    api_class = TestAPI
+
+
+class AsyncFloaterTestAPI(AsyncBaseAPI):
+    api_class = FloaterTestAPI
+
+
+class AsyncWaveCalibrationAPI(AsyncBaseAPI):
+    api_class = WaveCalibrationAPI
+
+
+class AsyncWindCalibrationAPI(AsyncBaseAPI):
+    api_class = WindCalibrationAPI
+
+
+class AsyncTimeseriesAPI(AsyncBaseAPI):
+    api_class = TimeseriesAPI
+
+
+class AsyncTagsAPI(AsyncBaseAPI):
+    api_class = TagsAPI
+
+
+class AsyncFloaterConfigAPI(AsyncBaseAPI):
+    api_class = FloaterConfigAPI
@@ -1,12 +1,53 @@
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Type
+
+import requests
+
+from modeltestsdk.concurrency import map_concurrently, BatchError
+from modeltestsdk.query import FilterAttribute, chunk_values
+from modeltestsdk.resources.base import Resource, Resources
+from modeltestsdk.tracing import traced
 from modeltestsdk.utils import format_class_name
+from pydantic import TypeAdapter
+
+
+def _trace_methods(cls):
+    """Record a span of each call to the public methods defined by the API class, if tracing is enabled."""
+    for name, func in list(vars(cls).items()):
+        if inspect.isfunction(func) and not name.startswith("_") and not inspect.isgeneratorfunction(func):
+            setattr(cls, name, traced(f"{cls.__name__}.{name}", cat="api")(func))
+
+
+def _http_status(e: Exception) -> Optional[int]:
+    """int: Status code of a failed request, None if the request failed without response."""
+    if isinstance(e, requests.exceptions.HTTPError) and e.response is not None:
+        return e.response.status_code
+    return None
 
 
 class BaseAPI:
     """Base API with methods common for all APIs."""
 
+    # list of resources returned by `get`
+    _list_type: Type[Resources] = Resources
+    # resource path keying items in the client's identity map, shared by APIs of the same items
+    _identity_path: Optional[str] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _trace_methods(cls)
+
     def __init__(self, client):
         self._resource_path: str = format_class_name(self.__class__.__name__)
         self.client = client
+        # does the API support the set membership filter, unknown until the first batch is fetched
+        self._batch_supported: Optional[bool] = None
+
+    def _build(self, type_: Any, data: list) -> Any:
+        """Build resources of type (e.g. List[Sensor]) bound to the client from the items of a response."""
+        with self.client.tracer.span(f"build {self._resource_path}", cat="model", items=len(data)):
+            return TypeAdapter(type_).validate_python([dict(**i, client=self.client) for i in data])
 
     def delete(self, item_id: str, secret_key: str = None):
         """
@@ -24,6 +65,7 @@ class BaseAPI:
         Deleting items requires administrator privileges.
         """
         resp = self.client.delete(self._resource_path, endpoint=item_id, parameters=dict(secret_key=secret_key))
+        self.client.identity_map.discard(item_id)
         return resp
 
     def update(self, item_id: str, body: dict, secret_key: str = None):
@@ -41,4 +83,224 @@ class BaseAPI:
         """
         resp = self.client.patch(self._resource_path, endpoint=item_id, parameters=dict(secret_key=secret_key),
                                  body=body)
+        self.client.identity_map.discard(item_id)
         return resp
+
+    def _identity_key(self, item_id: str) -> tuple:
+        """tuple: Key of item in the client's identity map."""
+        return self._identity_path or self._resource_path, item_id
+
+    def _get_by_id(self, item_id: str, fetch: Callable[[], Resource], refresh: bool = False) -> Resource:
+        """
+        Get item from the client's identity map, fetching it only if unknown or expired.
+
+        Parameters
+        ----------
+        item_id : str
+            Item identifier
+        fetch : Callable
+            Function fetching the item from the API
+        refresh : bool, optional
+            Fetch the item even if known
+
+        Returns
+        -------
+        Resource
+            Item shared with everything referencing it
+        """
+        key = self._identity_key(item_id)
+        item = None if refresh else self.client.identity_map.get(key)
+        if not refresh and self.client.metrics.enabled:
+            self.client.metrics.record_cache("identity_map", item is not None)
+        if item is None:
+            item = fetch()
+            self.client.identity_map.put(key, item)
+        return item
+
+    def get_by_ids(self, item_ids: Iterable[str]) -> Resources:
+        """
+        Get multiple items by id
+
+        Parameters
+        ----------
+        item_ids : Iterable
+            Item identifiers
+
+        Returns
+        -------
+        Resources
+            Items in the order of the identifiers, unknown identifiers are left out
+
+        Notes
+        -----
+        The items are selected by a set membership filter on id. Large sets are split into chunks keeping the URL
+        within `Config.max_url_length` and the number of hits within `Config.page_size`, the chunks are fetched
+        concurrently. If the API rejects the filter, the items are fetched one by one.
+        """
+        config = self.client.config
+        item_ids = list(dict.fromkeys(item_ids))
+        if self._batch_supported is False:
+            return self._list_type(self._get_one_by_one(item_ids))
+
+        # leave room for the base url and the other query parameters
+        max_length = config.max_url_length - len(self.client._create_url(self._resource_path)) - 64
+        chunks = chunk_values(item_ids, max_length=max(max_length, 1), max_count=config.page_size)
+
+        def fetch(chunk: list) -> Resources:
+            return self.get(filter_by=[FilterAttribute("id").isin(chunk)], limit=len(chunk))
+
+        results, errors = map_concurrently(fetch, chunks, max_workers=config.max_workers)
+        if errors and self._batch_supported is None and any(_http_status(e) in (400, 422) for e in errors.values()):
+            # the API does not support the filter
+            self._batch_supported = False
+            return self._list_type(self._get_one_by_one(item_ids))
+        if errors:
+            raise BatchError(errors, results)
+        if chunks:
+            self._batch_supported = True
+
+        found = dict()
+        for item in (item for page in results for item in page):
+            self.client.identity_map.put(self._identity_key(item.id), item)
+            found[item.id] = item
+        return self._list_type([found[i] for i in item_ids if i in found])
+
+    def _get_one_by_one(self, item_ids: List[str]) -> List[Resource]:
+        """list: Items fetched by id one request each, unknown identifiers are left out."""
+        results, errors = map_concurrently(self.get_by_id, item_ids, max_workers=self.client.config.max_workers)
+        errors = {i: e for i, e in errors.items() if _http_status(e) != 404}
+        if errors:
+            raise BatchError(errors, results)
+        return [item for item in results if item is not None]
+
+    def _get_many(self, item_ids: Iterable[str]) -> Dict[str, Resource]:
+        """
+        Get multiple items by id with few requests.
+
+        Items known by the client are not fetched again, the others are fetched in batch by `get_by_ids`.
+
+        Parameters
+        ----------
+        item_ids : Iterable
+            Item identifiers
+
+        Returns
+        -------
+        dict
+            Items by identifier
+        """
+        item_ids = list(dict.fromkeys(item_ids))
+        found = dict()
+        for item_id in item_ids:
+            item = self.client.identity_map.get(self._identity_key(item_id))
+            if self.client.metrics.enabled:
+                self.client.metrics.record_cache("identity_map", item is not None)
+            if item is not None:
+                found[item_id] = item
+
+        missing = [i for i in item_ids if i not in found]
+        if missing:
+            found.update((item.id, item) for item in self.get_by_ids(missing))
+
+        # fetch items missed by the batch one by one, raising if they do not exist
+        missing = [i for i in item_ids if i not in found]
+        results, errors = map_concurrently(self.get_by_id, missing, max_workers=self.client.config.max_workers)
+        if errors:
+            raise BatchError(errors, results)
+        found.update(zip(missing, results))
+        return {i: found[i] for i in item_ids}
+
+    def iter_pages(self, filter_by: list = None, sort_by: list = None, page_size: int = None,
+                   prefetch: bool = None) -> Iterator[Resources]:
+        """
+        Iterate over all hits page by page
+
+        Parameters
+        ----------
+        filter_by : list, optional
+            Expressions for selecting a subset of all items, see `get`
+        sort_by : list, optional
+            Expressions for sorting selection, see `get`
+        page_size : int, optional
+            Number of hits per page, default is `Config.page_size`
+        prefetch : bool, optional
+            Fetch the next page in the background while the current page is consumed, default is
+            `Config.prefetch_pages`
+
+        Yields
+        ------
+        Resources
+            Page of hits
+
+        Notes
+        -----
+        Iteration stops at the first page with less than `page_size` hits, hence `page_size` should not exceed the
+        maximum number of hits the API returns per request.
+        """
+        page_size = page_size if page_size is not None else self.client.config.page_size
+        prefetch = prefetch if prefetch is not None else self.client.config.prefetch_pages
+
+        def fetch(skip: int) -> Resources:
+            return self.get(filter_by=filter_by, sort_by=sort_by, skip=skip, limit=page_size)
+
+        if not prefetch:
+            skip = 0
+            while True:
+                page = fetch(skip)
+                if len(page) > 0 or skip == 0:
+                    yield page
+                if len(page) < page_size:
+                    return
+                skip += page_size
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            skip = 0
+            future = executor.submit(fetch, skip)
+            while True:
+                page = future.result()
+                skip += page_size
+                # request the next page before handing over the current one
+                future = executor.submit(fetch, skip) if len(page) == page_size else None
+                if len(page) > 0 or skip == page_size:
+                    yield page
+                if future is None:
+                    return
+
+    def iter_all(self, filter_by: list = None, sort_by: list = None, page_size: int = None,
+                 prefetch: bool = None) -> Iterator[Resource]:
+        """
+        Iterate over all hits, fetching them page by page
+
+        Parameters
+        ----------
+        filter_by : list, optional
+            Expressions for selecting a subset of all items, see `get`
+        sort_by : list, optional
+            Expressions for sorting selection, see `get`
+        page_size : int, optional
+            Number of hits per page, default is `Config.page_size`
+        prefetch : bool, optional
+            Fetch the next page in the background while the current page is consumed, default is
+            `Config.prefetch_pages`
+
+        Yields
+        ------
+        Resource
+            Single hit
+
+        Examples
+        --------
+        >>> for sensor in client.sensor.iter_all(filter_by=[client.filter.sensor.campaign_id == campaign_id]):
+        ...     print(sensor.name)
+
+        """
+        for page in self.iter_pages(filter_by=filter_by, sort_by=sort_by, page_size=page_size, prefetch=prefetch):
+            yield from page
+
+    def _get_all(self, filter_by: list = None, sort_by: list = None) -> Resources:
+        """Get all hits, fetching them page by page."""
+        pages = list(self.iter_pages(filter_by=filter_by, sort_by=sort_by))
+        return type(pages[0])([item for page in pages for item in page])
+
+
+_trace_methods(BaseAPI)
@@ -2,12 +2,13 @@ from modeltestsdk.resources import (
     Campaign, Campaigns
 )
 from modeltestsdk.query import create_query_parameters
-from pydantic import TypeAdapter
 from .base import BaseAPI
 from typing import List
 
 
 class CampaignAPI(BaseAPI):
+    _list_type = Campaigns
+
     def create(self, name: str, description: str, location: str, date: str, scale_factor: float, water_depth: float,
                admin_key: str, read_only: bool = False, ) -> Campaign:
         """
@@ -51,7 +52,8 @@ class CampaignAPI(BaseAPI):
         data = self.client.post(self._resource_path, parameters=dict(administrator_key=admin_key), body=body)
         return Campaign(**data, client=self.client)
 
-    def get(self, filter_by: list = None, sort_by: list = None, skip: int = None, limit: int = None) -> Campaigns:
+    def get(self, filter_by: list = None, sort_by: list = None, skip: int = None, limit: int = None,
+            paginate: bool = False) -> Campaigns:
         """
         Get multiple campaigns
 
@@ -67,12 +69,16 @@ class CampaignAPI(BaseAPI):
             Skip the first `skip` campaigns.
         limit : int, optional
             Do not return more than `limit` hits.
+        paginate : bool, optional
+            Get all hits page by page, ignoring `skip` and `limit`.
 
         Returns
         -------
         Campaigns
             Multiple campaigns
         """
+        if paginate:
+            return self._get_all(filter_by=filter_by, sort_by=sort_by)
         if filter_by is None:
             filter_by = list()
         if sort_by is None:
@@ -80,9 +86,9 @@ class CampaignAPI(BaseAPI):
         params = create_query_parameters(filter_expressions=filter_by, sorting_expressions=sort_by)
         data = self.client.get(self._resource_path, parameters=dict(**params, skip=skip, limit=limit))
 
-        return Campaigns(TypeAdapter(List[Campaign]).validate_python([dict(**i, client=self.client) for i in data]))
+        return Campaigns(self._build(List[Campaign], data))
 
-    def get_by_id(self, campaign_id: str) -> Campaign:
+    def get_by_id(self, campaign_id: str, refresh: bool = False) -> Campaign:
         """
         Get single campaign by id
 
@@ -90,16 +96,21 @@ class CampaignAPI(BaseAPI):
         ----------
         campaign_id : str
             Campaign identifier
+        refresh : bool, optional
+            Fetch it from the API even if already known by the client
 
         Returns
         -------
         Campaign
             Campaign data
         """
-        data = self.client.get(self._resource_path, campaign_id)
-        return Campaign(**data, client=self.client)
+        def fetch():
+            data = self.client.get(self._resource_path, campaign_id)
+            return Campaign(**data, client=self.client)
+
+        return self._get_by_id(campaign_id, fetch, refresh=refresh)
 
-    def get_by_name(self, name: str, limit=100, skip=0) -> Campaigns:
+    def get_by_name(self, name: str, limit=100, skip=0, paginate=False) -> Campaigns:
         """
         Get single campaign by name
 
@@ -111,6 +122,8 @@ class CampaignAPI(BaseAPI):
             Limit the number of results, default is 100
         skip : int, optional
             Skip the first `skip` results, default is 0
+        paginate : bool, optional
+            Get all results page by page, ignoring `limit` and `skip`
 
         Returns
         -------
@@ -118,4 +131,4 @@ class CampaignAPI(BaseAPI):
             Campaigns data
         """
         return self.get(filter_by=[self.client.filter.campaign.name == name],
-                        limit=limit, skip=skip)
+                        limit=limit, skip=skip, paginate=paginate)
@@ -2,12 +2,13 @@ from modeltestsdk.resources import (
     FloaterConfig, FloaterConfigs
 )
 from modeltestsdk.query import create_query_parameters
-from pydantic import TypeAdapter
 from .base import BaseAPI
 from typing import List
 
 
 class FloaterConfigAPI(BaseAPI):
+    _list_type = FloaterConfigs
+
     def create(self, name: str, description: str, campaign_id: str, draft: float, characteristic_length: float,
                read_only: bool = False) -> FloaterConfig:
         """
@@ -45,7 +46,7 @@ class FloaterConfigAPI(BaseAPI):
         return FloaterConfig(**data, client=self.client)
 
     def get(self, filter_by: list = None, sort_by: list = None, skip: int = None,
-            limit: int = None) -> FloaterConfigs:
+            limit: int = None, paginate: bool = False) -> FloaterConfigs:
         """
         Get multiple floater configuration
 
@@ -61,12 +62,16 @@ class FloaterConfigAPI(BaseAPI):
             Skip the first `skip` campaigns.
         limit : int, optional
             Do not return more than `limit` hits.
+        paginate : bool, optional
+            Get all hits page by page, ignoring `skip` and `limit`.
 
         Returns
         -------
         FloaterConfigs
             Multiple floater configurations
         """
+        if paginate:
+            return self._get_all(filter_by=filter_by, sort_by=sort_by)
         if filter_by is None:
             filter_by = list()
         if sort_by is None:
@@ -74,9 +79,9 @@ class FloaterConfigAPI(BaseAPI):
         params = create_query_parameters(filter_expressions=filter_by, sorting_expressions=sort_by)
         data = self.client.get(self._resource_path, parameters=dict(**params, skip=skip, limit=limit))
 
-        return FloaterConfigs(TypeAdapter(List[FloaterConfig]).validate_python([dict(**i, client=self.client) for i in data]))
+        return FloaterConfigs(self._build(List[FloaterConfig], data))
 
-    def get_by_id(self, config_id: str) -> FloaterConfig:
+    def get_by_id(self, config_id: str, refresh: bool = False) -> FloaterConfig:
         """
         Get single floater configuration by id
 
@@ -84,16 +89,21 @@ class FloaterConfigAPI(BaseAPI):
         ----------
         config_id : str
             Configuration identifier
+        refresh : bool, optional
+            Fetch it from the API even if already known by the client
 
         Returns
         -------
         FloaterConfig
             Floater configuration
         """
-        data = self.client.get(self._resource_path, config_id)
-        return FloaterConfig(**data, client=self.client)
+        def fetch():
+            data = self.client.get(self._resource_path, config_id)
+            return FloaterConfig(**data, client=self.client)
+
+        return self._get_by_id(config_id, fetch, refresh=refresh)
 
-    def get_by_campaign_id(self, campaign_id: str, limit=100, skip=0) -> FloaterConfigs:
+    def get_by_campaign_id(self, campaign_id: str, limit=100, skip=0, paginate=False) -> FloaterConfigs:
         """
         Get configuration by parent campaign
 
@@ -105,6 +115,8 @@ class FloaterConfigAPI(BaseAPI):
             Limit the number of results, default is 100
         skip : int, optional
             Skip the first `skip` results, default is 0
+        paginate : bool, optional
+            Get all results page by page, ignoring `limit` and `skip`
 
         Returns
         -------
@@ -112,5 +124,5 @@ class FloaterConfigAPI(BaseAPI):
             Floater configurations
         """
         configs = self.get(filter_by=[self.client.filter.floater_config.campaign_id == campaign_id],
-                           limit=limit, skip=skip)
+                           limit=limit, skip=skip, paginate=paginate)
         return configs
@@ -2,12 +2,13 @@ from modeltestsdk.resources import (
     Sensor, Sensors
 )
 from modeltestsdk.query import create_query_parameters
-from pydantic import TypeAdapter
 from .base import BaseAPI
 from typing import List
 
 
 class SensorAPI(BaseAPI):
+    _list_type = Sensors
+
     def create(self, name: str, description: str, unit: str, kind: str, source: str, x: float, y: float, z: float,
                position_reference: str, position_heading_lock: bool, position_draft_lock: bool,
                positive_direction_definition: str, campaign_id: str, area: float = None,
@@ -72,7 +73,8 @@ class SensorAPI(BaseAPI):
         data = self.client.post(self._resource_path, body=body)
         return Sensor(**data, client=self.client)
 
-    def get(self, filter_by: list = None, sort_by: list = None, skip: int = None, limit: int = None) -> Sensors:
+    def get(self, filter_by: list = None, sort_by: list = None, skip: int = None, limit: int = None,
+            paginate: bool = False) -> Sensors:
         """
         Get multiple sensors
 
@@ -88,21 +90,25 @@ class SensorAPI(BaseAPI):
             Skip the first `skip` campaigns.
         limit : int, optional
             Do not return more than `limit` hits.
+        paginate : bool, optional
+            Get all hits page by page, ignoring `skip` and `limit`.
 
         Returns
         -------
         Sensors
             Multiple sensors
         """
+        if paginate:
+            return self._get_all(filter_by=filter_by, sort_by=sort_by)
         if filter_by is None:
             filter_by = list()
         if sort_by is None:
             sort_by = list()
         params = create_query_parameters(filter_expressions=filter_by, sorting_expressions=sort_by)
         data = self.client.get(self._resource_path, parameters=dict(**params, skip=skip, limit=limit))
-        return Sensors(TypeAdapter(List[Sensor]).validate_python([dict(**i, client=self.client) for i in data]))
+        return Sensors(self._build(List[Sensor], data))
 
-    def get_by_id(self, sensor_id: str) -> Sensor:
+    def get_by_id(self, sensor_id: str, refresh: bool = False) -> Sensor:
         """
         Get single sensor by id
 
@@ -110,16 +116,21 @@ class SensorAPI(BaseAPI):
         ----------
         sensor_id : str
             Sensor identifier
+        refresh : bool, optional
+            Fetch it from the API even if already known by the client
 
         Returns
         -------
         Sensor
             Sensor data
         """
-        data = self.client.get(self._resource_path, sensor_id)
-        return Sensor(**data, client=self.client)
+        def fetch():
+            data = self.client.get(self._resource_path, sensor_id)
+            return Sensor(**data, client=self.client)
+
+        return self._get_by_id(sensor_id, fetch, refresh=refresh)
 
-    def get_by_name(self, name: str, limit=100, skip=0) -> Sensors:
+    def get_by_name(self, name: str, limit=100, skip=0, paginate=False) -> Sensors:
         """
         Get sensors by name
 
@@ -131,6 +142,8 @@ class SensorAPI(BaseAPI):
             Limit the number of results, default is 100
         skip : int, optional
             Skip the first `skip` results, default is 0
+        paginate : bool, optional
+            Get all results page by page, ignoring `limit` and `skip`
 
         Returns
         -------
@@ -138,9 +151,9 @@ class SensorAPI(BaseAPI):
             Sensor data
         """
         return self.get(filter_by=[self.client.filter.sensor.name == name],
-                        limit=limit, skip=skip)
+                        limit=limit, skip=skip, paginate=paginate)
 
-    def get_by_campaign_id(self, campaign_id: str, limit=100, skip=0) -> Sensors:
+    def get_by_campaign_id(self, campaign_id: str, limit=100, skip=0, paginate=False) -> Sensors:
         """
         Get sensors by parent campaign
 
@@ -152,6 +165,8 @@ class SensorAPI(BaseAPI):
             Limit the number of results, default is 100
         skip : int, optional
             Skip the first `skip` results, default is 0
+        paginate : bool, optional
+            Get all results page by page, ignoring `limit` and `skip`
 
         Returns
         -------
@@ -159,4 +174,4 @@ class SensorAPI(BaseAPI):
             Multiple sensors
         """
         return self.get(filter_by=[self.client.filter.sensor.campaign_id == campaign_id],
-                        limit=limit, skip=skip)
+                        limit=limit, skip=skip, paginate=paginate)
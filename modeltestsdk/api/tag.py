@@ -2,12 +2,13 @@ from modeltestsdk.resources import (
     Tag, Tags
 )
 from modeltestsdk.query import create_query_parameters
-from pydantic import TypeAdapter
 from .base import BaseAPI
 from typing import List
 
 
 class TagsAPI(BaseAPI):
+    _list_type = Tags
+
     def create(self, name: str, comment: str = None, test_id: str = None, sensor_id: str = None,
                timeseries_id: str = None, read_only: bool = False) -> Tag:
         """
@@ -52,7 +53,8 @@ class TagsAPI(BaseAPI):
         data = self.client.post(self._resource_path, body=body)
         return Tag(**data, client=self.client)
 
-    def get(self, filter_by: list = None, sort_by: list = None, skip: int = None, limit: int = None) -> Tags:
+    def get(self, filter_by: list = None, sort_by: list = None, skip: int = None, limit: int = None,
+            paginate: bool = False) -> Tags:
         """
         Get multiple tags
 
@@ -68,21 +70,25 @@ class TagsAPI(BaseAPI):
             Skip the first `skip` campaigns.
         limit : int, optional
             Do not return more than `limit` hits.
+        paginate : bool, optional
+            Get all hits page by page, ignoring `skip` and `limit`.
 
         Returns
         -------
         Tags
             Multiple tags
         """
+        if paginate:
+            return self._get_all(filter_by=filter_by, sort_by=sort_by)
         if filter_by is None:
             filter_by = list()
         if sort_by is None:
             sort_by = list()
         params = create_query_parameters(filter_expressions=filter_by, sorting_expressions=sort_by)
         data = self.client.get(self._resource_path, parameters=dict(**params, skip=skip, limit=limit))
-        return Tags(TypeAdapter(List[Tag]).validate_python([dict(**i, client=self.client) for i in data]))
+        return Tags(self._build(List[Tag], data))
 
-    def get_by_id(self, tag_id: str) -> Tag:
+    def get_by_id(self, tag_id: str, refresh: bool = False) -> Tag:
         """
         Get single tag series by id
 
@@ -90,16 +96,21 @@ class TagsAPI(BaseAPI):
         ----------
         tag_id : str
             Tag identifier
+        refresh : bool, optional
+            Fetch it from the API even if already known by the client
 
         Returns
         -------
         Tag
             Item tag
         """
-        data = self.client.get(self._resource_path, tag_id)
-        return Tag(**data, client=self.client)
+        def fetch():
+            data = self.client.get(self._resource_path, tag_id)
+            return Tag(**data, client=self.client)
+
+        return self._get_by_id(tag_id, fetch, refresh=refresh)
 
-    def get_by_sensor_id(self, sensor_id: str, limit=100, skip=0) -> Tags:
+    def get_by_sensor_id(self, sensor_id: str, limit=100, skip=0, paginate=False) -> Tags:
         """
         Get tags by sensor id
 
@@ -111,6 +122,8 @@ class TagsAPI(BaseAPI):
             Limit the number of results, default is 100
         skip : int, optional
             Skip the first `skip` results, default is 0
+        paginate : bool, optional
+            Get all results page by page, ignoring `limit` and `skip`
 
         Returns
         -------
@@ -118,10 +131,10 @@ class TagsAPI(BaseAPI):
             Sensor tags
         """
         tags = self.get(filter_by=[self.client.filter.tag.sensor_id == sensor_id],
-                        limit=limit, skip=skip)
+                        limit=limit, skip=skip, paginate=paginate)
         return tags
 
-    def get_by_test_id(self, test_id: str, limit=100, skip=0) -> Tags:
+    def get_by_test_id(self, test_id: str, limit=100, skip=0, paginate=False) -> Tags:
         """
         Get tags by test id
 
@@ -133,6 +146,8 @@ class TagsAPI(BaseAPI):
             Limit the number of results, default is 100
         skip : int, optional
             Skip the first `skip` results, default is 0
+        paginate : bool, optional
+            Get all results page by page, ignoring `limit` and `skip`
 
         Returns
         -------
@@ -140,10 +155,10 @@ class TagsAPI(BaseAPI):
             Test tags
         """
         tags = self.get(filter_by=[self.client.filter.tag.test_id == test_id],
-                        limit=limit, skip=skip)
+                        limit=limit, skip=skip, paginate=paginate)
         return tags
 
-    def get_by_timeseries_id(self, ts_id: str, limit=100, skip=0) -> Tags:
+    def get_by_timeseries_id(self, ts_id: str, limit=100, skip=0, paginate=False) -> Tags:
         """
         Get tags by time series id
 
@@ -155,6 +170,8 @@ class TagsAPI(BaseAPI):
             Limit the number of results, default is 100
         skip : int, optional
             Skip the first `skip` results, default is 0
+        paginate : bool, optional
+            Get all results page by page, ignoring `limit` and `skip`
 
         Returns
         -------
@@ -162,10 +179,10 @@ class TagsAPI(BaseAPI):
             Time series tags
         """
         tags = self.get(filter_by=[self.client.filter.tag.timeseries_id == ts_id],
-                        limit=limit, skip=skip)
+                        limit=limit, skip=skip, paginate=paginate)
         return tags
 
-    def get_by_name(self, name: str, limit=100, skip=0) -> Tags:
+    def get_by_name(self, name: str, limit=100, skip=0, paginate=False) -> Tags:
         """
         Get tags by name
 
@@ -177,6 +194,8 @@ class TagsAPI(BaseAPI):
             Limit the number of results, default is 100
         skip : int, optional
             Skip the first `skip` results, default is 0
+        paginate : bool, optional
+            Get all results page by page, ignoring `limit` and `skip`
 
         Returns
         -------
@@ -184,5 +203,5 @@ class TagsAPI(BaseAPI):
             Tags
         """
         tags = self.get(filter_by=[self.client.filter.tag.name == name],
-                        limit=limit, skip=skip)
+                        limit=limit, skip=skip, paginate=paginate)
         return tags
@@ -1,14 +1,37 @@
+from collections import defaultdict
 from typing import Union, List
 from modeltestsdk.resources import (
-    Test, Tests, FloaterTest, WaveCalibration, WindCalibration,
+    Test, Tests, FloaterTest, WaveCalibration, WindCalibration, AnyTest
 )
 from modeltestsdk.query import create_query_parameters
 from pydantic import TypeAdapter
 from .base import BaseAPI
 
+any_test_adapter = TypeAdapter(AnyTest)
+
+# model and API of each test type
+test_types = {
+    'Floater Test': (FloaterTest, 'floater_test'),
+    'Wave Calibration': (WaveCalibration, 'wave_calibration'),
+    'Wind Calibration': (WindCalibration, 'wind_calibration'),
+}
+
+
+def is_complete(item: dict) -> bool:
+    """bool: Is the test of a known type, and does the payload hold every field specific to its type."""
+    if item.get('type') not in test_types:
+        return False
+    model, _ = test_types[item['type']]
+    return set(model.model_fields).difference(Test.model_fields) <= item.keys()
+
 
 class TestAPI(BaseAPI):
-    def get(self, filter_by: list = None, sort_by: list = None, skip: int = None, limit: int = None) -> Tests:
+    _list_type = Tests
+    # tests are shared by the APIs of all test types
+    _identity_path = 'test'
+
+    def get(self, filter_by: list = None, sort_by: list = None, skip: int = None, limit: int = None,
+            paginate: bool = False) -> Tests:
         """
         Get multiple tests
 
@@ -24,29 +47,37 @@ class TestAPI(BaseAPI):
             Skip the first `skip` campaigns.
         limit : int, optional
             Do not return more than `limit` hits.
+        paginate : bool, optional
+            Get all hits page by page, ignoring `skip` and `limit`.
 
         Returns
         -------
         Tests
             Multiple tests
         """
+        if paginate:
+            return self._get_all(filter_by=filter_by, sort_by=sort_by)
         if filter_by is None:
             filter_by = list()
         if sort_by is None:
             sort_by = list()
         params = create_query_parameters(filter_expressions=filter_by, sorting_expressions=sort_by)
         data = self.client.get(self._resource_path, parameters=dict(**params, skip=skip, limit=limit))
-        data_out = []
+        data_out, incomplete = dict(), defaultdict(list)
         for i in data:
-            if i['type'] == 'Wave Calibration':
-                data_out.append(self.client.wave_calibration.get_by_id(i['id']))
-            elif i['type'] == 'Wind Calibration':
-                data_out.append(self.client.wind_calibration.get_by_id(i['id']))
+            if is_complete(i):
+                data_out[i['id']] = any_test_adapter.validate_python(dict(**i, client=self.client))
             else:
-                data_out.append(self.client.floater_test.get_by_id(i['id']))
-        return Tests(data_out)
-
-    def get_by_id(self, test_id: str) -> Union[FloaterTest, WaveCalibration, WindCalibration, Test, None]:
+                # fields specific to the test type are missing or the type is unknown, fetch them in batch from the
+                # endpoint of the test type, or as floater tests
+                _, api = test_types.get(i.get('type'), (None, 'floater_test'))
+                incomplete[api].append(i['id'])
+        for api, test_ids in incomplete.items():
+            data_out.update(getattr(self.client, api)._get_many(test_ids))
+        return Tests([data_out[i['id']] for i in data])
+
+    def get_by_id(self, test_id: str,
+                  refresh: bool = False) -> Union[FloaterTest, WaveCalibration, WindCalibration, Test, None]:
         """
         Get single test by id
 
@@ -54,15 +85,20 @@ class TestAPI(BaseAPI):
         ----------
         test_id : str
             test identifier
+        refresh : bool, optional
+            Fetch it from the API even if already known by the client
 
         Returns
         -------
         Union[FloaterTest, WaveCalibration, WindCalibration, Test, None]:
             Test data
         """
-        return self.get(filter_by=[self.client.filter.test.id == test_id])[0]
+        def fetch():
+            return self.get(filter_by=[self.client.filter.test.id == test_id])[0]
+
+        return self._get_by_id(test_id, fetch, refresh=refresh)
 
-    def get_by_number(self, test_number: str, limit=100, skip=0) -> Tests:
+    def get_by_number(self, test_number: str, limit=100, skip=0, paginate=False) -> Tests:
         """
         Get tests by number
 
@@ -74,6 +110,8 @@ class TestAPI(BaseAPI):
             Limit the number of results, default is 100
         skip : int, optional
             Skip the first `skip` results, default is 0
+        paginate : bool, optional
+            Get all results page by page, ignoring `limit` and `skip`
 
         Returns
         -------
@@ -81,9 +119,9 @@ class TestAPI(BaseAPI):
             Test data
         """
         return self.get(filter_by=[self.client.filter.test.number == test_number],
-                        limit=limit, skip=skip)
+                        limit=limit, skip=skip, paginate=paginate)
 
-    def get_by_campaign_id(self, campaign_id: str, limit=100, skip=0) -> Tests:
+    def get_by_campaign_id(self, campaign_id: str, limit=100, skip=0, paginate=False) -> Tests:
         """
         Get tests by parent campaign
 
@@ -95,6 +133,8 @@ class TestAPI(BaseAPI):
             Limit the number of results, default is 100
         skip : int, optional
             Skip the first `skip` results, default is 0
+        paginate : bool, optional
+            Get all results page by page, ignoring `limit` and `skip`
 
         Returns
         -------
@@ -102,7 +142,7 @@ class TestAPI(BaseAPI):
             Multiple tests
         """
         return self.get(filter_by=[self.client.filter.test.campaign_id == campaign_id],
-                        limit=limit, skip=skip)
+                        limit=limit, skip=skip, paginate=paginate)
 
 
 class FloaterTestAPI(TestAPI):
@@ -156,7 +196,8 @@ class FloaterTestAPI(TestAPI):
         data = self.client.post(self._resource_path, body=body)
         return FloaterTest(**data, client=self.client)
 
-    def get(self, filter_by: list = None, sort_by: list = None, skip: int = None, limit: int = None) -> Tests:
+    def get(self, filter_by: list = None, sort_by: list = None, skip: int = None, limit: int = None,
+            paginate: bool = False) -> Tests:
         """
         Get multiple floater tests
 
@@ -172,12 +213,16 @@ class FloaterTestAPI(TestAPI):
             Skip the first `skip` campaigns.
         limit : int, optional
             Do not return more than `limit` hits.
+        paginate : bool, optional
+            Get all hits page by page, ignoring `skip` and `limit`.
 
         Returns
         -------
         Tests
             Multiple tests
         """
+        if paginate:
+            return self._get_all(filter_by=filter_by, sort_by=sort_by)
         if filter_by is None:
             filter_by = list()
         if sort_by is None:
@@ -185,9 +230,9 @@ class FloaterTestAPI(TestAPI):
         params = create_query_parameters(filter_expressions=filter_by, sorting_expressions=sort_by)
         data = self.client.get(self._resource_path, parameters=dict(**params, skip=skip, limit=limit))
 
-        return Tests(TypeAdapter(List[FloaterTest]).validate_python([dict(**i, client=self.client) for i in data]))
+        return Tests(self._build(List[FloaterTest], data))
 
-    def get_by_id(self, test_id: str) -> FloaterTest:
+    def get_by_id(self, test_id: str, refresh: bool = False) -> FloaterTest:
         """
         Get single floater test by id
 
@@ -195,14 +240,19 @@ class FloaterTestAPI(TestAPI):
         ----------
         test_id : str
             Test identifier
+        refresh : bool, optional
+            Fetch it from the API even if already known by the client
 
         Returns
         -------
         Test
             Test data
         """
-        data = self.client.get(self._resource_path, test_id)
-        return FloaterTest(**data, client=self.client)
+        def fetch():
+            data = self.client.get(self._resource_path, test_id)
+            return FloaterTest(**data, client=self.client)
+
+        return self._get_by_id(test_id, fetch, refresh=refresh)
 
 
 class WaveCalibrationAPI(TestAPI):
@@ -263,7 +313,8 @@ class WaveCalibrationAPI(TestAPI):
         data = self.client.post(self._resource_path, body=body)
         return WaveCalibration(**data, client=self.client)
 
-    def get(self, filter_by: list = None, sort_by: list = None, skip: int = None, limit: int = None) -> Tests:
+    def get(self, filter_by: list = None, sort_by: list = None, skip: int = None, limit: int = None,
+            paginate: bool = False) -> Tests:
         """
         Get multiple wave calibration tests
 
@@ -279,12 +330,16 @@ class WaveCalibrationAPI(TestAPI):
             Skip the first `skip` campaigns.
         limit : int, optional
             Do not return more than `limit` hits.
+        paginate : bool, optional
+            Get all hits page by page, ignoring `skip` and `limit`.
 
         Returns
         -------
         Tests
             Multiple tests
         """
+        if paginate:
+            return self._get_all(filter_by=filter_by, sort_by=sort_by)
         if filter_by is None:
             filter_by = list()
         if sort_by is None:
@@ -292,9 +347,9 @@ class WaveCalibrationAPI(TestAPI):
         params = create_query_parameters(filter_expressions=filter_by, sorting_expressions=sort_by)
         data = self.client.get(self._resource_path, parameters=dict(**params, skip=skip, limit=limit))
 
-        return Tests(TypeAdapter(List[WaveCalibration]).validate_python([dict(**i, client=self.client) for i in data]))
+        return Tests(self._build(List[WaveCalibration], data))
 
-    def get_by_id(self, test_id: str) -> WaveCalibration:
+    def get_by_id(self, test_id: str, refresh: bool = False) -> WaveCalibration:
         """
         Get single wave calibration test by id
 
@@ -302,14 +357,19 @@ class WaveCalibrationAPI(TestAPI):
         ----------
         test_id : str
             Test identifier
+        refresh : bool, optional
+            Fetch it from the API even if already known by the client
 
         Returns
         -------
         Test
             Test data
         """
-        data = self.client.get(self._resource_path, test_id)
-        return WaveCalibration(**data, client=self.client)
+        def fetch():
+            data = self.client.get(self._resource_path, test_id)
+            return WaveCalibration(**data, client=self.client)
+
+        return self._get_by_id(test_id, fetch, refresh=refresh)
 
 
 class WindCalibrationAPI(TestAPI):
@@ -360,7 +420,8 @@ class WindCalibrationAPI(TestAPI):
         data = self.client.post(self._resource_path, body=body)
         return WindCalibration(**data, client=self.client)
 
-    def get(self, filter_by: list = None, sort_by: list = None, skip: int = None, limit: int = None) -> Tests:
+    def get(self, filter_by: list = None, sort_by: list = None, skip: int = None, limit: int = None,
+            paginate: bool = False) -> Tests:
         """
         Get multiple wind calibration tests
 
@@ -376,12 +437,16 @@ class WindCalibrationAPI(TestAPI):
             Skip the first `skip` campaigns.
         limit : int, optional
             Do not return more than `limit` hits.
+        paginate : bool, optional
+            Get all hits page by page, ignoring `skip` and `limit`.
 
         Returns
         -------
         Tests
             Multiple tests
         """
+        if paginate:
+            return self._get_all(filter_by=filter_by, sort_by=sort_by)
         if filter_by is None:
             filter_by = list()
         if sort_by is None:
@@ -389,9 +454,9 @@ class WindCalibrationAPI(TestAPI):
         params = create_query_parameters(filter_expressions=filter_by, sorting_expressions=sort_by)
         data = self.client.get(self._resource_path, parameters=dict(**params, skip=skip, limit=limit))
 
-        return Tests(TypeAdapter(List[WindCalibration]).validate_python([dict(**i, client=self.client) for i in data]))
+        return Tests(self._build(List[WindCalibration], data))
 
-    def get_by_id(self, test_id: str) -> WindCalibration:
+    def get_by_id(self, test_id: str, refresh: bool = False) -> WindCalibration:
         """
         Get single wind calibration test by id
 
@@ -399,11 +464,16 @@ class WindCalibrationAPI(TestAPI):
         ----------
         test_id : str
             Test identifier
+        refresh : bool, optional
+            Fetch it from the API even if already known by the client
 
         Returns
         -------
         WindCalibration
             Test data
         """
-        data = self.client.get(self._resource_path, test_id)
-        return WindCalibration(**data, client=self.client)
+        def fetch():
+            data = self.client.get(self._resource_path, test_id)
+            return WindCalibration(**data, client=self.client)
+
+        return self._get_by_id(test_id, fetch, refresh=refresh)
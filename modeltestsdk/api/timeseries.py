@@ -1,13 +1,34 @@
-from typing import Union, List
+import logging
+from contextlib import closing
+import numpy as np
+import requests
+from typing import Union, List, Optional, Dict, Tuple
 from modeltestsdk.resources import (
-    Statistics, DataPoints, Timeseries, TimeseriesList
+    Statistics, DataPoints, Timeseries, TimeseriesList, FloaterTest, Sensor, Test
 )
+from modeltestsdk.cache import ProgressManifest
+from modeltestsdk.concurrency import map_concurrently, call_with_retries, BatchError
 from modeltestsdk.query import create_query_parameters
-from pydantic import TypeAdapter
+from modeltestsdk.utils import NPY_MEDIA_TYPE, to_npy, from_npy, parse_json_arrays
+from modeltestsdk.scaling import froude_factors, froude_scale, froude_scale_statistics
 from .base import BaseAPI
 
 
+def _is_transient(e: Exception) -> bool:
+    """bool: Is the request failure due to connection problems or the server, and worth retrying."""
+    if isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    return isinstance(e, requests.exceptions.HTTPError) and e.response is not None and e.response.status_code >= 500
+
+
 class TimeseriesAPI(BaseAPI):
+    _list_type = TimeseriesList
+
+    def __init__(self, client):
+        super().__init__(client)
+        # does the API support data points in binary format, unknown until the first data points are fetched
+        self._npy_supported: Optional[bool] = None
+
     def create(self, sensor_id: str, test_id: str, default_start_time: float, default_end_time: float, fs: float,
                intermittent: bool = False, read_only: bool = False) -> Timeseries:
         """
@@ -48,7 +69,8 @@ class TimeseriesAPI(BaseAPI):
         data = self.client.post(self._resource_path, body=body)
         return Timeseries(**data, client=self.client)
 
-    def get(self, filter_by: list = None, sort_by: list = None, skip: int = None, limit: int = None) -> TimeseriesList:
+    def get(self, filter_by: list = None, sort_by: list = None, skip: int = None, limit: int = None,
+            paginate: bool = False) -> TimeseriesList:
         """
         Get multiple time series
 
@@ -64,12 +86,16 @@ class TimeseriesAPI(BaseAPI):
             Skip the first `skip` campaigns.
         limit : int, optional
             Do not return more than `limit` hits.
+        paginate : bool, optional
+            Get all hits page by page, ignoring `skip` and `limit`.
 
         Returns
         -------
         TimeseriesList
             Multiple time series
         """
+        if paginate:
+            return self._get_all(filter_by=filter_by, sort_by=sort_by)
         if filter_by is None:
             filter_by = list()
         if sort_by is None:
@@ -77,9 +103,9 @@ class TimeseriesAPI(BaseAPI):
         params = create_query_parameters(filter_expressions=filter_by, sorting_expressions=sort_by)
         data = self.client.get(self._resource_path, parameters=dict(**params, skip=skip, limit=limit))
 
-        return TimeseriesList(TypeAdapter(List[Timeseries]).validate_python([dict(**i, client=self.client) for i in data]))
+        return TimeseriesList(self._build(List[Timeseries], data))
 
-    def get_by_id(self, timeseries_id: str) -> Timeseries:
+    def get_by_id(self, timeseries_id: str, refresh: bool = False) -> Timeseries:
         """
         Get single time series by id
 
@@ -87,16 +113,21 @@ class TimeseriesAPI(BaseAPI):
         ----------
         timeseries_id : str
             Time series identifier
+        refresh : bool, optional
+            Fetch it from the API even if already known by the client
 
         Returns
         -------
         Timeseries
             Time series
         """
-        data = self.client.get(self._resource_path, timeseries_id)
-        return Timeseries(**data, client=self.client)
+        def fetch():
+            data = self.client.get(self._resource_path, timeseries_id)
+            return Timeseries(**data, client=self.client)
+
+        return self._get_by_id(timeseries_id, fetch, refresh=refresh)
 
-    def get_by_sensor_id(self, sensor_id: str, limit=100, skip=0) -> TimeseriesList:
+    def get_by_sensor_id(self, sensor_id: str, limit=100, skip=0, paginate=False) -> TimeseriesList:
         """
         Get time series by sensor id
 
@@ -108,6 +139,8 @@ class TimeseriesAPI(BaseAPI):
             Limit the number of results, default is 100
         skip : int, optional
             Skip the first `skip` results, default is 0
+        paginate : bool, optional
+            Get all results page by page, ignoring `limit` and `skip`
 
         Returns
         -------
@@ -115,10 +148,10 @@ class TimeseriesAPI(BaseAPI):
             Time series
         """
         timeseries = self.get(filter_by=[self.client.filter.timeseries.sensor_id == sensor_id],
-                              limit=limit, skip=skip)
+                              limit=limit, skip=skip, paginate=paginate)
         return timeseries
 
-    def get_by_test_id(self, test_id: str, limit=100, skip=0) -> TimeseriesList:
+    def get_by_test_id(self, test_id: str, limit=100, skip=0, paginate=False) -> TimeseriesList:
         """
         Get time series by test id
 
@@ -130,6 +163,8 @@ class TimeseriesAPI(BaseAPI):
             Limit the number of results, default is 100
         skip : int, optional
             Skip the first `skip` results, default is 0
+        paginate : bool, optional
+            Get all results page by page, ignoring `limit` and `skip`
 
         Returns
         -------
@@ -137,7 +172,7 @@ class TimeseriesAPI(BaseAPI):
             Time series
         """
         return self.get(filter_by=[self.client.filter.timeseries.test_id == test_id],
-                        limit=limit, skip=skip)
+                        limit=limit, skip=skip, paginate=paginate)
 
     def get_by_sensor_id_and_test_id(self, sensor_id: str, test_id: str) -> Union[Timeseries, None]:
         """"
@@ -166,8 +201,33 @@ class TimeseriesAPI(BaseAPI):
         else:
             return None
 
+    def get_sensors_and_tests(self, ts_ids: List[str]) -> Dict[str, Tuple[Sensor, Test]]:
+        """
+        Get the sensor and test of multiple time series
+
+        Parameters
+        ----------
+        ts_ids : list
+            Time series identifiers
+
+        Returns
+        -------
+        dict
+            Sensor and test by time series identifier
+
+        Notes
+        -----
+        Resources already known by the client are not fetched again, the others are fetched in batch by id, see
+        `get_by_ids`.
+        """
+        timeseries = self._get_many(ts_ids)
+        sensors = self.client.sensor._get_many([ts.sensor_id for ts in timeseries.values()])
+        tests = self.client.test._get_many([ts.test_id for ts in timeseries.values()])
+        return {i: (sensors[ts.sensor_id], tests[ts.test_id]) for i, ts in timeseries.items()}
+
     def get_data_points(self, ts_id: str, start: float = None, end: float = None, scaling_length: float = None,
-                        all_data: bool = False, cache: bool = True) -> DataPoints:
+                        all_data: bool = False, cache: bool = True, dtype=np.float64,
+                        chunk_size: int = None) -> DataPoints:
         """
         Fetch data points for time series by id.
 
@@ -185,18 +245,174 @@ class TimeseriesAPI(BaseAPI):
         all_data : bool, optional
             Fetch all data points including the transients which are masked by default.
         cache : bool, optional
-            Cache data points for 30 days
+            Read data points from the local data point store if available, otherwise store them there. The
+            complete time series is cached and the requested time window is sliced from it. Unless
+            `Config.scaling` is 'server', the cached model scale data is scaled locally. The cached data points are
+            discarded when the data points of the time series are replaced (`datapoints_created_at` changes).
+        dtype : numpy.dtype, optional
+            Floating point type of the data point arrays, numpy.float64 (default) or numpy.float32
+        chunk_size : int, optional
+            Download long time windows without cache in windows of this many data points, fetched concurrently.
+            Default is `Config.datapoints_chunk_size`, 0 disables chunking. The complete time series (`all_data` or
+            cached), intermittent time series and data points scaled by the API are downloaded in one go.
 
         Returns
         -------
         DataPoints
             Data points
         """
+        if not cache:
+            chunk_size = chunk_size if chunk_size is not None else self.client.config.datapoints_chunk_size
+            time, value = self._get_data_uncached(ts_id, start, end, scaling_length, all_data, chunk_size)
+            return DataPoints(time=np.asarray(time, dtype=dtype), value=np.asarray(value, dtype=dtype),
+                              timeseries_id=ts_id, client=self.client)
+
+        # the complete time series is cached once, time windows are sliced from it locally. The time series is always
+        # fetched to learn the current version of its data points
+        ts = self.get_by_id(ts_id, refresh=True)
+        if all_data:
+            start, end = None, None
+        else:
+            start = ts.default_start_time if start is None else start
+            end = ts.default_end_time if end is None else end
+
+        # scale the cached model scale data locally if possible
+        froude = None
+        if scaling_length is not None and self.client.config.scaling != "server":
+            froude = self._get_froude_parameters(ts_id, ts.datapoints_created_at)
+        parameters = dict(scaling_length=scaling_length) if froude is None and scaling_length is not None else dict()
+
+        # cached data points are valid as long as they have not been replaced
+        store = self.client.datapoint_store
+        version = ts.datapoints_created_at
+        cached = store.get(ts_id, parameters, start=start, end=end, version=version)
+        if self.client.metrics.enabled:
+            self.client.metrics.record_cache("datapoints", cached is not None)
+        if cached is None:
+            # in one go, the extent of the complete time series is unknown
+            time, value = self._fetch_data_points(ts_id, dict(**parameters, all_data=True))
+            store.put(ts_id, np.asarray(time, dtype=np.float64), np.asarray(value, dtype=np.float64), parameters,
+                      version=version)
+            cached = store.get(ts_id, parameters, start=start, end=end, version=version)
+
+        time, value = cached
+        if froude is not None:
+            time, value = froude_scale(time, value, froude["kind"], scaling_length / froude["characteristic_length"])
+            if self.client.config.scaling == "parity":
+                server = self.get_data_points(ts_id, start=start, end=end, scaling_length=scaling_length,
+                                              all_data=all_data, cache=False)
+                if not (server.time.shape == time.shape and np.allclose(server.time, time) and
+                        np.allclose(server.value, value, equal_nan=True)):
+                    raise ValueError(f"Local Froude scaling of time series '{ts_id}' to scaling length "
+                                     f"{scaling_length} deviates from scaling by the API.")
+
+        return DataPoints(time=time.astype(dtype, copy=False), value=value.astype(dtype, copy=False),
+                          timeseries_id=ts_id, client=self.client)
+
+    def _get_data_uncached(self, ts_id: str, start: Optional[float], end: Optional[float],
+                           scaling_length: Optional[float], all_data: bool,
+                           chunk_size: int) -> Tuple[np.ndarray, np.ndarray]:
+        """tuple: Time and values fetched from the API, in time windows if long and not scaled by the API."""
+        chunks = None
+        if chunk_size and scaling_length is None and not all_data:
+            ts = self.get_by_id(ts_id)
+            chunks = self._get_data_chunked(ts, ts.default_start_time if start is None else start,
+                                            ts.default_end_time if end is None else end, chunk_size)
+        if chunks is not None:
+            return chunks
         parameters = dict(start_time=start, end_time=end, scaling_length=scaling_length, all_data=all_data)
-        data = self.client.get(resource=self._resource_path, endpoint=f"{ts_id}/data", parameters=parameters,
-                               cache=cache)
-        data['data']['timeseries_id'] = ts_id
-        return DataPoints(**data.get("data"), client=self.client)
+        return self._fetch_data_points(ts_id, parameters)
+
+    def _get_data_chunked(self, ts: Timeseries, start: Optional[float], end: Optional[float],
+                          chunk_size: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Download unscaled data points of a time window in windows of `chunk_size` samples, fetched concurrently.
+
+        Only a window with known start and end time is split. The extent of the complete time series is unknown, and
+        data points beyond a gap can not be told apart from no data points at all, so it is downloaded in one go. The
+        API includes data points at both ends of a window, data points repeated by the next window are dropped when
+        the windows are joined.
+
+        Parameters
+        ----------
+        ts : Timeseries
+            Time series
+        start : float, optional
+            Start time (s)
+        end : float, optional
+            End time (s)
+        chunk_size : int
+            Number of data points per window
+
+        Returns
+        -------
+        tuple
+            Time and values, None if the window should be downloaded in one go (unknown start or end time,
+            intermittent, unknown sampling rate or fewer data points than `chunk_size`)
+        """
+        if not chunk_size or start is None or end is None or ts.intermittent or not ts.fs:
+            return None
+        width = chunk_size / ts.fs
+        if end - start <= width:
+            return None
+        edges = start + width * np.arange(int(np.ceil((end - start) / width)) + 1)
+        edges[-1] = end
+
+        def fetch(window: Tuple[float, float]) -> Tuple[np.ndarray, np.ndarray]:
+            return self._fetch_data_points(ts.id, dict(start_time=window[0], end_time=window[1], all_data=False))
+
+        chunks, errors = map_concurrently(fetch, list(zip(edges[:-1], edges[1:])),
+                                          max_workers=max(self.client.config.max_workers, 1))
+        if errors:
+            raise BatchError(errors, chunks)
+        return self._join_chunks(chunks)
+
+    @staticmethod
+    def _join_chunks(chunks: List[Tuple[np.ndarray, np.ndarray]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Join time windows of data points into contiguous arrays, dropping data points repeated at the edges."""
+        times, values, last = [], [], -np.inf
+        for time, value in chunks:
+            i = np.searchsorted(time, last, side="right")
+            times.append(time[i:])
+            values.append(value[i:])
+            if len(time) > 0:
+                last = max(last, time[-1])
+        return np.concatenate(times), np.concatenate(values)
+
+    def _froude_parameters(self, ts_id: str) -> Optional[dict]:
+        """
+        Sensor kind and characteristic length required for Froude scaling of time series data.
+
+        Parameters
+        ----------
+        ts_id : str
+            Time series identifier
+
+        Returns
+        -------
+        dict
+            Sensor kind and characteristic length, None if the data can not be scaled locally (sensor kind without
+            Froude scaling or test without floater configuration).
+        """
+        ts = self.get_by_id(ts_id)
+        sensor = ts.sensor
+        if froude_factors(sensor.kind, 1.) is None:
+            return None
+
+        test = ts.test
+        if not isinstance(test, FloaterTest) or test.floaterconfig_id is None:
+            return None
+
+        return dict(kind=sensor.kind, characteristic_length=test.floater_config.characteristic_length)
+
+    def _get_froude_parameters(self, ts_id: str, version: str = None) -> Optional[dict]:
+        """Froude scaling parameters, stored with the version of the data points to avoid looking them up again."""
+        store = self.client.datapoint_store
+        metadata = store.get_metadata(ts_id, version=version) or dict()
+        if "froude" not in metadata:
+            metadata["froude"] = self._froude_parameters(ts_id)
+            store.set_metadata(ts_id, metadata, version=version)
+        return metadata["froude"]
 
     def add_data_points(self, ts_id: str, time: list, values: list, secret_key: str = None) -> DataPoints:
         """
@@ -206,9 +422,9 @@ class TimeseriesAPI(BaseAPI):
         ----------
         ts_id : str
             Time series identifier
-        time : list
+        time : list or numpy.ndarray
             Time (s)
-        values : list
+        values : list or numpy.ndarray
             Values corresponding to time
         secret_key : str, optional
             Secret key, required to add new data points if old should be overwritten
@@ -218,10 +434,122 @@ class TimeseriesAPI(BaseAPI):
         DataPoints
             Data points
         """
-        body = dict(data=dict(time=time, value=values))
-        data = self.client.post(resource=self._resource_path, parameters=dict(secret_key=secret_key),
-                                endpoint=f"{ts_id}/data", body=body)
-        return DataPoints(**data.get("data"), timeseries_id=ts_id, client=self.client)
+        time, value = self._post_data_points(ts_id, time, values, secret_key=secret_key)
+        return DataPoints(time=time, value=value, timeseries_id=ts_id, client=self.client)
+
+    def _accept_npy(self) -> bool:
+        """bool: Ask for data points in binary format, unless configured for JSON."""
+        return self.client.config.datapoints_format != "json"
+
+    def _send_npy(self) -> bool:
+        """bool: Send data points in binary format, if configured or the API is known to support it."""
+        fmt = self.client.config.datapoints_format
+        return fmt == "npy" or (fmt == "auto" and self._npy_supported is True)
+
+    def _data_points_headers(self) -> dict:
+        """dict: Headers negotiating the format of data points in the response."""
+        if self._accept_npy():
+            return dict(Accept=f"{NPY_MEDIA_TYPE}, application/json;q=0.5")
+        return dict(Accept="application/json")
+
+    def _decode_data_points(self, r: requests.Response) -> Tuple[np.ndarray, np.ndarray]:
+        """tuple: Time and values from response in binary format or JSON."""
+        binary = r.headers.get("Content-Type", "").split(";")[0].strip() == NPY_MEDIA_TYPE
+        if self._accept_npy():
+            # the API answers in binary format if it supports it
+            self._npy_supported = binary
+        with closing(r), self.client.tracer.span("npy" if binary else "json stream", cat="decode"):
+            if binary:
+                data = from_npy(r.content)
+                return data[0], data[1]
+            # parse JSON as it is read, without holding the whole response and lists of Python floats
+            return parse_json_arrays(r.iter_content(chunk_size=2 ** 20), ("time", "value"))
+
+    def _fetch_data_points(self, ts_id: str, parameters: dict) -> Tuple[np.ndarray, np.ndarray]:
+        """tuple: Fetch time and values of time series, in binary format if the API supports it."""
+        r = self.client._request("GET", resource=self._resource_path, endpoint=f"{ts_id}/data",
+                                 parameters=parameters, headers=self._data_points_headers(), stream=True)
+        return self._decode_data_points(r)
+
+    def _post_data_points(self, ts_id: str, time, values, secret_key: str = None) -> Tuple[np.ndarray, np.ndarray]:
+        """tuple: Post data points of time series, discarding local copies of the replaced data."""
+        headers = self._data_points_headers()
+        if self._send_npy():
+            body = to_npy(time, values)
+            headers["Content-Type"] = NPY_MEDIA_TYPE
+        else:
+            body = dict(data=dict(time=time, value=values))
+        r = self.client._request("POST", resource=self._resource_path, endpoint=f"{ts_id}/data",
+                                 parameters=dict(secret_key=secret_key), body=body, headers=headers)
+        self.client.datapoint_store.delete(ts_id)
+        self.client.identity_map.discard(ts_id)
+        return self._decode_data_points(r)
+
+    def upload_data_points(self, data_points: Dict[str, Tuple[np.ndarray, np.ndarray]], secret_key: str = None,
+                           manifest: str = None, max_workers: int = None, retries: int = None,
+                           raise_errors: bool = True) -> Dict[str, bool]:
+        """
+        Upload data points of multiple time series
+
+        Parameters
+        ----------
+        data_points : dict
+            Time and values by time series identifier
+        secret_key : str, optional
+            Secret key, required if old data points should be overwritten
+        manifest : str, optional
+            Progress manifest file. Uploaded time series are recorded here and skipped when uploading the same data
+            points again, so that an interrupted upload resumes where it stopped.
+        max_workers : int, optional
+            Maximum number of time series uploaded concurrently, default is `Config.max_workers`
+        retries : int, optional
+            Maximum number of retries of an upload failing due to connection problems or server errors, default is
+            `Config.requests_max_retries`
+        raise_errors : bool, optional
+            Raise BatchError if any upload fails, otherwise failures are only logged
+
+        Returns
+        -------
+        dict
+            By time series identifier, True if uploaded, False if skipped as recorded in the manifest. Failed time
+            series are left out.
+
+        Raises
+        ------
+        BatchError
+            If any upload failed and `raise_errors` is True, partial results are available from the error.
+
+        Notes
+        -----
+        The API replaces the data points of a time series on each upload, hence each time series is uploaded in one
+        request. Time series are uploaded concurrently and retried individually.
+        """
+        config = self.client.config
+        progress = ProgressManifest(manifest) if manifest is not None else None
+        retries = retries if retries is not None else config.requests_max_retries
+
+        def upload(item) -> bool:
+            ts_id, (time, value) = item
+            digest = progress.digest(np.asarray(time, dtype=np.float64), np.asarray(value, dtype=np.float64)) \
+                if progress is not None else None
+            if progress is not None and progress.is_done(ts_id, digest):
+                return False
+            call_with_retries(lambda: self._post_data_points(ts_id, time, value, secret_key=secret_key),
+                              retries=retries, backoff_factor=config.requests_backoff_factor,
+                              retry_on=_is_transient)
+            if progress is not None:
+                progress.record(ts_id, digest)
+            return True
+
+        items = list(data_points.items())
+        results, errors = map_concurrently(upload, items,
+                                           max_workers=max_workers if max_workers is not None else config.max_workers)
+        uploaded = {ts_id: r for (ts_id, _), r in zip(items, results) if r is not None}
+        if errors and raise_errors:
+            raise BatchError(errors, results)
+        for i, e in errors.items():
+            logging.error(f"Failed uploading data points of time series {items[i][0]}: {e!r}")
+        return uploaded
 
     def get_statistics(self, ts_id: str, scaling_length: float = None) -> Statistics:
         """
@@ -239,7 +567,29 @@ class TimeseriesAPI(BaseAPI):
         -------
         DataPoints
             Data points
+
+        Notes
+        -----
+        Unless `Config.scaling` is 'server', the statistics of the model scale data are scaled locally.
         """
-        parameters = dict(scaling_length=scaling_length)
-        data = self.client.get(resource=self._resource_path, endpoint=f"{ts_id}/statistics", parameters=parameters)
-        return Statistics(**data)
+        froude = None
+        if scaling_length is not None and self.client.config.scaling != "server":
+            froude = self._get_froude_parameters(ts_id, self.get_by_id(ts_id).datapoints_created_at)
+
+        if froude is None:
+            parameters = dict(scaling_length=scaling_length)
+            data = self.client.get(resource=self._resource_path, endpoint=f"{ts_id}/statistics",
+                                   parameters=parameters)
+            return Statistics(**data)
+
+        data = self.client.get(resource=self._resource_path, endpoint=f"{ts_id}/statistics")
+        statistics = froude_scale_statistics(Statistics(**data), froude["kind"],
+                                             scaling_length / froude["characteristic_length"])
+        if self.client.config.scaling == "parity":
+            data = self.client.get(resource=self._resource_path, endpoint=f"{ts_id}/statistics",
+                                   parameters=dict(scaling_length=scaling_length))
+            server = np.array(list(Statistics(**data).model_dump().values()))
+            if not np.allclose(server, np.array(list(statistics.model_dump().values()))):
+                raise ValueError(f"Local Froude scaling of statistics of time series '{ts_id}' to scaling length "
+                                 f"{scaling_length} deviates from scaling by the API.")
+        return statistics
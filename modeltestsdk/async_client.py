@@ -0,0 +1,115 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from .api import (AsyncCampaignAPI, AsyncSensorAPI, AsyncTestAPI, AsyncFloaterTestAPI, AsyncWaveCalibrationAPI,
+                  AsyncWindCalibrationAPI, AsyncTimeseriesAPI, AsyncTagsAPI, AsyncFloaterConfigAPI)
+from .client import Client
+from .concurrency import mark_worker
+from .config import Config
+from .transport import Transport
+
+
+class AsyncClient:
+    """
+    Asynchronous entrypoint into modeltest-db SDK.
+
+    Parameters
+    ----------
+    config : object, optional
+        Client configuration (host, base URL)
+    max_concurrency : int, optional
+        Maximum number of requests in flight, default is `Config.max_workers`
+    transport : Transport, optional
+        Transport carrying out the requests, see `Client`
+
+    Notes
+    -----
+    The asynchronous APIs mirror the synchronous ones and return the same resources. Requests are carried out by the
+    pooled synchronous client in a bounded pool of worker threads, so the resources returned are bound to the
+    synchronous client (`AsyncClient.client`) and their relationship properties are synchronous.
+
+    Examples
+    --------
+    >>> async with AsyncClient() as client:
+    ...     timeseries = await client.timeseries.get_by_test_id(test_id)
+    ...     data = await asyncio.gather(*[client.timeseries.get_data_points(ts.id) for ts in timeseries])
+
+    """
+
+    def __init__(self, config: Optional[Config] = None, max_concurrency: int = None,
+                 transport: Optional[Transport] = None):
+        """Initialize objects for interacting with the API"""
+        self.client = Client(config, transport=transport)
+        self.config: Config = self.client.config
+        self.filter = self.client.filter
+        self.sort = self.client.sort
+        self.max_concurrency = max_concurrency if max_concurrency is not None else self.config.max_workers
+        # calls run serially within each worker, at most max_concurrency requests are in flight
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, initializer=mark_worker)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        self.campaign = AsyncCampaignAPI(self, self.client.campaign)
+        self.timeseries = AsyncTimeseriesAPI(self, self.client.timeseries)
+        self.sensor = AsyncSensorAPI(self, self.client.sensor)
+        self.test = AsyncTestAPI(self, self.client.test)
+        self.floater_test = AsyncFloaterTestAPI(self, self.client.floater_test)
+        self.wind_calibration = AsyncWindCalibrationAPI(self, self.client.wind_calibration)
+        self.wave_calibration = AsyncWaveCalibrationAPI(self, self.client.wave_calibration)
+        self.tag = AsyncTagsAPI(self, self.client.tag)
+        self.floater_config = AsyncFloaterConfigAPI(self, self.client.floater_config)
+
+    def __str__(self):
+        return f"<AsyncClient host:'{self.config.api_host}'>"
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Run blocking function in the worker pool once a concurrency slot is available.
+
+        Parameters
+        ----------
+        func : callable
+            Function doing blocking I/O
+        args, kwargs
+            Arguments passed to the function
+
+        Returns
+        -------
+        Any
+            Return value of the function
+        """
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def get(self, resource: str = None, endpoint: str = None, parameters: dict = None, cache: bool = False):
+        """Perform GET request, see `Client.get`."""
+        return await self.run(self.client.get, resource=resource, endpoint=endpoint, parameters=parameters,
+                              cache=cache)
+
+    async def post(self, resource: str = None, endpoint: str = None, parameters: dict = None, body: dict = None):
+        """Perform POST request, see `Client.post`."""
+        return await self.run(self.client.post, resource=resource, endpoint=endpoint, parameters=parameters,
+                              body=body)
+
+    async def patch(self, resource: str = None, endpoint: str = None, parameters: dict = None, body: dict = None):
+        """Perform PATCH request, see `Client.patch`."""
+        return await self.run(self.client.patch, resource=resource, endpoint=endpoint, parameters=parameters,
+                              body=body)
+
+    async def delete(self, resource: str = None, endpoint: str = None, parameters: dict = None):
+        """Perform DELETE request, see `Client.delete`."""
+        return await self.run(self.client.delete, resource=resource, endpoint=endpoint, parameters=parameters)
+
+    async def close(self):
+        """Shut down the worker pool, waiting for calls in progress, and close pooled connections."""
+        # wait in a thread of the default executor, other tasks of the event loop keep running meanwhile
+        await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+        self.client.close()
@@ -0,0 +1,134 @@
+"""
+Management of access tokens
+"""
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from typing import Callable, Optional, Tuple
+
+
+class TokenManager:
+    """
+    Thread-safe holder of an access token, refreshing it ahead of expiry.
+
+    Only one thread authenticates at a time, the others wait for its token instead of authenticating themselves. A
+    token about to expire is refreshed by the first thread noticing while the others keep using the current token.
+
+    Parameters
+    ----------
+    authenticate : Callable
+        Function without arguments acquiring a new token, returning the token and its expiry (POSIX timestamp)
+    refresh_margin : float, optional
+        Refresh the token this many seconds before it expires
+    path : str, optional
+        File sharing the token with other processes (e.g. workers in a pool), so that they reuse a valid token instead
+        of authenticating. The token is kept in memory only by default.
+    key : str, optional
+        Identity of the token e.g. host and user, a shared token of another identity is ignored
+    """
+
+    def __init__(self, authenticate: Callable[[], Tuple[str, float]], refresh_margin: float = 60.,
+                 path: str = None, key: str = None):
+        self.authenticate = authenticate
+        self.refresh_margin = refresh_margin
+        self.path = str(path) if path is not None else None
+        self.key = key
+        self._token: Optional[str] = None
+        self._expires: float = 0.
+        self._rejected: Optional[str] = None  # token discarded by invalidate(), not to be taken over again
+        self._lock = threading.Lock()
+
+    def _is_fresh(self, expires: float) -> bool:
+        """bool: Token is valid and not due for refresh."""
+        return time.time() < expires - self.refresh_margin
+
+    def get(self) -> str:
+        """
+        Get valid access token, authenticating if necessary.
+
+        Returns
+        -------
+        str
+            Access token
+        """
+        token, expires = self._token, self._expires
+        if token is not None and self._is_fresh(expires):
+            return token
+
+        if token is not None and time.time() < expires:
+            # still valid, refreshed by one thread while the others use the current token
+            if self._lock.acquire(blocking=False):
+                try:
+                    if not self._is_fresh(self._expires):
+                        self._refresh()
+                except Exception as e:
+                    logging.warning(f"Failed refreshing access token ahead of expiry: {e!r}")
+                finally:
+                    self._lock.release()
+            return self._token
+
+        with self._lock:
+            if self._token is None or not self._is_fresh(self._expires):
+                self._refresh()
+            return self._token
+
+    def invalidate(self, token: str = None):
+        """
+        Discard the current token e.g. if rejected by the API.
+
+        Parameters
+        ----------
+        token : str, optional
+            Discard only if this is the current token, so that a token refreshed by another thread is kept
+        """
+        with self._lock:
+            if token is None or token == self._token:
+                self._rejected = self._token
+                self._token, self._expires = None, 0.
+
+    def _refresh(self):
+        """Take over a fresh shared token, or authenticate. Call while holding the lock."""
+        shared = self._read()
+        if shared is not None and self._is_fresh(shared[1]) and shared[0] not in (self._token, self._rejected):
+            logging.debug("Reusing access token shared by another process.")
+            self._token, self._expires = shared
+            return
+
+        logging.info("Authenticating by user impersonation.")
+        token, expires = self.authenticate()
+        if token is None or expires is None:
+            raise ValueError(f"Unable to acquire a valid access token 'access_token'= {token} and "
+                             f"token expiry 'expires' = {expires}")
+        logging.info("Acquired valid access token.")
+        self._token, self._expires = token, float(expires)
+        self._write()
+
+    def _read(self) -> Optional[Tuple[str, float]]:
+        """tuple: Token and expiry shared by another process, None if not available."""
+        if self.path is None:
+            return None
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("key") != self.key or data.get("token") is None:
+            return None
+        return data["token"], float(data["expires"])
+
+    def _write(self):
+        """Share the current token with other processes, readable by the owner only."""
+        if self.path is None:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        tmp = os.path.join(directory, f".{uuid.uuid4().hex}.tmp")
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), "w") as f:
+                json.dump(dict(key=self.key, token=self._token, expires=self._expires), f)
+            os.replace(tmp, self.path)
+        except OSError as e:  # pragma: no cover
+            logging.warning(f"Failed sharing access token in '{self.path}': {e!r}")
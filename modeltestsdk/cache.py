@@ -0,0 +1,431 @@
+"""
+Local caching of data points
+"""
+import json
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import closing
+from datetime import timedelta
+from typing import Any, Hashable, Optional, Tuple
+
+import numpy as np
+
+# format of the data point store, entries of earlier formats are discarded:
+# 1 - complete time series downloaded in one go (earlier entries may miss data points beyond gaps)
+STORE_FORMAT = 1
+
+
+def window(time_: np.ndarray, value: np.ndarray, start: float = None, end: float = None,
+           is_sorted: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Slice data points within time window.
+
+    Parameters
+    ----------
+    time_ : numpy.ndarray
+        Time
+    value : numpy.ndarray
+        Values
+    start : float, optional
+        Keep data points at and after this time (s)
+    end : float, optional
+        Keep data points at and before this time (s)
+    is_sorted : bool, optional
+        Time is in ascending order, the window is located by binary search and the arrays are sliced without copying
+
+    Returns
+    -------
+    tuple
+        Time and values within the window
+    """
+    if start is None and end is None:
+        return time_, value
+    if is_sorted:
+        i = 0 if start is None else np.searchsorted(time_, start, side="left")
+        j = len(time_) if end is None else np.searchsorted(time_, end, side="right")
+        return time_[i:j], value[i:j]
+
+    mask = np.ones(len(time_), dtype=bool)
+    if start is not None:
+        mask &= time_ >= start
+    if end is not None:
+        mask &= time_ <= end
+    return time_[mask], value[mask]
+
+
+class DataPointStore:
+    """
+    Local store of data point arrays.
+
+    Each entry is a binary array file (.npy) holding the complete time series, time and values as the two rows of a
+    float64 array. Entries are looked up through a small SQLite index and memory mapped when read, avoiding parsing
+    of JSON responses. Time windows are sliced from the complete time series.
+
+    Entries may be versioned (e.g. by the time the data points were created). A versioned entry is valid until the
+    version changes, regardless of its age.
+
+    Parameters
+    ----------
+    path : str
+        Directory holding the array files and the index
+    expire_after : timedelta, optional
+        Entries without version older than this are discarded, never by default
+    """
+
+    def __init__(self, path: str, expire_after: timedelta = None):
+        self.path = str(path)
+        self.expire_after = expire_after
+
+    def __str__(self):
+        return f"<DataPointStore path:'{self.path}'>"
+
+    @property
+    def _index(self) -> str:
+        return os.path.join(self.path, "index.sqlite")
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(self.path, exist_ok=True)
+        con = sqlite3.connect(self._index, timeout=30)
+        con.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, timeseries_id TEXT, file TEXT, "
+                    "created_at REAL, size INTEGER, sorted INTEGER, metadata TEXT, version TEXT)")
+        con.execute("CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, timeseries_id TEXT, metadata TEXT, "
+                    "version TEXT)")
+        if con.execute("PRAGMA user_version").fetchone()[0] < STORE_FORMAT:
+            with con:
+                files = con.execute("SELECT file FROM entries").fetchall()
+                con.execute("DELETE FROM entries")
+                con.execute(f"PRAGMA user_version = {STORE_FORMAT}")
+            self._remove_files(file for (file,) in files)
+        return con
+
+    def _remove_files(self, files):
+        """Remove array files of deleted entries."""
+        for file in files:
+            try:
+                os.remove(os.path.join(self.path, file))
+            except OSError:  # pragma: no cover
+                pass  # still memory mapped (Windows), orphaned file is overwritten or removed by clear()
+
+    @staticmethod
+    def _key(timeseries_id: str, parameters: dict) -> str:
+        """str: Key identifying the data points of a time series fetched with certain parameters."""
+        return timeseries_id + json.dumps(parameters, sort_keys=True)
+
+    def get(self, timeseries_id: str, parameters: dict = None, start: float = None, end: float = None,
+            version: str = None) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Get cached data points.
+
+        Parameters
+        ----------
+        timeseries_id : str
+            Time series identifier
+        parameters : dict, optional
+            Parameters the data points were fetched with
+        start : float, optional
+            Get data points at and after this time (s)
+        end : float, optional
+            Get data points at and before this time (s)
+        version : str, optional
+            Current version of the data points, entries of other versions are discarded
+
+        Returns
+        -------
+        tuple
+            Time and values as memory mapped arrays, None if not cached. The arrays are copy-on-write, modifying
+            them does not alter the cache.
+        """
+        key = self._key(timeseries_id, parameters or dict())
+        if not os.path.exists(self._index):
+            return None
+
+        with closing(self._connect()) as con:
+            row = con.execute("SELECT file, created_at, sorted, version FROM entries WHERE key = ?",
+                              (key,)).fetchone()
+        if row is None:
+            return None
+
+        file, created_at, is_sorted, cached_version = row
+        if cached_version != version:
+            self.delete(timeseries_id)
+            return None
+        if version is None and self.expire_after is not None and \
+                time.time() - created_at > self.expire_after.total_seconds():
+            self.delete(timeseries_id)
+            return None
+
+        try:
+            data = np.load(os.path.join(self.path, file), mmap_mode="c")
+        except FileNotFoundError:
+            return None
+        return window(data[0], data[1], start=start, end=end, is_sorted=bool(is_sorted))
+
+    def put(self, timeseries_id: str, time_: np.ndarray, value: np.ndarray, parameters: dict = None,
+            metadata: dict = None, version: str = None):
+        """
+        Add data points to the cache, replacing existing entry.
+
+        Parameters
+        ----------
+        timeseries_id : str
+            Time series identifier
+        time_ : numpy.ndarray
+            Time
+        value : numpy.ndarray
+            Values
+        parameters : dict, optional
+            Parameters the data points were fetched with
+        metadata : dict, optional
+            JSON serializable metadata stored with the entry, see `set_metadata`
+        version : str, optional
+            Version of the data points
+        """
+        key = self._key(timeseries_id, parameters or dict())
+        file = f"{timeseries_id}-{hashlib.sha1(key.encode()).hexdigest()[:16]}.npy"
+        os.makedirs(self.path, exist_ok=True)
+
+        # write to a temporary file first, readers never see a partially written file
+        tmp = os.path.join(self.path, f".{uuid.uuid4().hex}.tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, np.vstack((time_, value)).astype(np.float64, copy=False))
+        os.replace(tmp, os.path.join(self.path, file))
+
+        with closing(self._connect()) as con, con:
+            con.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (key, timeseries_id, file, time.time(), len(time_), bool(np.all(np.diff(time_) >= 0)),
+                         None, version))
+            if metadata is not None:
+                con.execute("INSERT OR REPLACE INTO metadata VALUES (?, ?, ?, ?)",
+                            (key, timeseries_id, json.dumps(metadata), version))
+
+    def get_metadata(self, timeseries_id: str, parameters: dict = None, version: str = None) -> Optional[dict]:
+        """
+        Get metadata of data points.
+
+        Parameters
+        ----------
+        timeseries_id : str
+            Time series identifier
+        parameters : dict, optional
+            Parameters the data points are fetched with
+        version : str, optional
+            Current version of the data points, metadata of other versions is ignored
+
+        Returns
+        -------
+        dict
+            Metadata, None if not stored for this version
+        """
+        if not os.path.exists(self._index):
+            return None
+
+        with closing(self._connect()) as con:
+            row = con.execute("SELECT metadata, version FROM metadata WHERE key = ?",
+                              (self._key(timeseries_id, parameters or dict()),)).fetchone()
+        return json.loads(row[0]) if row is not None and row[1] == version else None
+
+    def set_metadata(self, timeseries_id: str, metadata: dict, parameters: dict = None, version: str = None):
+        """
+        Store metadata of data points, whether the data points are cached or not.
+
+        Parameters
+        ----------
+        timeseries_id : str
+            Time series identifier
+        metadata : dict
+            JSON serializable metadata
+        parameters : dict, optional
+            Parameters the data points are fetched with
+        version : str, optional
+            Version of the data points the metadata applies to
+        """
+        with closing(self._connect()) as con, con:
+            con.execute("INSERT OR REPLACE INTO metadata VALUES (?, ?, ?, ?)",
+                        (self._key(timeseries_id, parameters or dict()), timeseries_id, json.dumps(metadata),
+                         version))
+
+    def delete(self, timeseries_id: str):
+        """
+        Remove cached data points of time series. Metadata is kept, it is ignored once the version changes.
+
+        Parameters
+        ----------
+        timeseries_id : str
+            Time series identifier
+        """
+        if not os.path.exists(self._index):
+            return
+
+        with closing(self._connect()) as con, con:
+            files = con.execute("SELECT file FROM entries WHERE timeseries_id = ?", (timeseries_id,)).fetchall()
+            con.execute("DELETE FROM entries WHERE timeseries_id = ?", (timeseries_id,))
+        self._remove_files(file for (file,) in files)
+
+    def clear(self):
+        """Remove all cached data points."""
+        if not os.path.isdir(self.path):
+            return
+
+        with closing(self._connect()) as con, con:
+            con.execute("DELETE FROM entries")
+            con.execute("DELETE FROM metadata")
+        for file in os.listdir(self.path):
+            if file.endswith((".npy", ".tmp")):
+                try:
+                    os.remove(os.path.join(self.path, file))
+                except OSError:  # pragma: no cover
+                    pass
+
+
+class IdentityMap:
+    """
+    Bounded in-process map of resources, so that each item is fetched once and shared by everything referencing it.
+
+    Items are evicted when their time to live has passed or, least recently used first, when the map is full. Read
+    only items do not change and are kept regardless of their age.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Maximum number of items, 0 disables the map
+    ttl : float, optional
+        Time to live (s) of items that are not read only, forever if None
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 300.):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get item.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key e.g. (resource path, id)
+
+        Returns
+        -------
+        Any
+            Item, None if unknown or expired
+        """
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                return None
+            item, expires = entry
+            if expires is not None and time.monotonic() > expires:
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return item
+
+    def put(self, key: Hashable, item: Any):
+        """
+        Add item, replacing existing item with the same key.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key e.g. (resource path, id)
+        item : Any
+            Item, kept until evicted if it has a true `read_only` attribute
+        """
+        if self.maxsize <= 0:
+            return
+        expires = None if self.ttl is None or getattr(item, "read_only", False) else time.monotonic() + self.ttl
+        with self._lock:
+            self._items[key] = (item, expires)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def discard(self, item_id: str):
+        """
+        Remove item by id, under any resource path.
+
+        Parameters
+        ----------
+        item_id : str
+            Item identifier, the last element of the key
+        """
+        with self._lock:
+            for key in [k for k in self._items if isinstance(k, tuple) and k[-1] == item_id]:
+                del self._items[key]
+
+    def clear(self):
+        """Remove all items."""
+        with self._lock:
+            self._items.clear()
+
+
+class ProgressManifest:
+    """
+    Local record of completed work items, allowing interrupted work to resume.
+
+    Each item is recorded with a digest of its content, an item is only considered done if recorded with the same
+    digest. The manifest is a JSON file rewritten atomically whenever an item is recorded.
+
+    Parameters
+    ----------
+    path : str
+        Manifest file
+    """
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        try:
+            with open(self.path) as f:
+                self._items = json.load(f)
+        except FileNotFoundError:
+            self._items = dict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @staticmethod
+    def digest(*arrays: np.ndarray) -> str:
+        """str: Digest of the content of arrays."""
+        h = hashlib.sha1()
+        for a in arrays:
+            h.update(np.ascontiguousarray(a).tobytes())
+        return h.hexdigest()
+
+    def is_done(self, key: str, digest: str) -> bool:
+        """bool: Has the item been recorded with this digest."""
+        return self._items.get(key) == digest
+
+    def record(self, key: str, digest: str):
+        """
+        Record item as done.
+
+        Parameters
+        ----------
+        key : str
+            Item key e.g. time series identifier
+        digest : str
+            Digest of the item content
+        """
+        with self._lock:
+            self._items[key] = digest
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            tmp = os.path.join(directory, f".{uuid.uuid4().hex}.tmp")
+            with open(tmp, "w") as f:
+                json.dump(self._items, f)
+            os.replace(tmp, self.path)
@@ -1,22 +1,27 @@
-import os
+import gzip
+import json
 import sys
-from typing import Optional
+import time
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple, Union
 
 import requests
 import requests_cache
 import logging
-import numpy as np
-try:
-    from datetime import UTC
-except ImportError:
-    from datetime import timezone
-    UTC = timezone.utc
-from datetime import datetime
 from .api import (TimeseriesAPI, CampaignAPI, SensorAPI, TestAPI, FloaterTestAPI, WindCalibrationAPI,
                   WaveCalibrationAPI, TagsAPI, FloaterConfigAPI)
 from .query import Query
 from .config import Config
-from requests.adapters import HTTPAdapter, Retry
+from .auth import TokenManager
+from .cache import DataPointStore, IdentityMap
+from .concurrency import SingleFlight
+from .metrics import Metrics, endpoint_key
+from .tracing import Tracer, traced
+from .transport import RequestsTransport, Transport
+from .utils import to_json
+from requests.adapters import Retry
+from requests_cache.backends.sqlite import get_cache_path
 
 log_levels = dict(debug=logging.DEBUG, info=logging.INFO, error=logging.ERROR)
 
@@ -29,6 +34,9 @@ class Client:
     ----------
     config : object, optional
         Client configuration (host, base URL)
+    transport : Transport, optional
+        Transport carrying out the requests, pooled connections over the network (`RequestsTransport`) by default.
+        Use `WSGITransport` or `ASGITransport` to call a local application in-process, without sockets.
 
     Notes
     -----
@@ -40,9 +48,10 @@ class Client:
 
     """
 
-    def __init__(self, config: Optional[Config] = None):
+    def __init__(self, config: Optional[Config] = None, transport: Optional[Transport] = None):
         """Initialize objects for interacting with the API"""
         self.config: Config = config if config is not None else Config(_env_file="../.env")
+        self.transport: Transport = transport if transport is not None else RequestsTransport()
         self.filter = Query(method_spec='filter')
         self.sort = Query(method_spec='sort')
         self.campaign = CampaignAPI(client=self)
@@ -59,6 +68,36 @@ class Client:
                 backoff_factor=self.config.requests_backoff_factor,
                 status_forcelist=[500, 502, 503, 504])
 
+        # local store of data point arrays
+        cache_settings = self.config.cache_settings
+        self.datapoint_store = DataPointStore(
+            cache_settings.datapoints_dir if cache_settings.datapoints_dir is not None else
+            get_cache_path(f"{cache_settings.cache_name}_datapoints", use_cache_dir=cache_settings.use_cache_dir),
+            expire_after=cache_settings.expire_after)
+
+        # resources fetched by id, shared by all resources referencing them
+        self.identity_map = IdentityMap(maxsize=self.config.identity_map_size, ttl=self.config.identity_map_ttl)
+
+        # access token shared by all threads, and processes if configured
+        self.token_manager = TokenManager(self._authenticate, refresh_margin=self.config.token_refresh_margin,
+                                          path=self.config.token_file,
+                                          key=f"{self.config.api_host} {self.config.api_user}")
+
+        # metrics of requests and caches
+        self.metrics = Metrics(enabled=self.config.metrics)
+
+        # spans of operations, if tracing
+        self.tracer = Tracer(enabled=self.config.tracing)
+
+        # identical GET requests in flight
+        self._in_flight = SingleFlight()
+
+        # pooled sessions are created lazily and shared by all API classes
+        self._session: Optional[requests.Session] = None
+        self._cached_session: Optional[requests_cache.CachedSession] = None
+        self._session_last_used: float = 0.0
+        self._session_lock = threading.Lock()
+
         # configure logging
         log_levels = dict(debug=logging.DEBUG, info=logging.INFO, error=logging.ERROR)
         level = log_levels.get(self.config.log_level, logging.INFO)
@@ -72,30 +111,90 @@ class Client:
     def __str__(self):
         return f"<Client host:'{self.config.api_host}'>"
 
-    def _request_token(self) -> str:
-        """str: Authenticate and return access token."""
-        # check if current access token is still valid
-        current_token = os.getenv("INQUIRE_MODELTEST_API_TOKEN")
-        token_expires_on = os.getenv("INQUIRE_MODELTEST_API_TOKEN_EXPIRES")
-        if current_token is not None and token_expires_on is not None and \
-                datetime.now(UTC).timestamp() < float(token_expires_on):
-            logging.debug("Your current access token is still valid.")
-            return current_token
-
-        # authenticate and get access token
-        try:
-            logging.info("Authenticating by user impersonation.")
-            user = os.getenv("INQUIRE_MODELTEST_API_USER")
-            passwd = os.getenv("INQUIRE_MODELTEST_API_PASSWORD")
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _mount_adapters(self, session: requests.Session) -> requests.Session:
+        """Mount the adapter of the transport for both http and https."""
+        adapter = self.transport.adapter(self)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def _get_session(self, cache: bool = False) -> requests.Session:
+        """
+        Return the pooled session, creating it on first use.
+
+        Parameters
+        ----------
+        cache : bool, optional
+            Return the session which caches responses
+
+        Returns
+        -------
+        requests.Session
+            Session with connection pool
 
-            s = requests.session()
-            s.mount('http://', HTTPAdapter(max_retries=self.retries))
+        Notes
+        -----
+        Pooled connections which have been idle for longer than `requests_pool_keep_alive` seconds are most
+        likely closed by the server, they are dropped instead of reused. The sessions are kept, requests in progress
+        e.g. streaming a long download are not affected.
+        """
+        with self._session_lock:
+            now = time.monotonic()
+            if now - self._session_last_used > self.config.requests_pool_keep_alive:
+                self._drop_idle_connections()
+            self._session_last_used = now
 
-            r = s.post(
+            if cache:
+                if self._cached_session is None:
+                    settings = self.config.cache_settings.model_dump(exclude={"datapoints_dir"})
+                    self._cached_session = self._mount_adapters(requests_cache.CachedSession(**settings))
+                return self._cached_session
+            else:
+                if self._session is None:
+                    self._session = self._mount_adapters(requests.Session())
+                return self._session
+
+    @property
+    def session(self) -> requests.Session:
+        """requests.Session: Pooled session shared by all requests."""
+        return self._get_session()
+
+    def _drop_idle_connections(self):
+        """Close pooled connections not in use, connections of requests in progress are closed once released."""
+        for s in (self._session, self._cached_session):
+            for adapter in (s.adapters.values() if s is not None else ()):
+                poolmanager = getattr(adapter, "poolmanager", None)
+                if poolmanager is not None:
+                    poolmanager.clear()
+
+    def _close_sessions(self):
+        """Close pooled sessions and their connections."""
+        for s in (self._session, self._cached_session):
+            if s is not None:
+                s.close()
+        self._session = None
+        self._cached_session = None
+
+    def close(self):
+        """Close pooled connections."""
+        with self._session_lock:
+            self._close_sessions()
+
+    @traced("POST auth/token", cat="http")
+    def _authenticate(self) -> Tuple[str, float]:
+        """tuple: Authenticate by user impersonation, return access token and its expiry (POSIX timestamp)."""
+        try:
+            r = self.session.post(
                 self._create_url(resource="auth", endpoint="token"),
                 data=dict(grant_type=None,
-                          username=user,
-                          password=passwd,
+                          username=self.config.api_user,
+                          password=self.config.api_password,
                           scope=None,
                           client_id=None,
                           client_secret=None)
@@ -110,18 +209,12 @@ class Client:
         except requests.exceptions.RequestException as e:  # pragma: no cover
             raise e
         else:
-            # update env vars
             data = r.json()
-            token = data.get("access_token")
-            expires = data.get("expires")
-            if token is None and expires is None:
-                raise ValueError(f"Unable to acquire a valid access token 'access_token'= {token} and "
-                                 f"token expiry 'expires' = {expires}")
-            else:
-                logging.info("Acquired valid access token.")
-                os.environ["INQUIRE_MODELTEST_API_TOKEN"] = token
-                os.environ["INQUIRE_MODELTEST_API_TOKEN_EXPIRES"] = str(expires)
-                return token
+            return data.get("access_token"), data.get("expires")
+
+    def _request_token(self) -> str:
+        """str: Valid access token, authenticating if necessary."""
+        return self.token_manager.get()
 
     def _create_url(self, resource: str = None, endpoint: str = None) -> str:
         """
@@ -149,8 +242,9 @@ class Client:
         url += "/".join([p for p in [resource, endpoint] if p is not None])
         return url
 
-    def _do_request(self, method: str, resource: str = None, endpoint: str = None, parameters: dict = None,
-                    body: dict = None, cache=False):
+    def _request(self, method: str, resource: str = None, endpoint: str = None, parameters: dict = None,
+                 body: Union[dict, bytes] = None, cache: bool = False, headers: dict = None,
+                 stream: bool = False) -> requests.Response:
         """
         Carry out request.
 
@@ -164,89 +258,186 @@ class Client:
             API resource endpoint e.g.
         parameters : dict, optional
             Request parameters.
-        body : dict, optional
-            Request body.
+        body : dict or bytes, optional
+            Request body, a dict is sent as JSON and bytes as is (set 'Content-Type' in `headers`).
+        cache : bool, optional
+            Use the session caching responses
+        headers : dict, optional
+            Headers added to or replacing the default headers
+        stream : bool, optional
+            Defer reading the response body until it is accessed e.g. by `requests.Response.iter_content()`
 
         Returns
         -------
-        dict
-            Request response
+        requests.Response
+            Response
 
         """
         # create base url
         url = self._create_url(resource=resource, endpoint=endpoint)
 
-        # authenticate and get access token
-        token = self._request_token()
-
         # create request headers
         headers = {
-            "Authorization": f"Bearer {token}",
             "Connection": "keep-alive",
             "Host": self.config.api_host.split("://")[-1],  # remove leading http/https
             "Content-Type": "application/json",
-            "Accept": "application/json"
+            "Accept": "application/json",
+            "Accept-Encoding": self.config.requests_accept_encoding,
+            **(headers or dict())
         }
 
         # remove empty values from parameters
         if parameters is not None:
             parameters = {k: v for k, v in parameters.items() if v is not None}
 
+        # compress large bodies (responses are decompressed by urllib3 while they are read)
+        data = to_json(body) if isinstance(body, (dict, list)) else body
+        if data is not None and self.config.requests_compress and len(data) >= self.config.requests_compress_min_size:
+            data = gzip.compress(data, compresslevel=self.config.requests_compress_level)
+            headers["Content-Encoding"] = "gzip"
+
         # do request (also encodes parameters)
+        s = self._get_session(cache=cache)
+
+        key = endpoint_key(method, resource, endpoint)
+        with self.tracer.span(key, cat="http") as trace:
+            r, retries, start = None, 0, time.perf_counter()
+            try:
+                # authenticate, and again if the token is rejected (e.g. revoked or expired early)
+                for attempt in range(2):
+                    token = self._request_token()
+                    headers["Authorization"] = f"Bearer {token}"
+                    r = s.request(method, url, params=parameters, data=data, headers=headers, stream=stream)
+                    self._count_bytes(key, r, stream=stream)
+                    if r.status_code != 401 or attempt > 0:
+                        break
+                    logging.info("Access token rejected, authenticating again.")
+                    r.close()
+                    retries += 1
+                    self.token_manager.invalidate(token)
+                trace["status"] = r.status_code
+                r.raise_for_status()
+            except requests.exceptions.HTTPError as e:  # pragma: no cover
+                logging.error("Request body:  " + (f"{len(body)} bytes" if isinstance(body, bytes) else str(body)))
+                logging.error("Request response: " + r.text)
+                raise e
+            except requests.exceptions.ConnectionError as e:  # pragma: no cover
+                raise e
+            except requests.exceptions.Timeout as e:  # pragma: no cover
+                raise e
+            except requests.exceptions.RequestException as e:  # pragma: no cover
+                raise e
+            else:
+                return r
+            finally:
+                if self.metrics.enabled:
+                    self._record_request(key, time.perf_counter() - start, r, retries, cache=cache, stream=stream)
+
+    def _record_request(self, key: str, latency: float, r: Optional[requests.Response], retries: int = 0,
+                        cache: bool = False, stream: bool = False):
+        """Record metrics of request, the response is None if the request failed before a response was received."""
+        if r is None:
+            self.metrics.record_request(key, latency, retries=retries, error=True)
+            return
+        history = getattr(getattr(r.raw, "retries", None), "history", None)
+        # bytes of streamed responses are counted as they are read
+        size = 0 if stream else len(r.content)
+        self.metrics.record_request(key, latency, size=size, retries=retries + len(history or ()), error=not r.ok,
+                                    from_cache=bool(getattr(r, "from_cache", False)) if cache else None)
+
+    def _count_bytes(self, key: str, r: requests.Response, stream: bool = False):
+        """Record the bytes of a streamed response body as it is read, by `iter_content()` or `content`."""
+        if not stream or not self.metrics.enabled:
+            return
+        iter_content = r.iter_content
+
+        def counting_iter_content(*args, **kwargs):
+            size = 0
+            try:
+                for chunk in iter_content(*args, **kwargs):
+                    size += len(chunk)
+                    yield chunk
+            finally:
+                self.metrics.record_bytes(key, size)
+
+        r.iter_content = counting_iter_content
+
+    def stats(self) -> dict:
+        """
+        Snapshot of request and cache metrics, recorded if `Config.metrics` is enabled.
+
+        Returns
+        -------
+        dict
+            Request count, errors, retries, response bytes (decompressed, as read), cache hits and misses and latency (s)
+            percentiles and histogram by endpoint ('requests'), e.g. 'GET timeseries/{id}/data', and hits and misses
+            by cache ('caches')
+        """
+        return self.metrics.snapshot()
+
+    def reset_stats(self):
+        """Discard recorded metrics."""
+        self.metrics.reset()
 
-        s = requests.session()
-        s.mount('http://', HTTPAdapter(max_retries=self.retries))
+    @contextmanager
+    def trace(self, path: str = None) -> Iterator[Tracer]:
+        """
+        Trace operations within the context, e.g. API methods, HTTP requests, decoding and building resources.
+
+        Parameters
+        ----------
+        path : str, optional
+            Write the trace to this file in the Chrome trace event format on exit, open it in Perfetto
+            (https://ui.perfetto.dev) or chrome://tracing
+
+        Yields
+        ------
+        Tracer
+            Tracer recording the spans, see `Config.tracing` to trace all operations
+
+        Examples
+        --------
+        >>> with client.trace("trace.json"):
+        ...     tsdb = test.timeseries().get_qats_tsdb()
 
+        """
+        enabled = self.tracer.enabled
+        self.tracer.clear()
+        self.tracer.enabled = True
         try:
-            if cache:
-                with requests_cache.enabled(**self.config.cache_settings.model_dump()):
-                    r = s.request(method, url, params=parameters, json=body, headers=headers)
-                r.raise_for_status()
-            else:
-                r = s.request(method, url, params=parameters, json=body, headers=headers)
-                r.raise_for_status()
-        except requests.exceptions.HTTPError as e:  # pragma: no cover
-            logging.error("Request body:  " + str(body))
-            logging.error("Request response: " + r.text)
-            raise e
-        except requests.exceptions.ConnectionError as e:  # pragma: no cover
-            raise e
-        except requests.exceptions.Timeout as e:  # pragma: no cover
-            raise e
-        except requests.exceptions.RequestException as e:  # pragma: no cover
-            raise e
-        else:
-            return r.json()
+            yield self.tracer
+        finally:
+            self.tracer.enabled = enabled
+            if path is not None:
+                self.tracer.export(path)
 
-    @staticmethod
-    def _ensure_serializable(body: dict):
+    def _do_request(self, method: str, resource: str = None, endpoint: str = None, parameters: dict = None,
+                    body: dict = None, cache=False):
         """
-        change data types not natively supported by json encoder
+        Carry out request.
 
         Parameters
         ----------
-        body : dict
+        method : {'GET', 'POST', 'PUT', 'PATCH', 'DELETE'}
+            Request method.
+        resource : str, optional
+            API resource e.g. 'plant/timeseries'
+        endpoint : str, optional
+            API resource endpoint e.g.
+        parameters : dict, optional
+            Request parameters.
+        body : dict, optional
             Request body.
 
         Returns
         -------
         dict
-            Request body with json encoder supported data types
-        """
-
-        serializable_body = dict()
-        for key, value in body.items():
-            if isinstance(value, np.int64) or isinstance(value, np.int32):
-                value = int(value)
-            elif isinstance(value, np.float64) or isinstance(value, np.float32):
-                value = float(value)
-
-            if (isinstance(value, float) or isinstance(value, int)) and np.isnan(value):
-                value = None
-
-            serializable_body[key] = value
+            Request response
 
-        return serializable_body
+        """
+        r = self._request(method, resource=resource, endpoint=endpoint, parameters=parameters, body=body, cache=cache)
+        with self.tracer.span("json", cat="decode", bytes=len(r.content)):
+            return r.json()
 
     def get(self, resource: str = None, endpoint: str = None, parameters: dict = None, cache: bool = False):
         """
@@ -268,8 +459,19 @@ class Client:
         dict
             Request response
 
+        Notes
+        -----
+        Identical requests made concurrently by several threads are coalesced into one (`Config.coalesce_requests`),
+        the threads share the response. Do not modify it in place.
+
         """
-        return self._do_request("GET", resource=resource, endpoint=endpoint, parameters=parameters, cache=cache)
+        if not self.config.coalesce_requests:
+            return self._do_request("GET", resource=resource, endpoint=endpoint, parameters=parameters, cache=cache)
+
+        key = (resource, endpoint, cache, json.dumps({k: v for k, v in (parameters or dict()).items() if v is not None},
+                                                     sort_keys=True, default=str))
+        return self._in_flight.do(key, lambda: self._do_request("GET", resource=resource, endpoint=endpoint,
+                                                                parameters=parameters, cache=cache))
 
     def post(self, resource: str = None, endpoint: str = None, parameters: dict = None, body: dict = None):
         """
@@ -284,15 +486,13 @@ class Client:
         parameters : dict, optional
             Request parameters.
         body : dict, optional
-            Request body.
+            Request body, may contain NumPy arrays. NaN values are sent as null.
 
         Returns
         -------
         dict
             Request response
         """
-        body = self._ensure_serializable(body)
-
         return self._do_request("POST", resource=resource, endpoint=endpoint, parameters=parameters, body=body)
 
     def patch(self, resource: str = None, endpoint: str = None, parameters: dict = None, body: dict = None):
@@ -308,7 +508,7 @@ class Client:
         parameters : dict, optional
             Request parameters.
         body : dict, optional
-            Request body.
+            Request body, may contain NumPy arrays. NaN values are sent as null.
 
         Returns
         -------
@@ -339,7 +539,9 @@ class Client:
 
     def clear_cache(self):
         """
-        Removes cached datapoints (from mtdb.sqlite at local cache folder)
+        Removes cached datapoints (from mtdb_datapoints at local cache folder), cached responses (from mtdb.sqlite) and
+        resources held in memory
         """
-        with requests_cache.enabled(**self.config.cache_settings):  # pragma: no cover
-            requests_cache.clear()
+        self.identity_map.clear()
+        self.datapoint_store.clear()
+        self._get_session(cache=True).cache.clear()
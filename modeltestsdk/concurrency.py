@@ -0,0 +1,169 @@
+"""
+Concurrent execution of I/O bound work
+"""
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Hashable, Iterable, List, Dict, Tuple, Any
+
+_local = threading.local()
+
+
+def mark_worker():
+    """Mark the current thread as a worker, concurrent work started from it is carried out serially."""
+    _local.worker = True
+
+
+def in_worker() -> bool:
+    """bool: The current thread is a worker of `map_concurrently` or another marked pool."""
+    return getattr(_local, "worker", False)
+
+
+class BatchError(Exception):
+    """
+    One or more items of a batch failed.
+
+    Parameters
+    ----------
+    errors : dict
+        Exception raised for each failed item, by item index
+    results : list
+        Results in input order, None for failed items
+    """
+
+    def __init__(self, errors: Dict[int, Exception], results: List[Any]):
+        self.errors = errors
+        self.results = results
+        super().__init__(f"{len(errors)} of {len(results)} items failed: "
+                         + "; ".join(f"[{i}] {e!r}" for i, e in errors.items()))
+
+
+def map_concurrently(func: Callable, items: Iterable, max_workers: int = 1) -> Tuple[List[Any], Dict[int, Exception]]:
+    """
+    Apply function to each item using a bounded pool of threads.
+
+    Parameters
+    ----------
+    func : Callable
+        Function taking a single item
+    items : Iterable
+        Items
+    max_workers : int, optional
+        Maximum number of concurrent calls, items are processed serially if 1
+
+    Returns
+    -------
+    list
+        Results in input order, None for failed items
+    dict
+        Exception raised for each failed item, by item index
+
+    Notes
+    -----
+    A failing item does not abort the others, all items are processed before returning. Failures are returned rather
+    than logged (only at debug level), the caller decides whether they are errors.
+
+    Items are processed serially when called from a worker, e.g. data points fetched in windows for each of a list
+    of time series, so nested calls never exceed `max_workers` requests in flight and the connection pool.
+    """
+    items = list(items)
+    results = [None] * len(items)
+    errors = dict()
+
+    def call(i):
+        try:
+            results[i] = func(items[i])
+        except Exception as e:
+            logging.debug(f"Failed processing item {i} of {len(items)}: {e!r}")
+            errors[i] = e
+
+    if max_workers is None or max_workers <= 1 or len(items) <= 1 or in_worker():
+        for i in range(len(items)):
+            call(i)
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(items)), initializer=mark_worker) as executor:
+            list(executor.map(call, range(len(items))))
+
+    return results, dict(sorted(errors.items()))
+
+
+def call_with_retries(func: Callable, retries: int = 0, backoff_factor: float = 0.,
+                      retry_on: Callable[[Exception], bool] = None) -> Any:
+    """
+    Call function, retrying with exponential backoff if it fails.
+
+    Parameters
+    ----------
+    func : Callable
+        Function without arguments
+    retries : int, optional
+        Maximum number of retries
+    backoff_factor : float, optional
+        Sleep backoff_factor * 2 ** (retry - 1) seconds before each retry
+    retry_on : Callable, optional
+        Predicate telling if a failure is worth retrying, all failures are retried by default
+
+    Returns
+    -------
+    Any
+        Return value of the function
+    """
+    attempt = 0
+    while True:
+        try:
+            return func()
+        except Exception as e:
+            if attempt >= retries or (retry_on is not None and not retry_on(e)):
+                raise
+            attempt += 1
+            logging.warning(f"Retrying ({attempt} of {retries}) after failure: {e!r}")
+            time.sleep(backoff_factor * 2 ** (attempt - 1))
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls with the same key into one call, sharing its result or exception.
+
+    Calls are only coalesced while in flight, a call starting after another has returned is carried out again.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, Future] = dict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def do(self, key: Hashable, func: Callable) -> Any:
+        """
+        Call function, or wait for the call in flight with the same key.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key identifying the call
+        func : Callable
+            Function without arguments
+
+        Returns
+        -------
+        Any
+            Return value of the function, the same object for all coalesced calls
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(func())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return future.result()
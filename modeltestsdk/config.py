@@ -3,7 +3,7 @@ Configurations
 """
 import os
 from datetime import timedelta
-from typing import Literal
+from typing import Literal, Optional
 
 from pydantic import BaseModel
 from pydantic_settings import BaseSettings
@@ -13,7 +13,8 @@ class CacheConfig(BaseModel):
     cache_name: str = "mtdb"
     backend: Literal["sqlite"] = "sqlite"
     use_cache_dir: bool = True
-    expire_after: timedelta = timedelta(days=7)
+    expire_after: Optional[timedelta] = timedelta(days=7)
+    datapoints_dir: Optional[str] = None
 
 
 class Config(BaseSettings, env_prefix="INQUIRE_MODELTEST_"):
@@ -27,5 +28,26 @@ class Config(BaseSettings, env_prefix="INQUIRE_MODELTEST_"):
     version: str = "v1"
     log_level: str = "info"
     cache_settings: CacheConfig = CacheConfig()
+    token_refresh_margin: float = 60.0
+    token_file: Optional[str] = None
     requests_max_retries: int = 5
     requests_backoff_factor: float = 1.0
+    requests_pool_connections: int = 10
+    requests_pool_maxsize: int = 10
+    requests_pool_keep_alive: float = 300.0
+    requests_accept_encoding: str = "gzip, deflate"
+    requests_compress: bool = False
+    requests_compress_min_size: int = 16384
+    requests_compress_level: int = 5
+    max_workers: int = 8
+    coalesce_requests: bool = True
+    metrics: bool = False
+    tracing: bool = False
+    datapoints_chunk_size: int = 500_000
+    datapoints_format: Literal["auto", "json", "npy"] = "auto"
+    page_size: int = 100
+    max_url_length: int = 2000
+    prefetch_pages: bool = True
+    identity_map_size: int = 1024
+    identity_map_ttl: Optional[float] = 300.0
+    scaling: Literal["local", "server", "parity"] = "local"
@@ -0,0 +1,177 @@
+"""
+Metrics of requests and caches
+"""
+import bisect
+import re
+import threading
+from typing import Dict, Optional
+
+# upper bounds (s) of the latency histogram buckets, the last bucket is unbounded
+LATENCY_BUCKETS = (.005, .01, .025, .05, .1, .25, .5, 1., 2.5, 5., 10., 30., 60.)
+
+_ID = re.compile(r"[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}|[0-9a-fA-F]{32}")
+
+
+def endpoint_key(method: str, resource: str = None, endpoint: str = None) -> str:
+    """str: Key grouping requests by method and path, with ids replaced e.g. 'GET timeseries/{id}/data'."""
+    path = "/".join([p for p in [resource, endpoint] if p is not None])
+    return f"{method} {_ID.sub('{id}', path)}"
+
+
+class _EndpointMetrics:
+    """Counters of requests to an endpoint."""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.latency_sum = 0.
+        self.latency_min = float("inf")
+        self.latency_max = 0.
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """float: Upper bound of the histogram bucket holding the q'th percentile of latency, capped at the maximum."""
+        if self.count == 0:
+            return None
+        rank, cumulative = q / 100. * self.count, 0
+        for bound, n in zip(LATENCY_BUCKETS + (self.latency_max,), self.histogram):
+            cumulative += n
+            if cumulative >= rank:
+                return min(bound, self.latency_max)
+        return self.latency_max  # pragma: no cover
+
+    def to_dict(self) -> dict:
+        looked_up = self.cache_hits + self.cache_misses
+        return dict(
+            count=self.count,
+            errors=self.errors,
+            retries=self.retries,
+            bytes=self.bytes,
+            cache_hits=self.cache_hits,
+            cache_misses=self.cache_misses,
+            cache_hit_ratio=self.cache_hits / looked_up if looked_up else None,
+            latency=dict(
+                mean=self.latency_sum / self.count if self.count else None,
+                min=self.latency_min if self.count else None,
+                max=self.latency_max if self.count else None,
+                p50=self.percentile(50),
+                p90=self.percentile(90),
+                p99=self.percentile(99),
+                histogram=dict(zip([f"<={b}" for b in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]}"],
+                                   self.histogram)),
+            ),
+        )
+
+
+class Metrics:
+    """
+    Thread-safe metrics of requests, by endpoint, and hit/miss counts of caches.
+
+    Parameters
+    ----------
+    enabled : bool, optional
+        Record metrics, callers check this before measuring so that disabled metrics cost nothing
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._endpoints: Dict[str, _EndpointMetrics] = dict()
+        self._caches: Dict[str, list] = dict()
+        self._lock = threading.Lock()
+
+    def _endpoint(self, key: str) -> _EndpointMetrics:
+        """_EndpointMetrics: Counters of endpoint, created on first use. Call holding the lock."""
+        m = self._endpoints.get(key)
+        if m is None:
+            m = self._endpoints[key] = _EndpointMetrics()
+        return m
+
+    def record_request(self, key: str, latency: float, size: int = 0, retries: int = 0, error: bool = False,
+                       from_cache: bool = None):
+        """
+        Record a request.
+
+        Parameters
+        ----------
+        key : str
+            Endpoint key, see `endpoint_key()`
+        latency : float
+            Time (s) from sending the request until the response is received
+        size : int, optional
+            Size (bytes) of the response body, decompressed
+        retries : int, optional
+            Number of retries before the response was received
+        error : bool, optional
+            The request failed
+        from_cache : bool, optional
+            The response was served from cache, None if not looked up in a cache
+        """
+        with self._lock:
+            m = self._endpoint(key)
+            m.count += 1
+            m.errors += error
+            m.retries += retries
+            m.bytes += size
+            if from_cache is not None:
+                m.cache_hits += from_cache
+                m.cache_misses += not from_cache
+            m.latency_sum += latency
+            m.latency_min = min(m.latency_min, latency)
+            m.latency_max = max(m.latency_max, latency)
+            m.histogram[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+    def record_bytes(self, key: str, size: int):
+        """
+        Record bytes of a response body read after the request was recorded, e.g. of a streamed response.
+
+        Parameters
+        ----------
+        key : str
+            Endpoint key, see `endpoint_key()`
+        size : int
+            Size (bytes) read
+        """
+        with self._lock:
+            m = self._endpoint(key)
+            m.bytes += size
+
+    def record_cache(self, name: str, hit: bool):
+        """
+        Record a cache lookup.
+
+        Parameters
+        ----------
+        name : str
+            Cache name e.g. 'datapoints'
+        hit : bool
+            The item was found in the cache
+        """
+        with self._lock:
+            counts = self._caches.setdefault(name, [0, 0])
+            counts[0 if hit else 1] += 1
+
+    def snapshot(self) -> dict:
+        """
+        Current metrics.
+
+        Returns
+        -------
+        dict
+            Metrics of requests by endpoint key ('requests') and hits, misses and hit ratio by cache ('caches')
+        """
+        with self._lock:
+            return dict(
+                requests={k: m.to_dict() for k, m in sorted(self._endpoints.items())},
+                caches={k: dict(hits=h, misses=n, hit_ratio=h / (h + n) if h + n else None)
+                        for k, (h, n) in sorted(self._caches.items())},
+            )
+
+    def reset(self):
+        """Discard all metrics."""
+        with self._lock:
+            self._endpoints.clear()
+            self._caches.clear()
@@ -1,11 +1,14 @@
 """
 Classes and functions enabling advanced API queries
 """
+from typing import Iterable, List
+from urllib.parse import quote
 try:
     from typing_extensions import Literal  # Python 3.7
 except ImportError:  # pragma: no cover
     from typing import Literal  # Python 3.8/3.9
 query_extension_types = Literal["sort", "filter"]
+IN_SEPARATOR = "|"
 
 
 class FilterAttribute:
@@ -30,6 +33,12 @@ class FilterAttribute:
     def contains(self, item):
         return dict(name=self.name, op='co', val=item)
 
+    def isin(self, items: Iterable):
+        return dict(name=self.name, op='in', val=list(items))
+
+    def in_(self, items: Iterable):
+        return self.isin(items)
+
 
 class SortAttribute:
     def __init__(self, name):
@@ -187,9 +196,14 @@ def create_query_parameters(filter_expressions: list, sorting_expressions: list)
     for query_filter in filter_expressions:
         if not filter_s == '':
             filter_s = filter_s + ','
-        if not isinstance(query_filter['val'], str):
-            query_filter['val'] = str(query_filter['val'])
-        filter_s = filter_s + query_filter['name'] + '[' + query_filter['op'] + ']' + '=' + query_filter['val']
+        if isinstance(query_filter['val'], (list, tuple, set)):
+            # set membership, values are separated by '|' as ',' separates expressions
+            val = IN_SEPARATOR.join(str(v) for v in query_filter['val'])
+        elif not isinstance(query_filter['val'], str):
+            query_filter['val'] = val = str(query_filter['val'])
+        else:
+            val = query_filter['val']
+        filter_s = filter_s + query_filter['name'] + '[' + query_filter['op'] + ']' + '=' + val
 
     sort_str = ''
     for sort_parameter in sorting_expressions:
@@ -205,3 +219,35 @@ def create_query_parameters(filter_expressions: list, sorting_expressions: list)
         parameters["sort_by"] = sort_str
 
     return parameters
+
+
+def chunk_values(values: Iterable, max_length: int, max_count: int = None) -> List[list]:
+    """
+    Split values of a set membership filter into chunks fitting in a URL.
+
+    Parameters
+    ----------
+    values : Iterable
+        Values
+    max_length : int
+        Maximum length of the URL encoded values of a chunk, including separators
+    max_count : int, optional
+        Maximum number of values in a chunk
+
+    Returns
+    -------
+    list
+        Chunks of values, at least one value per chunk
+    """
+    separator = len(quote(IN_SEPARATOR, safe=""))
+    chunks, chunk, length = [], [], 0
+    for value in values:
+        n = len(quote(str(value), safe="")) + (separator if chunk else 0)
+        if chunk and (length + n > max_length or (max_count is not None and len(chunk) >= max_count)):
+            chunks.append(chunk)
+            chunk, length, n = [], 0, n - separator
+        chunk.append(value)
+        length += n
+    if chunk:
+        chunks.append(chunk)
+    return chunks
@@ -4,5 +4,5 @@ from .tag import Tag, Tags
 from .datapoint import DataPoints, DataPointsList
 from .timeseries import Timeseries, TimeseriesList
 from .sensor import Sensor, Sensors
-from .test import Test, FloaterTest, WindCalibration, WaveCalibration, Tests
+from .test import Test, FloaterTest, WindCalibration, WaveCalibration, Tests, AnyTest
 from .campaign import Campaign, Campaigns
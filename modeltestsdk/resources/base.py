@@ -9,6 +9,7 @@ import re
 class Resource(BaseModel):
     client: Optional[Any] = None
     id: Optional[str] = None
+    read_only: bool = False
 
     @staticmethod
     def _api_object_name(resource_name: str):
@@ -23,14 +24,12 @@ class Resource(BaseModel):
     def create(self, read_only: bool = False, admin_key=None):
         if not self.id:
             try:
+                fields = make_serializable(
+                    self.model_dump(exclude={"client", 'id', 'datapoints_created_at', 'type', 'read_only'}))
                 if admin_key is None:
-                    resource = self._api_object().create(
-                        **make_serializable(self.model_dump(exclude={"client", 'id', 'datapoints_created_at', 'type'})),
-                        read_only=read_only)
+                    resource = self._api_object().create(**fields, read_only=read_only)
                 else:
-                    resource = self._api_object().create(
-                        **make_serializable(self.model_dump(exclude={"client", 'id', 'datapoints_created_at', 'type'})),
-                        read_only=read_only, admin_key=admin_key)
+                    resource = self._api_object().create(**fields, read_only=read_only, admin_key=admin_key)
                 self.id = resource.id
             except AttributeError as e:
                 if self.client is None:
@@ -41,7 +40,8 @@ class Resource(BaseModel):
             print(f"Resource {self.__class__.__name__} with id {self.id} already exists")
 
     def update(self, secret_key: str = None):
-        self._api_object().update(item_id=self.id, body=make_serializable(self.model_dump(exclude={"client", 'id'})),
+        self._api_object().update(item_id=self.id,
+                                  body=make_serializable(self.model_dump(exclude={"client", 'id', 'read_only'})),
                                   secret_key=secret_key)
 
     def delete(self, secret_key: str = None):
@@ -13,17 +13,17 @@ class Campaign(Resource):
     scale_factor: float
     water_depth: float
 
-    def sensors(self, limit: int = 100, skip: int = 0) -> Sensors:
+    def sensors(self, limit: int = 100, skip: int = 0, paginate: bool = False) -> Sensors:
         """Fetch sensors."""
-        return self.client.sensor.get_by_campaign_id(self.id, limit=limit, skip=skip)
+        return self.client.sensor.get_by_campaign_id(self.id, limit=limit, skip=skip, paginate=paginate)
 
-    def tests(self, limit: int = 100, skip: int = 0) -> Tests:
+    def tests(self, limit: int = 100, skip: int = 0, paginate: bool = False) -> Tests:
         """Fetch tests."""
-        return self.client.test.get_by_campaign_id(self.id, limit=limit, skip=skip)
+        return self.client.test.get_by_campaign_id(self.id, limit=limit, skip=skip, paginate=paginate)
 
-    def floater_configurations(self, limit: int = 100, skip: int = 0) -> FloaterConfigs:
+    def floater_configurations(self, limit: int = 100, skip: int = 0, paginate: bool = False) -> FloaterConfigs:
         """Fetch floater configurations."""
-        return self.client.floater_config.get_by_campaign_id(self.id, limit=limit, skip=skip)
+        return self.client.floater_config.get_by_campaign_id(self.id, limit=limit, skip=skip, paginate=paginate)
 
 
 class Campaigns(Resources[Campaign]):
@@ -1,19 +1,45 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from typing import List
+from typing import Annotated
+from pydantic import PlainValidator, PlainSerializer
 from qats import TimeSeries as QatsTimeseries
 from .base import Resource, Resources
+from modeltestsdk.tracing import traced
+
+
+def as_float_array(value) -> np.ndarray:
+    """
+    Convert sequence of numbers to one-dimensional float array.
+
+    Float arrays (float64 or float32) are passed through as is, anything else is converted to a float64 array in
+    one go (null/None becomes NaN) instead of validating element by element.
+    """
+    if not (isinstance(value, np.ndarray) and value.dtype in (np.float64, np.float32)):
+        value = np.asarray(value, dtype=np.float64)
+    if value.ndim != 1:
+        raise ValueError(f"Expected one-dimensional array, got {value.ndim} dimensions.")
+    return value
+
+
+FloatArray = Annotated[np.ndarray, PlainValidator(as_float_array),
+                       PlainSerializer(lambda a: a.tolist(), when_used="json")]
 
 
 class DataPoints(Resource):
-    time: List[float]
-    value: List[float]
+    time: FloatArray
+    value: FloatArray
     timeseries_id: str
 
     def __len__(self):
         return len(self.time)
 
+    def __eq__(self, other):
+        if not isinstance(other, DataPoints):
+            return NotImplemented
+        return (self.timeseries_id == other.timeseries_id and self.client == other.client and
+                np.array_equal(self.time, other.time) and np.array_equal(self.value, other.value, equal_nan=True))
+
     @property
     def timeseries(self):
         if self.client:
@@ -21,6 +47,7 @@ class DataPoints(Resource):
         else:
             return None
 
+    @traced("DataPoints.plot", cat="conversion")
     def plot(self, show: bool = True, **kwargs):
         """
         Plot the datapoints.
@@ -47,6 +74,7 @@ class DataPoints(Resource):
         if show:
             plt.show()
 
+    @traced("DataPoints.to_pandas", cat="conversion")
     def to_pandas(self) -> pd.DataFrame:
         """
         Convert the instance into a pandas DataFrame.
@@ -64,11 +92,16 @@ class DataPoints(Resource):
             sensor = self.timeseries.sensor
             test = self.timeseries.test
         except AttributeError:
-            columns = None
-        else:
-            columns = [f'{test.number} - {sensor.name}']
-        return pd.DataFrame(data=self.value, index=self.time, columns=columns)
+            return self._to_pandas()
+        return self._to_pandas(f'{test.number} - {sensor.name}')
+
+    def _to_pandas(self, name: str = None) -> pd.DataFrame:
+        """pandas.DataFrame: Data points in a single column named `name`."""
+        # reshape is a view, the data is not copied
+        return pd.DataFrame(data=self.value.reshape(-1, 1), index=pd.Index(self.time, copy=False),
+                            columns=[name] if name is not None else None, copy=False)
 
+    @traced("DataPoints.to_qats_ts", cat="conversion")
     def to_qats_ts(self) -> QatsTimeseries:
         try:
             sensor = self.timeseries.sensor
@@ -81,8 +114,7 @@ class DataPoints(Resource):
             name = f'{test.number} - {sensor.name}'
             kind = sensor.kind
             unit = sensor.unit
-        return QatsTimeseries(name=name, x=np.array(self.value), t=np.array(self.time),
-                              kind=kind, unit=unit)
+        return QatsTimeseries(name=name, x=self.value, t=self.time, kind=kind, unit=unit)
 
     def create(self, **kwargs):
         print('## Datapoints are created through the Timeseries API / resource')
@@ -90,6 +122,14 @@ class DataPoints(Resource):
 
 class DataPointsList(Resources[DataPoints]):
 
+    def _sensors_and_tests(self) -> dict:
+        """dict: Sensor and test by time series identifier, resolved in batch for all data points."""
+        clients = [dps.client for dps in self if dps.client]
+        if not clients:
+            return dict()
+        return clients[0].timeseries.get_sensors_and_tests([dps.timeseries_id for dps in self if dps.client])
+
+    @traced("DataPointsList.plot", cat="conversion")
     def plot(self, show: bool = True, **kwargs):
         """
         Plot data points.
@@ -101,33 +141,26 @@ class DataPointsList(Resources[DataPoints]):
         kwargs
             See pandas.DataFrame.plot for options
         """
+        relations = self._sensors_and_tests()
 
         # Set the x-axis label to "Time [s]" if not specified in the additional arguments
         if 'xlabel' not in kwargs:
             kwargs['xlabel'] = 'Time [s]'
 
-        # set the y-axis label based on the kind and unit of the first data point if not specified in the additional
-        # arguments and all sensor have the same kind and unit
-        if 'ylabel' not in kwargs:
-            try:
-                first_kind = self[0].timeseries.sensor.kind
-                first_unit = self[0].timeseries.sensor.unit
-                equal = True
-                for element in self[1:]:
-                    if element.timeseries.sensor.kind != first_kind or element.timeseries.sensor.unit != first_unit:
-                        equal = False
-                        break
-
-                if equal:
-                    kwargs['ylabel'] = f'{first_kind.capitalize()} [{first_unit}]'
-            except AttributeError:
-                pass
+        # set the y-axis label based on the kind and unit of the sensors if not specified in the additional arguments
+        # and all sensor have the same kind and unit
+        if 'ylabel' not in kwargs and relations and len(relations) == len(self):
+            kinds_and_units = {(sensor.kind, sensor.unit) for sensor, _ in relations.values()}
+            if len(kinds_and_units) == 1:
+                kind, unit = kinds_and_units.pop()
+                kwargs['ylabel'] = f'{kind.capitalize()} [{unit}]'
 
-        self.to_pandas().plot(**kwargs)
+        self._to_pandas(relations).plot(**kwargs)
         if show:
             plt.show()
 
-    def to_pandas(self):
+    @traced("DataPointsList.to_pandas", cat="conversion")
+    def to_pandas(self) -> pd.DataFrame:
         """
         Convert the data points list into a pandas DataFrame.
 
@@ -135,10 +168,24 @@ class DataPointsList(Resources[DataPoints]):
         -------
         pandas.DataFrame
             The dataframe.
+
+        Notes
+        -----
+        The columns are named by test number and sensor name. The sensors and tests of all data points are fetched in
+        a few batch requests.
         """
-        dfs = [dps.to_pandas() for dps in self]
-        conc = pd.concat(dfs, axis="columns")
-        return conc
+        return self._to_pandas(self._sensors_and_tests())
+
+    def _to_pandas(self, relations: dict) -> pd.DataFrame:
+        """pandas.DataFrame: Data points in columns named by the sensor and test of each time series."""
+        dfs = []
+        for dps in self:
+            if dps.timeseries_id in relations:
+                sensor, test = relations[dps.timeseries_id]
+                dfs.append(dps._to_pandas(f'{test.number} - {sensor.name}'))
+            else:
+                dfs.append(dps._to_pandas())
+        return pd.concat(dfs, axis="columns")
 
     def create(self, **kwargs):
         print('## Datapoints are created through the Timeseries API / resource')
@@ -21,13 +21,13 @@ class Sensor(Resource):
     positive_direction_definition: str
     area: Optional[float] = None
 
-    def tags(self, limit: int = 100, skip: int = 100) -> Tags:
+    def tags(self, limit: int = 100, skip: int = 100, paginate: bool = False) -> Tags:
         """Retrieve tags on sensor."""
-        return self.client.tag.get_by_sensor_id(self.id, limit=limit, skip=skip)
+        return self.client.tag.get_by_sensor_id(self.id, limit=limit, skip=skip, paginate=paginate)
 
-    def timeseries(self, limit: int = 100, skip: int = 100) -> TimeseriesList:
+    def timeseries(self, limit: int = 100, skip: int = 100, paginate: bool = False) -> TimeseriesList:
         """Retrieve time series on sensor."""
-        return self.client.timeseries.get_by_sensor_id(self.id, limit=limit, skip=skip)
+        return self.client.timeseries.get_by_sensor_id(self.id, limit=limit, skip=skip, paginate=paginate)
 
 
 class Sensors(Resources[Sensor]):
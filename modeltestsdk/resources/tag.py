@@ -26,16 +26,7 @@ class Tag(Resource):
     @property
     def test(self) -> Union[FloaterTest, WindCalibration, WaveCalibration, None]:
         if self.client and self.test_id:
-            test = self.client.test.get_by_id(self.test_id)
-            print(test)
-            if test.type == 'Floater Test':
-                return self.client.floater_test.get_by_id(self.test_id)
-            elif test.type == 'Wave Calibration':
-                return self.client.wave_calibration.get_by_id(self.test_id)
-            elif test.type == 'Wind Calibration':
-                return self.client.wind_calibration.get_by_id(self.test_id)
-            else:
-                raise ValueError('Unknown test type')
+            return self.client.test.get_by_id(self.test_id)
         else:
             return None
 
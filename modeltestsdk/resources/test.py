@@ -1,4 +1,5 @@
-from typing import Optional, Union, Literal
+from typing import Optional, Union, Literal, Annotated
+from pydantic import Field
 from datetime import datetime
 from .base import Resource, Resources
 from .tag import Tags
@@ -26,11 +27,12 @@ class Test(Resource):
         """
         self.client.test.delete(self.id, secret_key=secret_key)
 
-    def tags(self, limit: int = 100, skip: int = 100) -> Tags:
+    def tags(self, limit: int = 100, skip: int = 100, paginate: bool = False) -> Tags:
         """Retrieve tags on time serie."""
-        return self.client.tag.get_by_test_id(self.id, limit=limit, skip=skip)
+        return self.client.tag.get_by_test_id(self.id, limit=limit, skip=skip, paginate=paginate)
 
-    def timeseries(self, sensor_id: str = None, limit: int = 100, skip: int = 0) -> Union[TimeseriesList, Timeseries]:
+    def timeseries(self, sensor_id: str = None, limit: int = 100, skip: int = 0,
+                   paginate: bool = False) -> Union[TimeseriesList, Timeseries]:
         """
         Retrieve time series on sensor.
 
@@ -42,6 +44,8 @@ class Test(Resource):
             Maximum number of time series to return, default 100
         skip : int, optional
             Number of time series to skip, default 0
+        paginate : bool, optional
+            Retrieve all time series page by page, ignoring `limit` and `skip`
 
         Returns
         -------
@@ -52,7 +56,8 @@ class Test(Resource):
             if sensor_id is not None:
                 return self.client.timeseries.get_by_sensor_id_and_test_id(sensor_id=sensor_id, test_id=self.id)
             else:
-                return self.client.timeseries.get_by_test_id(test_id=self.id, limit=limit, skip=skip)
+                return self.client.timeseries.get_by_test_id(test_id=self.id, limit=limit, skip=skip,
+                                                             paginate=paginate)
         else:
             return None
 
@@ -97,10 +102,10 @@ class WaveCalibration(Test):
     current_velocity: Optional[float] = None
     current_direction: Optional[float] = None
 
-    def floater_tests(self, limit: int = 100, skip: int = 0):
+    def floater_tests(self, limit: int = 100, skip: int = 0, paginate: bool = False):
         return self.client.floater_test.get(
             filter_by=[self.client.filter.floater_test.wave_calibration_id == self.id],
-            limit=limit, skip=skip)
+            limit=limit, skip=skip, paginate=paginate)
 
 
 class WindCalibration(Test):
@@ -110,10 +115,14 @@ class WindCalibration(Test):
     zref: Optional[float] = None
     wind_direction: Optional[float] = None
 
-    def floater_tests(self, limit: int = 100, skip: int = 0):
+    def floater_tests(self, limit: int = 100, skip: int = 0, paginate: bool = False):
         return self.client.floater_test.get(
             filter_by=[self.client.filter.floater_test.wind_calibration_id == self.id],
-            limit=limit, skip=skip)
+            limit=limit, skip=skip, paginate=paginate)
+
+
+# any test type, discriminated by the 'type' field
+AnyTest = Annotated[Union[FloaterTest, WaveCalibration, WindCalibration], Field(discriminator="type")]
 
 
 class Tests(Resources[Union[Test, FloaterTest, WaveCalibration, WindCalibration]]):
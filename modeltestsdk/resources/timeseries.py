@@ -1,3 +1,4 @@
+import logging
 import numpy as np
 from typing import Optional
 from qats import TimeSeries as QatsTimeseries
@@ -6,6 +7,8 @@ from .base import Resource, Resources
 from .statistics import Statistics
 from .tag import Tags
 from .datapoint import DataPoints, DataPointsList
+from modeltestsdk.concurrency import map_concurrently, BatchError
+from modeltestsdk.tracing import traced
 
 
 class Timeseries(Resource):
@@ -55,7 +58,7 @@ class Timeseries(Resource):
             return None
 
     def get_data(self, start: float = None, end: float = None, scaling_length: float = None,
-                 all_data: bool = False) -> DataPoints:
+                 all_data: bool = False, dtype=np.float64) -> DataPoints:
         """
         Get data points
 
@@ -69,6 +72,8 @@ class Timeseries(Resource):
             Flag to fetch all available data or use default start-end values. Overrides start and end.
         scaling_length : float, optional
             Scale the data to this reference length according to Froude law (m).
+        dtype : numpy.dtype, optional
+            Floating point type of the data point arrays, numpy.float64 (default) or numpy.float32
 
         Returns
         -------
@@ -77,7 +82,7 @@ class Timeseries(Resource):
         """
         self.check_tags_for_warnings()
         dps = self.client.timeseries.get_data_points(self.id, start=start, end=end, scaling_length=scaling_length,
-                                                     all_data=all_data)
+                                                     all_data=all_data, dtype=dtype)
         return dps
 
     def plot(self, start: float = None, end: float = None, all_data: bool = False,
@@ -112,6 +117,7 @@ class Timeseries(Resource):
 
         dps.plot(show=show, **kwargs)
 
+    @traced("Timeseries.get_qats_ts", cat="conversion")
     def get_qats_ts(self, start: float = None, end: float = None, scaling_length: float = None,
                     all_data: bool = False) -> QatsTimeseries:
         """
@@ -135,11 +141,11 @@ class Timeseries(Resource):
         dp = self.get_data(start=start, end=end, scaling_length=scaling_length, all_data=all_data)
         sensor = self.sensor
         test = self.test
-        return QatsTimeseries(name=f'{test.number} - {sensor.name}', x=np.array(dp.value), t=np.array(dp.time),
+        return QatsTimeseries(name=f'{test.number} - {sensor.name}', x=dp.value, t=dp.time,
                               kind=sensor.kind, unit=sensor.unit)
 
-    def tags(self, limit: int = 100, skip: int = 0) -> Tags:
-        return self.client.tag.get_by_timeseries_id(self.id, limit=limit, skip=skip)
+    def tags(self, limit: int = 100, skip: int = 0, paginate: bool = False) -> Tags:
+        return self.client.tag.get_by_timeseries_id(self.id, limit=limit, skip=skip, paginate=paginate)
 
     def check_tags_for_warnings(self) -> int:
         warning_tag_names = ['quality: bad', 'quality: questionable', 'failed']
@@ -158,8 +164,39 @@ class Timeseries(Resource):
 
 
 class TimeseriesList(Resources[Timeseries]):
+    def _map(self, func, max_workers: int = None, raise_errors: bool = True) -> list:
+        """
+        Apply function to each time series concurrently.
+
+        Parameters
+        ----------
+        func : Callable
+            Function taking a time series
+        max_workers : int, optional
+            Maximum number of concurrent fetches, default is `Config.max_workers` of the client
+        raise_errors : bool, optional
+            Raise BatchError if fetching any of the time series failed, otherwise failures are logged and skipped
+
+        Returns
+        -------
+        list
+            Results in the order of the time series
+        """
+        if max_workers is None:
+            client = self.root[0].client if len(self.root) > 0 else None
+            max_workers = client.config.max_workers if client is not None else 1
+
+        results, errors = map_concurrently(func, self.root, max_workers=max_workers)
+        if errors and raise_errors:
+            raise BatchError(errors, results)
+        for i, e in errors.items():
+            logging.error(f"Failed processing time series {self.root[i].id}: {e!r}")
+        return [r for i, r in enumerate(results) if i not in errors]
+
+    @traced("TimeseriesList.get_data", cat="api")
     def get_data(self, start: float = None, end: float = None, all_data: bool = False,
-                 scaling_length: float = None) -> DataPointsList:
+                 scaling_length: float = None, max_workers: int = None, raise_errors: bool = True,
+                 dtype=np.float64) -> DataPointsList:
         """
         Get data points
 
@@ -173,18 +210,32 @@ class TimeseriesList(Resources[Timeseries]):
             Flag to fetch all available data or use default start-end values. Overrides start and end.
         scaling_length : float, optional
             Scale the data to this reference length according to Froude law (m).
+        max_workers : int, optional
+            Maximum number of time series fetched concurrently, default is `Config.max_workers`.
+        raise_errors : bool, optional
+            Raise BatchError if fetching any of the time series failed, after the others are fetched. Otherwise
+            failures are logged and left out.
+        dtype : numpy.dtype, optional
+            Floating point type of the data point arrays, numpy.float64 (default) or numpy.float32
 
         Returns
         -------
         DataPointList
             Data points
+
+        Raises
+        ------
+        BatchError
+            Fetching one or more time series failed, the exception holds the data points fetched successfully.
         """
-        dps = DataPointsList(
-            [ts.get_data(start=start, end=end, all_data=all_data, scaling_length=scaling_length) for ts in self.root])
-        return dps
+        dps = self._map(lambda ts: ts.get_data(start=start, end=end, all_data=all_data, scaling_length=scaling_length,
+                                               dtype=dtype),
+                        max_workers=max_workers, raise_errors=raise_errors)
+        return DataPointsList(dps)
 
+    @traced("TimeseriesList.get_qats_tsdb", cat="conversion")
     def get_qats_tsdb(self, start: float = None, end: float = None, scaling_length: float = None,
-                      all_data: bool = False) -> QatsTsDB:
+                      all_data: bool = False, max_workers: int = None, raise_errors: bool = True) -> QatsTsDB:
         """
         Get Qats timeseries database
 
@@ -198,16 +249,30 @@ class TimeseriesList(Resources[Timeseries]):
             Scale the data to this reference length according to Froude law (m).
         all_data: bool = False
             Flag to fetch all available data or use default start-end values
+        max_workers : int, optional
+            Maximum number of time series fetched concurrently, default is `Config.max_workers`.
+        raise_errors : bool, optional
+            Raise BatchError if fetching any of the time series failed, after the others are fetched. Otherwise
+            failures are logged and left out.
+
         Returns
         -------
         QatsTsDB
             Qats TsDB object
+
+        Raises
+        ------
+        BatchError
+            Fetching one or more time series failed, the exception holds the time series fetched successfully.
         """
         db = QatsTsDB()
-        for i in self.root:
-            db.add(i.get_qats_ts(start=start, end=end, scaling_length=scaling_length, all_data=all_data))
+        for ts in self._map(lambda i: i.get_qats_ts(start=start, end=end, scaling_length=scaling_length,
+                                                    all_data=all_data),
+                            max_workers=max_workers, raise_errors=raise_errors):
+            db.add(ts)
         return db
 
+    @traced("TimeseriesList.plot", cat="conversion")
     def plot(self, start: float = None, end: float = None, scaling_length: float = None,
              all_data: bool = False, show: bool = True, **kwargs):
         """
@@ -234,21 +299,5 @@ class TimeseriesList(Resources[Timeseries]):
         if 'xlabel' not in kwargs:
             kwargs['xlabel'] = 'Time [s]'
 
-        # set the y-axis label based on the kind and unit of the first data point if not specified in the additional
-        # arguments and all sensor have the same kind and unit
-        if 'ylabel' not in kwargs:
-            try:
-                first_kind = dps[0].timeseries.sensor.kind
-                first_unit = dps[0].timeseries.sensor.unit
-                equal = True
-                for element in dps[1:]:
-                    if element.timeseries.sensor.kind != first_kind or element.timeseries.sensor.unit != first_unit:
-                        equal = False
-                        break
-
-                if equal:
-                    kwargs['ylabel'] = f'{first_kind.capitalize()} [{first_unit}]'
-            except AttributeError:
-                pass
-
+        # the y-axis label is set from the sensors of all data points in one go, see DataPointsList.plot
         dps.plot(show=show, **kwargs)
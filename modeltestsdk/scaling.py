@@ -0,0 +1,108 @@
+"""
+Scaling of model test data according to Froude law
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .resources import Statistics
+
+# exponent of the length scale ratio for each kind of sensor, e.g. forces scale with the length scale cubed
+FROUDE_EXPONENTS = {
+    "length": 1.,
+    "velocity": .5,
+    "acceleration": 0.,
+    "force": 3.,
+    "pressure": 1.,
+    "volume": 3.,
+    "mass": 3.,
+    "moment": 4.,
+    "angle": 0.,
+    "angular velocity": -.5,
+    "angular acceleration": -1.,
+    "slamming force": 3.,
+    "slamming pressure": 1.,
+}
+TIME_EXPONENT = .5
+
+
+def froude_factors(kind: str, scale: float) -> Optional[Tuple[float, float]]:
+    """
+    Froude scaling factors for time and values.
+
+    Parameters
+    ----------
+    kind : str
+        Sensor kind e.g. 'force'
+    scale : float
+        Length scale ratio, the scaling length divided by the characteristic length of the model
+
+    Returns
+    -------
+    tuple
+        Factors for time and values, None if the sensor kind has no known Froude scaling
+    """
+    exponent = FROUDE_EXPONENTS.get(kind.lower())
+    if exponent is None:
+        return None
+    return scale ** TIME_EXPONENT, scale ** exponent
+
+
+def froude_scale(time: np.ndarray, value: np.ndarray, kind: str, scale: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Scale data points according to Froude law.
+
+    Parameters
+    ----------
+    time : numpy.ndarray
+        Time (s)
+    value : numpy.ndarray
+        Values
+    kind : str
+        Sensor kind e.g. 'force'
+    scale : float
+        Length scale ratio, the scaling length divided by the characteristic length of the model
+
+    Returns
+    -------
+    tuple
+        Scaled time and values
+    """
+    factors = froude_factors(kind, scale)
+    if factors is None:
+        raise ValueError(f"No Froude scaling defined for sensor kind '{kind}'.")
+    time_factor, value_factor = factors
+    return time * time.dtype.type(time_factor), value * value.dtype.type(value_factor)
+
+
+def froude_scale_statistics(statistics: Statistics, kind: str, scale: float) -> Statistics:
+    """
+    Scale time series statistics according to Froude law.
+
+    Parameters
+    ----------
+    statistics : Statistics
+        Statistics of unscaled time series
+    kind : str
+        Sensor kind e.g. 'force'
+    scale : float
+        Length scale ratio, the scaling length divided by the characteristic length of the model
+
+    Returns
+    -------
+    Statistics
+        Scaled statistics
+
+    Notes
+    -----
+    The spectral moments scale as mn ~ value^2 * time^-n since the spectral density scales with value^2 * time and
+    the frequency with 1/time.
+    """
+    factors = froude_factors(kind, scale)
+    if factors is None:
+        raise ValueError(f"No Froude scaling defined for sensor kind '{kind}'.")
+    tf, vf = factors
+    return Statistics(min=statistics.min * vf, max=statistics.max * vf, std=statistics.std * vf,
+                      mean=statistics.mean * vf, m0=statistics.m0 * vf ** 2, m1=statistics.m1 * vf ** 2 / tf,
+                      m2=statistics.m2 * vf ** 2 / tf ** 2, m4=statistics.m4 * vf ** 2 / tf ** 4,
+                      tp=statistics.tp * tf)
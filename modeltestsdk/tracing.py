@@ -0,0 +1,148 @@
+"""
+Tracing of SDK operations in the Chrome trace event format
+"""
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, ContextManager, Optional
+
+
+class Tracer:
+    """
+    Recorder of nested spans of work, e.g. API method, HTTP request, decoding and building resources.
+
+    Spans are recorded as complete events of the Chrome trace event format, nested by time within each thread. Load
+    the exported trace in Perfetto (https://ui.perfetto.dev) or chrome://tracing to see where the time goes.
+
+    Parameters
+    ----------
+    enabled : bool, optional
+        Record spans, disabled tracing costs a check of this flag per span
+    max_events : int, optional
+        Stop recording when this many spans are recorded, bounding the memory used
+    """
+
+    def __init__(self, enabled: bool = False, max_events: int = 1_000_000):
+        self.enabled = enabled
+        self.max_events = max_events
+        self._events = []
+        self._threads = dict()
+        self._origin = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def span(self, name: str, cat: str = "sdk", **args) -> ContextManager[dict]:
+        """
+        Record span of work.
+
+        Parameters
+        ----------
+        name : str
+            Span name e.g. 'SensorAPI.get'
+        cat : str, optional
+            Category e.g. 'api', 'http', 'decode', 'model' or 'conversion'
+        args
+            Arguments shown with the span
+
+        Returns
+        -------
+        ContextManager
+            Context yielding the arguments, add to them to show results e.g. the response status
+        """
+        if not self.enabled:
+            return nullcontext(args)
+        return self._span(name, cat, args)
+
+    @contextmanager
+    def _span(self, name: str, cat: str, args: dict):
+        start = time.perf_counter_ns()
+        try:
+            yield args
+        except BaseException as e:
+            args["error"] = repr(e)
+            raise
+        finally:
+            end = time.perf_counter_ns()
+            thread = threading.current_thread()
+            event = dict(name=name, cat=cat, ph="X", ts=(start - self._origin) / 1000., dur=(end - start) / 1000.,
+                         pid=os.getpid(), tid=thread.ident, args=args)
+            with self._lock:
+                if len(self._events) < self.max_events:
+                    self._events.append(event)
+                    self._threads[thread.ident] = thread.name
+
+    def clear(self):
+        """Discard recorded spans."""
+        with self._lock:
+            self._events.clear()
+            self._threads.clear()
+
+    def to_chrome_trace(self) -> dict:
+        """
+        Recorded spans in the Chrome trace event format.
+
+        Returns
+        -------
+        dict
+            Trace, with time in microseconds since the tracer was created
+        """
+        with self._lock:
+            names = [dict(name="thread_name", ph="M", pid=os.getpid(), tid=tid, args=dict(name=name))
+                     for tid, name in self._threads.items()]
+            return dict(traceEvents=names + list(self._events), displayTimeUnit="ms")
+
+    def export(self, path: str):
+        """
+        Write recorded spans to a JSON file in the Chrome trace event format.
+
+        Parameters
+        ----------
+        path : str
+            Trace file
+        """
+        with open(path, "w") as f:
+            json.dump(self.to_chrome_trace(), f, default=str)
+
+
+def _tracer_of(obj) -> Optional[Tracer]:
+    """Tracer: Tracer of the client, or of the client bound to an API, a resource or a list of resources."""
+    if isinstance(getattr(obj, "tracer", None), Tracer):
+        return obj.tracer
+    client = getattr(obj, "client", None)
+    if client is None:
+        root = getattr(obj, "root", None)
+        client = getattr(root[0], "client", None) if isinstance(root, list) and root else None
+    return getattr(client, "tracer", None)
+
+
+def traced(name: str, cat: str = "sdk") -> Callable:
+    """
+    Decorate method to record a span of each call with the tracer of the object's client.
+
+    Parameters
+    ----------
+    name : str
+        Span name e.g. 'TimeseriesList.get_qats_tsdb'
+    cat : str, optional
+        Category e.g. 'api' or 'conversion'
+
+    Returns
+    -------
+    Callable
+        Decorator
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def method(self, *args, **kwargs):
+            tracer = _tracer_of(self)
+            if tracer is None or not tracer.enabled:
+                return func(self, *args, **kwargs)
+            with tracer.span(name, cat=cat):
+                return func(self, *args, **kwargs)
+        return method
+    return decorator
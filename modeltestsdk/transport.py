@@ -0,0 +1,241 @@
+"""
+Transports carrying out the requests of the client
+"""
+import asyncio
+import io
+from abc import ABC, abstractmethod
+import sys
+import threading
+from http import HTTPStatus
+from typing import Callable, List, Tuple
+from urllib.parse import unquote, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3 import HTTPResponse
+
+
+class Transport(ABC):
+    """
+    Base of transports, creating the adapter mounted on the client's sessions for both http and https.
+
+    Every request of the client, including authentication and cached requests, is sent through the adapter. Pass a
+    transport to the client to choose how requests are carried out, e.g. over the network or in-process.
+    """
+
+    @abstractmethod
+    def adapter(self, client) -> BaseAdapter:
+        """
+        Create adapter sending requests.
+
+        Parameters
+        ----------
+        client : Client
+            Client owning the session, providing the configuration
+
+        Returns
+        -------
+        requests.adapters.BaseAdapter
+            Adapter
+        """
+
+
+class RequestsTransport(Transport):
+    """Requests over the network with pooled connections and retries (`Config.requests_*`), the default."""
+
+    def adapter(self, client) -> BaseAdapter:
+        return HTTPAdapter(pool_connections=client.config.requests_pool_connections,
+                           pool_maxsize=client.config.requests_pool_maxsize,
+                           max_retries=client.retries)
+
+
+class _InProcessAdapter(HTTPAdapter, ABC):
+    """Adapter passing requests to an application in the same process, without sockets."""
+
+    def __init__(self):
+        super().__init__(max_retries=0)
+
+    @abstractmethod
+    def call(self, request: requests.PreparedRequest) -> Tuple[int, List[Tuple[str, str]], bytes]:
+        """tuple: Status code, headers and body of the application's response to the request."""
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, timeout=None, verify=True, cert=None,
+             proxies=None) -> requests.Response:
+        status, headers, body = self.call(request)
+        try:
+            reason = HTTPStatus(status).phrase
+        except ValueError:  # pragma: no cover
+            reason = ""
+        # decoded (e.g. gzip) and streamed just like a response from the network
+        raw = HTTPResponse(body=io.BytesIO(body), headers=headers, status=status, reason=reason,
+                           preload_content=False, decode_content=True, request_method=request.method,
+                           request_url=request.url)
+        response = self.build_response(request, raw)
+        if not stream:
+            response.content
+        return response
+
+
+def _target(request: requests.PreparedRequest) -> dict:
+    """dict: Parts of the request URL."""
+    url = urlsplit(request.url)
+    return dict(scheme=url.scheme, host=url.hostname or "localhost",
+                port=url.port or (443 if url.scheme == "https" else 80), path=unquote(url.path),
+                raw_path=url.path, query=url.query)
+
+
+def _body(request: requests.PreparedRequest) -> bytes:
+    """bytes: Request body."""
+    body = request.body or b""
+    return body.encode() if isinstance(body, str) else body
+
+
+class _WSGIAdapter(_InProcessAdapter):
+    def __init__(self, app: Callable):
+        super().__init__()
+        self.app = app
+
+    def call(self, request: requests.PreparedRequest) -> Tuple[int, List[Tuple[str, str]], bytes]:
+        target, body = _target(request), _body(request)
+        environ = {
+            "REQUEST_METHOD": request.method,
+            "SCRIPT_NAME": "",
+            "PATH_INFO": target["path"],
+            "QUERY_STRING": target["query"],
+            "SERVER_NAME": target["host"],
+            "SERVER_PORT": str(target["port"]),
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": target["scheme"],
+            "wsgi.input": io.BytesIO(body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        for name, value in request.headers.items():
+            key = name.upper().replace("-", "_")
+            if key == "CONTENT_TYPE":
+                environ[key] = value
+            elif key != "CONTENT_LENGTH":
+                environ[f"HTTP_{key}"] = value
+
+        response = dict()
+
+        def start_response(status, headers, exc_info=None):
+            response.update(status=int(status.split(" ", 1)[0]), headers=list(headers))
+
+        result = self.app(environ, start_response)
+        try:
+            content = b"".join(result)
+        finally:
+            if hasattr(result, "close"):
+                result.close()
+        return response["status"], response["headers"], content
+
+
+class WSGITransport(Transport):
+    """
+    Requests passed directly to a WSGI application in the same process, without sockets or network overhead.
+
+    Parameters
+    ----------
+    app : Callable
+        WSGI application e.g. a local instance of the API
+    """
+
+    def __init__(self, app: Callable):
+        self.app = app
+
+    def adapter(self, client) -> BaseAdapter:
+        return _WSGIAdapter(self.app)
+
+
+class _ASGIAdapter(_InProcessAdapter):
+    def __init__(self, app: Callable):
+        super().__init__()
+        self.app = app
+        self._loop = None
+        self._lock = threading.Lock()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Event loop running the application in a background thread, started on first use."""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._run, args=(self._loop,), daemon=True, name="asgi-transport").start()
+            return self._loop
+
+    @staticmethod
+    def _run(loop: asyncio.AbstractEventLoop):
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    def call(self, request: requests.PreparedRequest) -> Tuple[int, List[Tuple[str, str]], bytes]:
+        return asyncio.run_coroutine_threadsafe(self._call(request), self._get_loop()).result()
+
+    async def _call(self, request: requests.PreparedRequest) -> Tuple[int, List[Tuple[str, str]], bytes]:
+        target, body = _target(request), _body(request)
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": request.method,
+            "scheme": target["scheme"],
+            "path": target["path"],
+            "raw_path": target["raw_path"].encode(),
+            "query_string": target["query"].encode(),
+            "root_path": "",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in request.headers.items()],
+            "server": (target["host"], target["port"]),
+            "client": ("127.0.0.1", 0),
+        }
+        received = False
+        response = dict(status=500, headers=[], body=[])
+
+        async def receive():
+            nonlocal received
+            if not received:
+                received = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = [(k.decode(), v.decode()) for k, v in message.get("headers", [])]
+            elif message["type"] == "http.response.body":
+                response["body"].append(message.get("body", b""))
+
+        await self.app(scope, receive, send)
+        return response["status"], response["headers"], b"".join(response["body"])
+
+    def close(self):
+        super().close()
+        with self._lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._loop = None
+
+
+class ASGITransport(Transport):
+    """
+    Requests passed directly to an ASGI application in the same process, without sockets or network overhead.
+
+    The application runs in an event loop in a background thread, shared by all requests of the client's sessions.
+    Lifespan events are not sent, start up the application beforehand if it depends on them.
+
+    Parameters
+    ----------
+    app : Callable
+        ASGI application e.g. a local instance of the API
+    """
+
+    def __init__(self, app: Callable):
+        self.app = app
+
+    def adapter(self, client) -> BaseAdapter:
+        return _ASGIAdapter(self.app)
@@ -1,12 +1,20 @@
 """
 Utility functions
 """
+import io
+import json
 import numpy as np
 from collections import OrderedDict, defaultdict
 from datetime import datetime, timedelta
+from typing import Iterable, Sequence, Tuple
 import uuid
 import re
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 # compile regex for camel case to snake case
 first_cap_re = re.compile('(.)([A-Z][a-z]+)')
 all_cap_re = re.compile('([a-z0-9])([A-Z])')
@@ -46,7 +54,7 @@ def make_serializable(d):
         elif isinstance(v, np.ndarray):
             if v.ndim > 1:
                 raise NotImplementedError(f"Unable to JSON serialize multidimensional ndarrays. Key = '{key}'.")
-            v = list(v)
+            v = v.tolist()
         elif isinstance(v, datetime):
             v = v.isoformat()
         elif isinstance(v, timedelta):
@@ -66,6 +74,213 @@ def make_serializable(d):
     return d
 
 
+def _orjson_default(v):
+    """Convert objects orjson does not serialize natively."""
+    if isinstance(v, np.ndarray):
+        # e.g. non-contiguous or object arrays
+        return np.ascontiguousarray(v) if v.dtype.kind in "iufb" and not v.flags.c_contiguous else v.tolist()
+    if isinstance(v, np.generic):
+        return v.item()
+    if isinstance(v, timedelta):
+        return v.total_seconds()
+    raise TypeError(f"Object of type '{type(v)}' is not JSON serializable")
+
+
+_PLACEHOLDER = "\x00array{}\x00"
+
+
+def _array_to_json(a: np.ndarray) -> str:
+    """str: JSON array, NaN and infinite values become null."""
+    if a.dtype.kind not in "iufb" or a.ndim != 1:
+        return json.dumps(_prepare_json(a.tolist(), []), allow_nan=False, separators=(",", ":"))
+    values = a.tolist()
+    if a.dtype.kind == "f":
+        # replace the few non-finite values in the list, rather than scanning the whole document
+        for i in np.flatnonzero(~np.isfinite(a)).tolist():
+            values[i] = None
+    return json.dumps(values, allow_nan=False, separators=(",", ":"))
+
+
+def _prepare_json(v, arrays: list):
+    """Convert to objects supported by the json module, arrays are replaced by placeholders collected in `arrays`."""
+    if isinstance(v, dict):
+        return {k: _prepare_json(_, arrays) for k, _ in v.items()}
+    if isinstance(v, (list, tuple)):
+        return [_prepare_json(_, arrays) for _ in v]
+    if isinstance(v, np.ndarray):
+        arrays.append(v)
+        return _PLACEHOLDER.format(len(arrays) - 1)
+    if isinstance(v, np.generic):
+        v = v.item()
+    if isinstance(v, float) and not np.isfinite(v):
+        return None
+    if isinstance(v, uuid.UUID):
+        return str(v)
+    if isinstance(v, datetime):
+        return v.isoformat()
+    if isinstance(v, timedelta):
+        return v.total_seconds()
+    return v
+
+
+def to_json(d) -> bytes:
+    """
+    Serialize data to JSON, fast for large NumPy arrays.
+
+    Parameters
+    ----------
+    d : dict or list
+        Data, may contain NumPy arrays and scalars, datetime, timedelta and UUID objects at any level
+    Returns
+    -------
+    bytes
+        UTF-8 encoded JSON
+    Notes
+    -----
+    NaN and infinite values become null. Arrays are serialized directly by orjson if installed, otherwise each
+    array is serialized in one go and inserted into the JSON document.
+    """
+    if orjson is not None:
+        return orjson.dumps(d, default=_orjson_default, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    arrays = []
+    text = json.dumps(_prepare_json(d, arrays), allow_nan=False, separators=(",", ":"))
+    if arrays:
+        parts = re.split(r'"\\u0000array(\d+)\\u0000"', text)
+        parts[1::2] = [_array_to_json(arrays[int(i)]) for i in parts[1::2]]
+        text = "".join(parts)
+    return text.encode()
+
+
+NPY_MEDIA_TYPE = "application/x-npy"
+
+
+def to_npy(*rows) -> bytes:
+    """
+    Serialize equally long sequences of numbers as rows of a float64 array in NumPy's binary format (.npy).
+
+    Parameters
+    ----------
+    rows : numpy.ndarray or list
+        Rows e.g. time and values
+
+    Returns
+    -------
+    bytes
+        Array in .npy format
+    """
+    buffer = io.BytesIO()
+    np.save(buffer, np.vstack([np.asarray(r, dtype=np.float64) for r in rows]), allow_pickle=False)
+    return buffer.getvalue()
+
+
+def from_npy(content: bytes) -> np.ndarray:
+    """
+    Deserialize array in NumPy's binary format (.npy).
+
+    Parameters
+    ----------
+    content : bytes
+        Array in .npy format
+
+    Returns
+    -------
+    numpy.ndarray
+        Array
+    """
+    return np.load(io.BytesIO(content), allow_pickle=False)
+
+
+class _GrowingArray:
+    """One-dimensional array growing by doubling its capacity, like a list but holding unboxed numbers."""
+
+    def __init__(self, dtype=np.float64, capacity: int = 65536):
+        self.data = np.empty(capacity, dtype=dtype)
+        self.size = 0
+
+    def extend(self, values: np.ndarray):
+        size = self.size + len(values)
+        if size > len(self.data):
+            self.data.resize(max(size, 2 * len(self.data)), refcheck=False)
+        self.data[self.size:size] = values
+        self.size = size
+
+    def to_array(self) -> np.ndarray:
+        self.data.resize(self.size, refcheck=False)
+        return self.data
+
+
+def _parse_numbers(text: bytes) -> np.ndarray:
+    """numpy.ndarray: Comma separated numbers, null is parsed as NaN."""
+    if not text.strip():
+        return np.empty(0)
+    values = np.fromstring(text.replace(b"null", b"nan"), sep=",")
+    if len(values) != text.count(b",") + 1:
+        raise ValueError(f"Invalid numbers in JSON array near '{text[:50].decode(errors='replace')}'.")
+    return values
+
+
+def parse_json_arrays(chunks: Iterable[bytes], keys: Sequence[str], dtype=np.float64) -> Tuple[np.ndarray, ...]:
+    """
+    Parse arrays of numbers from a JSON document read in chunks, without building Python lists.
+
+    Parameters
+    ----------
+    chunks : Iterable[bytes]
+        Consecutive chunks of the document e.g. `requests.Response.iter_content()`
+    keys : Sequence[str]
+        Keys of the arrays e.g. ('time', 'value'), at any level of the document
+    dtype : numpy.dtype, optional
+        Data type of the arrays
+
+    Returns
+    -------
+    tuple
+        Arrays in the order of the keys
+
+    Notes
+    -----
+    Only the arrays are parsed, the rest of the document is skipped. Numbers are appended to buffers growing by
+    doubling, so the peak memory is about twice the size of the arrays plus a chunk, rather than the size of the
+    document and the Python objects decoded from it.
+    """
+    pattern = re.compile(rb'"(' + b"|".join(re.escape(k.encode()) for k in keys) + rb')"\s*:\s*\[')
+    arrays = dict()
+    current = None  # array being parsed
+    buffer = b""
+    for chunk in chunks:
+        buffer += chunk
+        while True:
+            if current is None:
+                match = pattern.search(buffer)
+                if match is None:
+                    buffer = buffer[-256:]  # a key may be split between chunks
+                    break
+                current = arrays[match.group(1).decode()] = _GrowingArray(dtype)
+                buffer = buffer[match.end():]
+
+            end = buffer.find(b"]")
+            if end >= 0:
+                current.extend(_parse_numbers(buffer[:end]))
+                buffer = buffer[end + 1:]
+                current = None
+                continue
+
+            # parse the complete numbers, a number may be split between chunks
+            cut = buffer.rfind(b",")
+            if cut >= 0:
+                current.extend(_parse_numbers(buffer[:cut]))
+                buffer = buffer[cut + 1:]
+            break
+
+    missing = [k for k in keys if k not in arrays]
+    if missing:
+        raise ValueError(f"Arrays {missing} not found in JSON document.")
+    if current is not None:
+        raise ValueError("Incomplete JSON document, array not terminated.")
+    return tuple(arrays[k].to_array() for k in keys)
+
+
 def to_snake_case(d):
     """
     Convert data with camelCase keys to snake_case
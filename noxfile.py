@@ -68,3 +68,10 @@ def tests_github(session):
     # run tests
     session.run("pytest", "tests", "--api=build",
                 "--cov=modeltestsdk", "--cov-report=term-missing", "--cov-fail-under=95")
+
+
+@nox.session
+def benchmarks(session):
+    """Run benchmarks against a local stand-in for the API, writing the results to benchmarks.json."""
+    session.install(".")
+    session.run("python", "-m", "benchmarks.run", "--output", "benchmarks.json", *session.posargs)
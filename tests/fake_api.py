@@ -0,0 +1,361 @@
+"""
+Local stand-in for the modeltest REST API
+
+A small WSGI application implementing the endpoints used by the SDK on top of an in-memory database, suitable for
+testing without the real service. Serve it with `serve()` or call it directly as a WSGI app.
+"""
+import gzip
+import io
+import json
+import threading
+from time import sleep
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs
+from wsgiref.simple_server import WSGIServer, WSGIRequestHandler, make_server
+
+import numpy as np
+
+TEST_TYPES = {
+    "floatertest": "Floater Test",
+    "wavecalibration": "Wave Calibration",
+    "windcalibration": "Wind Calibration",
+}
+NPY = "application/x-npy"
+# resource paths as used by the SDK
+RESOURCES = ("campaign", "sensor", "test", "floatertest", "wavecalibration", "windcalibration", "timeseries",
+             "tags", "floaterconfig")
+
+
+class FakeDatabase:
+    """In-memory model test database."""
+
+    def __init__(self):
+        self.items = {name: dict() for name in RESOURCES if name != "test"}
+        self.datapoints = dict()
+        self.lock = threading.Lock()
+
+    def table(self, resource: str) -> dict:
+        """dict: Items of a resource, the 'test' resource is the union of all test types."""
+        if resource == "test":
+            return {**self.items["floatertest"], **self.items["wavecalibration"], **self.items["windcalibration"]}
+        return self.items[resource]
+
+    def add(self, resource: str, item: dict) -> dict:
+        item = dict(item, id=item.get("id") or str(uuid.uuid4()))
+        item.setdefault("read_only", False)
+        if resource in TEST_TYPES:
+            item["type"] = TEST_TYPES[resource]
+        if resource == "timeseries":
+            item.setdefault("datapoints_created_at", None)
+        with self.lock:
+            self.items[resource][item["id"]] = item
+        return item
+
+    def set_datapoints(self, ts_id: str, time, value):
+        with self.lock:
+            self.datapoints[ts_id] = (np.asarray(time, dtype=float), np.asarray(value, dtype=float))
+            self.items["timeseries"][ts_id]["datapoints_created_at"] = datetime.now(timezone.utc).isoformat()
+
+    def populate(self, n_campaigns: int = 1, n_sensors: int = 10, n_tests: int = 5, n_samples: int = 1000,
+                 fs: float = 10.0) -> "FakeDatabase":
+        """
+        Fill the database with synthetic data.
+
+        Parameters
+        ----------
+        n_campaigns : int, optional
+            Number of campaigns
+        n_sensors : int, optional
+            Number of sensors per campaign
+        n_tests : int, optional
+            Number of floater tests per campaign, a wave and a wind calibration is added in addition
+        n_samples : int, optional
+            Number of data points per time series
+        fs : float, optional
+            Sampling frequency (Hz)
+
+        Returns
+        -------
+        FakeDatabase
+            The database itself
+        """
+        rng = np.random.default_rng(1)
+        kinds = ("length", "velocity", "acceleration", "force", "pressure", "angle", "moment")
+        for i in range(n_campaigns):
+            campaign = self.add("campaign", dict(name=f"campaign {i}", description="synthetic", location="Oslo",
+                                                 date="2020-01-01T00:00:00", scale_factor=50., water_depth=4.))
+            config = self.add("floaterconfig", dict(name="config", description="synthetic", draft=0.5,
+                                                     campaign_id=campaign["id"], characteristic_length=2.))
+            sensors = [self.add("sensor", dict(
+                campaign_id=campaign["id"], name=f"sensor {j}", description="synthetic", unit="-",
+                kind=kinds[j % len(kinds)], source="direct measurement", x=0., y=0., z=0.,
+                position_reference="local", position_heading_lock=False, position_draft_lock=False,
+                positive_direction_definition="up", area=None)) for j in range(n_sensors)]
+            common = dict(description="synthetic", test_date="2020-01-01T00:00:00", campaign_id=campaign["id"])
+            wave = self.add("wavecalibration", dict(
+                number="W1", wave_spectrum="jonswap", wave_height=0.1, wave_period=1.5, gamma=3.3,
+                wave_direction=0., current_velocity=0., current_direction=0., **common))
+            wind = self.add("windcalibration", dict(
+                number="V1", wind_spectrum="NPD", wind_velocity=1., zref=0.2, wind_direction=0., **common))
+            tests = [wave, wind] + [self.add("floatertest", dict(
+                number=f"{1000 + j}", category="irregular wave", orientation=0., floaterconfig_id=config["id"],
+                wave_id=wave["id"], wind_id=wind["id"], **common)) for j in range(n_tests)]
+            for test in tests:
+                for sensor in sensors:
+                    ts = self.add("timeseries", dict(sensor_id=sensor["id"], test_id=test["id"], fs=fs,
+                                                     intermittent=False, default_start_time=0.1 * n_samples / fs,
+                                                     default_end_time=0.9 * n_samples / fs))
+                    self.set_datapoints(ts["id"], np.arange(n_samples) / fs, rng.standard_normal(n_samples))
+        return self
+
+
+def parse_filter(filter_by: str) -> list:
+    """list: Filter expressions like 'name[eq]=value' as (name, operator, value) tuples."""
+    expressions = []
+    for expression in filter_by.split(","):
+        name, _, rest = expression.partition("[")
+        op, _, val = rest.partition("]=")
+        expressions.append((name, op, val))
+    return expressions
+
+
+def match(item: dict, name: str, op: str, val: str) -> bool:
+    """bool: Does the item satisfy the filter expression."""
+    attr = item.get(name)
+    if op == "co":
+        return attr is not None and val in str(attr)
+    if op == "in":
+        return str(attr) in val.split("|")
+    if isinstance(attr, bool):
+        val = val.lower() == "true"
+    elif isinstance(attr, (int, float)):
+        val = float(val)
+    elif attr is None:
+        return op == "eq" and val == "None"
+    else:
+        attr = str(attr)
+    return dict(eq=attr == val, lt=attr < val, lte=attr <= val, gt=attr > val, gte=attr >= val)[op]
+
+
+def froude_scale(kind: str, time: np.ndarray, value: np.ndarray, scale: float):
+    """Scale model scale data to full scale by the Froude law of similitude."""
+    exponents = {"length": 1., "velocity": .5, "acceleration": 0., "force": 3., "pressure": 1., "volume": 3.,
+                 "mass": 3., "moment": 4., "angle": 0., "angular velocity": -.5, "angular acceleration": -1.,
+                 "slamming force": 3., "slamming pressure": 1.}
+    return time * scale ** .5, value * scale ** exponents.get(kind, 0.)
+
+
+class FakeAPI:
+    """
+    WSGI application imitating the modeltest API.
+
+    Parameters
+    ----------
+    db : FakeDatabase, optional
+        Database served by the application, an empty database by default
+    token_lifetime : float, optional
+        Lifetime of access tokens (s)
+    binary : bool, optional
+        Support data points in binary format (.npy), negotiated by the 'Accept' and 'Content-Type' headers
+    latency : float, optional
+        Delay (s) before answering each request, imitating a remote service
+    """
+
+    def __init__(self, db: FakeDatabase = None, token_lifetime: float = 3600., binary: bool = True,
+                 latency: float = 0.):
+        self.db = db if db is not None else FakeDatabase()
+        self.token_lifetime = token_lifetime
+        self.binary = binary
+        self.latency = latency
+        self.requests = []
+        self.headers = []
+        self.tokens = dict()  # expiry of issued access tokens
+        self.unsupported_filters = set()  # filter operators rejected, imitating an older API
+        self.content_length = True  # otherwise responses are sent in pieces, without their length
+
+    def __call__(self, environ, start_response):
+        method = environ["REQUEST_METHOD"]
+        path = environ.get("PATH_INFO", "").strip("/").split("/")[2:]  # strip 'api/v1'
+        query = {k: v[0] for k, v in parse_qs(environ.get("QUERY_STRING", "")).items()}
+        length = int(environ.get("CONTENT_LENGTH") or 0)
+        body = environ["wsgi.input"].read(length) if length else b""
+        if environ.get("HTTP_CONTENT_ENCODING") == "gzip":
+            body = gzip.decompress(body)
+        self.requests.append((method, "/".join(path), query))
+        self.headers.append({k[5:].replace("_", "-").title(): v for k, v in environ.items() if k.startswith("HTTP_")})
+        if self.latency:
+            sleep(self.latency)
+
+        try:
+            status, payload = self.handle(method, path, query, body, environ)
+        except KeyError:
+            status, payload = "404 Not Found", dict(detail="Not found")
+
+        if isinstance(payload, bytes):
+            data, content_type = payload, NPY
+        else:
+            data, content_type = json.dumps(payload).encode(), "application/json"
+        headers = [("Content-Type", content_type)]
+        if len(data) > 1024 and "gzip" in environ.get("HTTP_ACCEPT_ENCODING", ""):
+            data = gzip.compress(data, compresslevel=1)
+            headers.append(("Content-Encoding", "gzip"))
+        if not self.content_length:
+            start_response(status, headers)
+            return [data[i:i + 4096] for i in range(0, len(data), 4096)]
+        start_response(status, headers + [("Content-Length", str(len(data)))])
+        return [data]
+
+    async def asgi(self, scope, receive, send):
+        """ASGI entrypoint of the application, answering by the WSGI application."""
+        body, more = b"", True
+        while more:
+            message = await receive()
+            body += message.get("body", b"")
+            more = message.get("more_body", False)
+        environ = {
+            "REQUEST_METHOD": scope["method"],
+            "PATH_INFO": scope["path"],
+            "QUERY_STRING": scope["query_string"].decode(),
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.input": io.BytesIO(body),
+        }
+        for name, value in scope["headers"]:
+            key = name.decode().upper().replace("-", "_")
+            environ[key if key == "CONTENT_TYPE" else f"HTTP_{key}"] = value.decode()
+
+        response = dict()
+
+        def start_response(status, headers):
+            response.update(status=int(status.split(" ", 1)[0]), headers=headers)
+
+        data = b"".join(self(environ, start_response))
+        await send(dict(type="http.response.start", status=response["status"],
+                        headers=[(k.lower().encode(), v.encode()) for k, v in response["headers"]]))
+        await send(dict(type="http.response.body", body=data))
+
+    def handle(self, method: str, path: list, query: dict, body: bytes, environ: dict):
+        resource, rest = path[0], path[1:]
+        if resource == "auth":
+            token = uuid.uuid4().hex
+            expires = datetime.now(timezone.utc) + timedelta(seconds=self.token_lifetime)
+            self.tokens[token] = expires
+            return "200 OK", dict(access_token=token, expires=expires.timestamp())
+
+        expires = self.tokens.get(environ.get("HTTP_AUTHORIZATION", "").partition("Bearer ")[2])
+        if expires is None or expires < datetime.now(timezone.utc):
+            return "401 Unauthorized", dict(detail="Not authenticated")
+
+        table = self.db.table(resource)
+        if not rest:
+            if method == "POST":
+                return "200 OK", self.db.add(resource, json.loads(body))
+            if any(op in self.unsupported_filters for _, op, _ in parse_filter(query.get("filter_by", ""))):
+                return "422 Unprocessable Entity", dict(detail="Unsupported filter")
+            return "200 OK", self.list(table, query)
+
+        item = table[rest[0]]
+        if len(rest) == 1:
+            if method == "PATCH":
+                item.update(json.loads(body))
+            elif method == "DELETE":
+                self.db.items[self.type_of(item, resource)].pop(item["id"])
+            return "200 OK", item
+        elif rest[1] == "data":
+            if method == "POST":
+                if self.binary and environ.get("CONTENT_TYPE") == NPY:
+                    data = np.load(io.BytesIO(body))
+                    self.db.set_datapoints(item["id"], data[0], data[1])
+                elif environ.get("CONTENT_TYPE") == "application/json":
+                    data = json.loads(body)["data"]
+                    self.db.set_datapoints(item["id"], data["time"], data["value"])
+                else:
+                    return "415 Unsupported Media Type", dict(detail="Unsupported media type")
+            if self.binary and NPY in environ.get("HTTP_ACCEPT", ""):
+                buffer = io.BytesIO()
+                np.save(buffer, np.vstack(self.window(item, query)))
+                return "200 OK", buffer.getvalue()
+            return "200 OK", self.datapoints(item, query)
+        elif rest[1] == "statistics":
+            time, value = self.window(item, dict(query, all_data="false"))
+            return "200 OK", dict(min=value.min(), max=value.max(), std=value.std(), mean=value.mean(),
+                                  m0=value.var(), m1=0., m2=0., m4=0., tp=0.)
+        raise KeyError(rest[1])
+
+    @staticmethod
+    def type_of(item: dict, resource: str) -> str:
+        """str: Name of the table holding the item."""
+        if resource != "test":
+            return resource
+        return {v: k for k, v in TEST_TYPES.items()}[item["type"]]
+
+    @staticmethod
+    def list(table: dict, query: dict) -> list:
+        items = list(table.values())
+        if query.get("filter_by"):
+            for name, op, val in parse_filter(query["filter_by"]):
+                items = [i for i in items if match(i, name, op, val)]
+        skip = int(query.get("skip", 0))
+        limit = int(query.get("limit", 100))
+        return items[skip:skip + limit]
+
+    def window(self, ts: dict, query: dict):
+        """Data points of time series within the requested time window."""
+        time, value = self.db.datapoints.get(ts["id"], (np.empty(0), np.empty(0)))
+        if query.get("all_data", "false").lower() != "true":
+            start = float(query.get("start_time", ts["default_start_time"] or -np.inf))
+            end = float(query.get("end_time", ts["default_end_time"] or np.inf))
+            mask = (time >= start) & (time <= end)
+            time, value = time[mask], value[mask]
+        test = self.db.table("test")[ts["test_id"]]
+        if query.get("scaling_length") is not None and test.get("floaterconfig_id") is not None:
+            config = self.db.items["floaterconfig"][test["floaterconfig_id"]]
+            kind = self.db.items["sensor"][ts["sensor_id"]]["kind"]
+            time, value = froude_scale(kind, time, value,
+                                       float(query["scaling_length"]) / config["characteristic_length"])
+        return time, value
+
+    def datapoints(self, ts: dict, query: dict) -> dict:
+        time, value = self.window(ts, query)
+        return dict(data=dict(time=time.tolist(), value=value.tolist()))
+
+
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+    request_queue_size = 128  # concurrent clients connect at once, the default backlog (5) stalls them
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+@contextmanager
+def serve(app, host: str = "127.0.0.1", port: int = 0):
+    """
+    Serve WSGI application in a background thread.
+
+    Parameters
+    ----------
+    app : callable
+        WSGI application
+    host : str, optional
+        Host name
+    port : int, optional
+        Port, a free port is chosen by default
+
+    Yields
+    ------
+    str
+        API host url e.g. 'http://127.0.0.1:51234'
+    """
+    server = make_server(host, port, app, server_class=_ThreadingWSGIServer, handler_class=_QuietHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://{host}:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -50,8 +50,8 @@ def test_datapoints_overwrite(client, secret_key, admin_key, new_datapoints):
 
     returned_dp = client.timeseries.get_data_points(ts_id=selected_ts.id, all_data=True)
 
-    assert returned_dp.time == time
-    assert returned_dp.value == values
+    assert np.array_equal(returned_dp.time, time)
+    assert np.array_equal(returned_dp.value, values)
 
 
 def test_datapoints_plot(new_datapoints):
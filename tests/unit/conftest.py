@@ -3,6 +3,9 @@ from datetime import datetime
 from modeltestsdk.resources import Campaign, Sensor, Timeseries, Tests, FloaterTest, FloaterConfig, WaveCalibration, \
     WindCalibration, DataPoints, Tag, Tags
 from uuid import uuid4
+from modeltestsdk.config import Config, CacheConfig
+from modeltestsdk import Client
+from tests.fake_api import FakeAPI, FakeDatabase, serve
 from tests.utils import random_lower_int, random_float
 import random
 
@@ -168,3 +171,32 @@ def new_tags(new_timeseries, new_sensor, new_floater_test):
         tag.id = str(uuid4())
 
     return tags
+
+
+@pytest.fixture(scope="module")
+def config():
+    return Config(api_host="http://127.0.0.1:8000", api_user="tester", api_password="password")
+
+
+@pytest.fixture(scope="module")
+def fake_api():
+    """Local stand-in for the modeltest API with synthetic data."""
+    return FakeAPI(FakeDatabase().populate(n_sensors=4, n_tests=2, n_samples=200))
+
+
+@pytest.fixture(scope="module")
+def fake_host(fake_api):
+    with serve(fake_api) as host:
+        yield host
+
+
+@pytest.fixture()
+def fake_config(fake_host, tmp_path):
+    return Config(api_host=fake_host, api_user="tester", api_password="password",
+                  cache_settings=CacheConfig(cache_name=str(tmp_path / "mtdb"), use_cache_dir=False))
+
+
+@pytest.fixture()
+def fake_client(fake_config):
+    with Client(fake_config) as client:
+        yield client
@@ -0,0 +1,78 @@
+import asyncio
+import time
+from modeltestsdk import AsyncClient
+from modeltestsdk.resources import Campaigns, Sensor, Tests, FloaterTest, WaveCalibration, WindCalibration, \
+    TimeseriesList, DataPoints, FloaterConfig, Tags
+
+
+def test_async_apis(fake_config):
+    async def main():
+        async with AsyncClient(fake_config, max_concurrency=4) as client:
+            assert client.__str__()
+            campaigns = await client.campaign.get()
+            assert isinstance(campaigns, Campaigns)
+            campaign = await client.campaign.get_by_id(campaigns[0].id)
+            assert campaign.id == campaigns[0].id
+
+            sensors = await client.sensor.get_by_campaign_id(campaign.id)
+            assert all(isinstance(s, Sensor) for s in sensors)
+
+            tests = await client.test.get_by_campaign_id(campaign.id)
+            assert isinstance(tests, Tests)
+            floater_test = [t for t in tests if t.type == 'Floater Test'][0]
+            assert isinstance(await client.floater_test.get_by_id(floater_test.id), FloaterTest)
+            assert isinstance(await client.wave_calibration.get_by_id(floater_test.wave_id), WaveCalibration)
+            assert isinstance(await client.wind_calibration.get_by_id(floater_test.wind_id), WindCalibration)
+            assert isinstance(await client.floater_config.get_by_id(floater_test.floaterconfig_id), FloaterConfig)
+            assert isinstance(await client.tag.get_by_test_id(floater_test.id), Tags)
+
+            timeseries = await client.timeseries.get_by_test_id(floater_test.id)
+            assert isinstance(timeseries, TimeseriesList)
+            data = await asyncio.gather(*[client.timeseries.get_data_points(ts.id, cache=False) for ts in timeseries])
+            assert [dps.timeseries_id for dps in data] == [ts.id for ts in timeseries]
+            assert all(isinstance(dps, DataPoints) and len(dps) > 0 for dps in data)
+
+            raw = await client.get("campaign", campaign.id)
+            assert raw["id"] == campaign.id
+
+    asyncio.run(main())
+
+
+def test_async_concurrency_bound(fake_config):
+    in_flight = []
+    peak = []
+
+    async def main():
+        async with AsyncClient(fake_config, max_concurrency=3) as client:
+            def work():
+                in_flight.append(1)
+                peak.append(len(in_flight))
+                client.client.get("campaign")
+                in_flight.pop()
+
+            await asyncio.gather(*[client.run(work) for _ in range(12)])
+
+    asyncio.run(main())
+    assert max(peak) <= 3
+
+
+def test_async_close_does_not_block(fake_config):
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(1)
+            await asyncio.sleep(0.01)
+
+    async def main():
+        client = AsyncClient(fake_config, max_concurrency=2)
+        pending = asyncio.ensure_future(client.run(time.sleep, 0.3))
+        await asyncio.sleep(0)
+        task = asyncio.ensure_future(ticker())
+        await client.close()
+        task.cancel()
+        assert pending.done()
+
+    asyncio.run(main())
+    # the event loop kept running while waiting for the call in progress
+    assert len(ticks) > 5
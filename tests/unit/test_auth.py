@@ -0,0 +1,84 @@
+"""
+Test management of access tokens
+"""
+import threading
+import time
+
+from modeltestsdk import Client
+from modeltestsdk.auth import TokenManager
+from tests.fake_api import FakeAPI, FakeDatabase, serve
+
+
+class Authenticator:
+    def __init__(self, lifetime: float = 3600., delay: float = 0.):
+        self.lifetime = lifetime
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        return f"token{self.calls}", time.time() + self.lifetime
+
+
+def test_single_flight():
+    authenticate = Authenticator(delay=0.2)
+    tokens = TokenManager(authenticate)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(tokens.get())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == ["token1"] * 8
+    assert authenticate.calls == 1
+
+
+def test_refresh_ahead_of_expiry():
+    authenticate = Authenticator(lifetime=30.)
+    tokens = TokenManager(authenticate, refresh_margin=10.)
+    assert tokens.get() == tokens.get() == "token1"
+
+    tokens._expires = time.time() + 5.  # within the refresh margin, but still valid
+    assert tokens.get() == "token2"
+    tokens.invalidate("token1")  # outdated token, ignored
+    assert tokens.get() == "token2"
+    tokens.invalidate("token2")
+    assert tokens.get() == "token3"
+
+
+def test_shared_token(tmp_path):
+    path = tmp_path / "token.json"
+    first, second, other = Authenticator(), Authenticator(), Authenticator()
+    assert TokenManager(first, path=path, key="a").get() == "token1"
+    assert TokenManager(second, path=path, key="a").get() == "token1"
+    assert TokenManager(other, path=path, key="b").get() == "token1"
+    assert (first.calls, second.calls, other.calls) == (1, 0, 1)
+
+    # a rejected token is not taken over again from the file
+    tokens = TokenManager(lambda: ("fresh", time.time() + 3600.), path=path, key="b")
+    assert tokens.get() == "token1"
+    tokens.invalidate("token1")
+    assert tokens.get() == "fresh"
+
+
+def test_rejected_token(fake_config):
+    api = FakeAPI(FakeDatabase().populate(n_sensors=1, n_tests=1, n_samples=10))
+    with serve(api) as host, Client(fake_config.model_copy(update=dict(api_host=host))) as client:
+        client.token_manager._token = "revoked"
+        client.token_manager._expires = time.time() + 3600.
+        assert len(client.campaign.get()) == 1
+        assert [r[1] for r in api.requests] == ["campaign", "auth/token", "campaign"]
+
+
+def test_rejected_shared_token(fake_config, tmp_path):
+    api = FakeAPI(FakeDatabase().populate(n_sensors=1, n_tests=1, n_samples=10))
+    config = fake_config.model_copy(update=dict(token_file=str(tmp_path / "token.json")))
+    with serve(api) as host, Client(config.model_copy(update=dict(api_host=host))) as client:
+        # token shared by another process, unknown to the API
+        key = client.token_manager.key
+        TokenManager(lambda: ("revoked", time.time() + 3600.), path=config.token_file, key=key).get()
+        assert len(client.campaign.get()) == 1
+        assert [r[1] for r in api.requests] == ["campaign", "auth/token", "campaign"]
+        assert client.token_manager.get() in api.tokens
+        assert TokenManager(Authenticator(), path=config.token_file, key=key).get() in api.tokens
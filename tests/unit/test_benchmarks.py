@@ -0,0 +1,18 @@
+"""
+Test the benchmark suite
+"""
+import json
+
+from benchmarks.run import main
+
+
+def test_benchmarks(tmp_path):
+    path = tmp_path / "results.json"
+    main(["--sensors", "2", "--tests", "1", "--samples", "100", "--repeat", "2", "--output", str(path)])
+    results = json.loads(path.read_text())
+    assert results["parameters"]["n_samples"] == 100
+    assert set(results["results"]) >= {"list_tests", "get_data_points_cold_cache", "get_data_points_warm_cache",
+                                       "timeseries_list_get_data", "to_pandas", "upload_data_points"}
+    cold, warm = results["results"]["get_data_points_cold_cache"], results["results"]["get_data_points_warm_cache"]
+    assert cold["items"] == warm["items"] == 100
+    assert warm["requests"] < cold["requests"]
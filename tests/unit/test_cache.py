@@ -0,0 +1,183 @@
+import sqlite3
+from contextlib import closing
+from datetime import timedelta
+import numpy as np
+from modeltestsdk.cache import DataPointStore, IdentityMap, window
+
+
+def test_datapoint_store(tmp_path):
+    store = DataPointStore(tmp_path / "datapoints")
+    assert store.__str__()
+    assert store.get("ts") is None
+
+    time, value = np.arange(10.), np.random.random(10)
+    store.put("ts", time, value, dict(all_data=True))
+    assert store.get("ts") is None
+
+    cached_time, cached_value = store.get("ts", dict(all_data=True))
+    assert isinstance(cached_time.base, np.memmap)
+    assert np.array_equal(cached_time, time)
+    assert np.array_equal(cached_value, value)
+
+    # copy-on-write, the cache is not modified
+    cached_value[:] = 0.
+    assert np.array_equal(store.get("ts", dict(all_data=True))[1], value)
+
+    store.delete("ts")
+    assert store.get("ts", dict(all_data=True)) is None
+
+    store.put("ts", time, value)
+    store.clear()
+    assert store.get("ts") is None
+
+
+def test_datapoint_store_metadata(tmp_path):
+    store = DataPointStore(tmp_path)
+    assert store.get_metadata("ts", version="1") is None
+
+    # stored whether the data points are cached or not, and only valid for their version
+    store.set_metadata("ts", dict(a=1), version="1")
+    assert store.get_metadata("ts", version="1") == dict(a=1)
+    assert store.get_metadata("ts", version="2") is None
+    store.put("ts", np.arange(3.), np.arange(3.), version="2")
+    assert store.get_metadata("ts", version="1") == dict(a=1)
+    store.put("ts", np.arange(3.), np.arange(3.), metadata=dict(a=2), version="2")
+    assert store.get_metadata("ts", version="2") == dict(a=2)
+    store.clear()
+    assert store.get_metadata("ts", version="2") is None
+
+
+def test_datapoint_store_format(tmp_path):
+    store = DataPointStore(tmp_path)
+    store.put("ts", np.arange(3.), np.arange(3.), version="1")
+    assert store.get("ts", version="1") is not None
+
+    # entries of an earlier format are discarded
+    with closing(sqlite3.connect(tmp_path / "index.sqlite")) as con:
+        con.execute("PRAGMA user_version = 0")
+    assert store.get("ts", version="1") is None
+    assert not list(tmp_path.glob("*.npy"))
+
+
+def test_datapoint_store_expiry(tmp_path):
+    store = DataPointStore(tmp_path, expire_after=timedelta(seconds=-1))
+    store.put("ts", np.arange(10.), np.arange(10.))
+    assert store.get("ts") is None
+
+    # versioned entries do not expire
+    store.put("ts", np.arange(10.), np.arange(10.), version="1")
+    assert store.get("ts", version="1") is not None
+    assert store.get("ts", version="2") is None
+    assert store.get("ts", version="1") is None
+
+
+def test_get_data_points_versioned(fake_client, fake_api):
+    ts = fake_client.timeseries.get()[2]
+    fake_client.timeseries.get_data_points(ts.id, all_data=True)
+
+    # data points replaced by someone else
+    fake_api.db.set_datapoints(ts.id, np.arange(5.), np.ones(5))
+    n_requests = n_data_requests(fake_api)
+    dps = fake_client.timeseries.get_data_points(ts.id, all_data=True)
+    assert n_data_requests(fake_api) == n_requests + 1
+    assert np.array_equal(dps.value, np.ones(5))
+
+    # data points replaced by this client
+    fake_client.timeseries.add_data_points(ts.id, time=[0., 1.], values=[2., 2.])
+    assert fake_client.datapoint_store.get(ts.id, version=fake_client.timeseries.get_by_id(ts.id)
+                                           .datapoints_created_at) is None
+    dps = fake_client.timeseries.get_data_points(ts.id, all_data=True)
+    assert np.array_equal(dps.value, [2., 2.])
+
+
+def n_data_requests(fake_api) -> int:
+    return len([r for r in fake_api.requests if r[1].endswith("/data")])
+
+
+def test_get_data_points_from_cache(fake_client, fake_api):
+    ts = fake_client.timeseries.get()[0]
+    dps = fake_client.timeseries.get_data_points(ts.id, all_data=True)
+
+    n_requests = n_data_requests(fake_api)
+    cached_dps = fake_client.timeseries.get_data_points(ts.id, all_data=True)
+    assert n_data_requests(fake_api) == n_requests
+    assert cached_dps == dps
+
+    fake_client.clear_cache()
+    fake_client.timeseries.get_data_points(ts.id, all_data=True)
+    assert n_data_requests(fake_api) == n_requests + 1
+
+
+def test_window():
+    time, value = np.arange(10.), np.arange(10.) * 2
+    assert np.array_equal(window(time, value, 2., 4.)[0], [2., 3., 4.])
+    assert np.array_equal(window(time, value, end=1.5)[1], [0., 2.])
+    assert np.array_equal(window(time, value, start=8.5)[0], [9.])
+    assert window(time, value)[0] is time
+    assert np.shares_memory(window(time, value, 2., 4.)[0], time)
+
+    unsorted = time[::-1].copy()
+    assert np.array_equal(window(unsorted, value, 2., 4., is_sorted=False)[0], [4., 3., 2.])
+
+
+def test_get_data_points_windows_from_cache(fake_client, fake_api):
+    ts = fake_client.timeseries.get()[1]
+    windows = [dict(start=1., end=2.), dict(start=1.5, end=3.), dict(start=5.), dict(end=4.), dict(),
+               dict(all_data=True), dict(start=1., end=2., all_data=True)]
+
+    n_requests = n_data_requests(fake_api)
+    for kwargs in windows:
+        cached = fake_client.timeseries.get_data_points(ts.id, **kwargs)
+        assert cached == fake_client.timeseries.get_data_points(ts.id, cache=False, **kwargs)
+        assert len(cached) > 0
+
+    # one download of the complete time series and one for each uncached comparison
+    assert n_data_requests(fake_api) == n_requests + 1 + len(windows)
+
+
+class Item:
+    def __init__(self, read_only=False):
+        self.read_only = read_only
+
+
+def test_identity_map(monkeypatch):
+    now = [0.]
+    monkeypatch.setattr("modeltestsdk.cache.time.monotonic", lambda: now[0])
+    identity_map = IdentityMap(maxsize=2, ttl=10.)
+    a, b, c = Item(), Item(read_only=True), Item()
+    identity_map.put(("sensor", "a"), a)
+    identity_map.put(("sensor", "b"), b)
+    assert identity_map.get(("sensor", "a")) is a
+
+    # least recently used is evicted when full
+    identity_map.put(("test", "c"), c)
+    assert ("sensor", "b") not in identity_map
+    assert len(identity_map) == 2
+
+    # read only items do not expire
+    identity_map.put(("sensor", "b"), b)
+    now[0] = 11.
+    assert identity_map.get(("test", "c")) is None
+    assert identity_map.get(("sensor", "b")) is b
+
+    identity_map.discard("b")
+    assert len(identity_map) == 0
+    assert IdentityMap(maxsize=0).put(("sensor", "a"), a) is None
+    assert ("sensor", "a") not in IdentityMap(maxsize=0)
+
+
+def test_relationships_from_identity_map(fake_client, fake_api):
+    timeseries = fake_client.timeseries.get()[:4]
+    n_requests = len(fake_api.requests)
+    sensors = [ts.sensor for ts in timeseries] + [ts.sensor for ts in timeseries]
+    tests = [ts.test for ts in timeseries]
+    requested = [r[1] for r in fake_api.requests[n_requests:]]
+    assert len(requested) == len({ts.sensor_id for ts in timeseries}) + len({ts.test_id for ts in timeseries})
+    assert sensors[0] is sensors[len(timeseries)]
+    assert tests[0] is fake_client.test.get_by_id(timeseries[0].test_id)
+
+    # updated items are fetched again
+    sensor = sensors[0]
+    sensor.update()
+    assert fake_client.sensor.get_by_id(sensor.id) is not sensor
+    assert fake_client.sensor.get_by_id(sensor.id, refresh=True) == sensor
@@ -0,0 +1,82 @@
+import json
+import threading
+
+from modeltestsdk import Client
+from tests.fake_api import FakeAPI, FakeDatabase, serve
+
+
+def test_pooled_session(config):
+    client = Client(config)
+    session = client.session
+    assert session is client.session
+    for prefix in ('http://', 'https://'):
+        adapter = session.get_adapter(prefix + 'example.com')
+        assert adapter._pool_connections == config.requests_pool_connections
+        assert adapter._pool_maxsize == config.requests_pool_maxsize
+        assert adapter.max_retries is client.retries
+
+    cached_session = client._get_session(cache=True)
+    assert cached_session is not session
+    assert cached_session is client._get_session(cache=True)
+
+    client.close()
+    assert client.session is not session
+
+
+def test_pooled_session_keep_alive(fake_config):
+    api = FakeAPI(FakeDatabase().populate(n_sensors=1, n_tests=1, n_samples=200_000))
+    ts_id = next(iter(api.db.datapoints))
+    config = fake_config.model_copy(update=dict(requests_pool_keep_alive=0.0, requests_accept_encoding="identity"))
+    with serve(api) as host, Client(config.model_copy(update=dict(api_host=host))) as client:
+        session = client.session
+        r = client._request("GET", resource="timeseries", endpoint=f"{ts_id}/data", parameters=dict(all_data=True),
+                            stream=True)
+        chunk = next(r.iter_content(chunk_size=1024))
+
+        # idle connections are dropped, the session and the download in progress are kept
+        client.campaign.get()
+        assert client.session is session
+        assert len(session.get_adapter(host).poolmanager.pools) == 0
+        data = json.loads(chunk + b"".join(r.iter_content(chunk_size=2 ** 16)))
+        assert len(data["data"]["time"]) == 200_000
+
+
+def test_compression(fake_config, fake_api):
+    with Client(fake_config.model_copy(update=dict(requests_compress=True, requests_compress_min_size=1000))) as c:
+        ts = c.floater_test.get()[0].timeseries()[0]
+        n_requests = len(fake_api.requests)
+        c.timeseries.add_data_points(ts.id, time=[0.], values=[1.])
+        c.timeseries.add_data_points(ts.id, time=list(range(1000)), values=list(range(1000)))
+        assert [h.get("Content-Encoding") for h in fake_api.headers[n_requests:]] == [None, "gzip"]
+        assert fake_api.db.datapoints[ts.id][1].tolist() == list(range(1000))
+
+        # responses are compressed and decompressed transparently
+        r = c._request("GET", resource="timeseries", endpoint=f"{ts.id}/data", parameters=dict(all_data=True))
+        assert r.headers["Content-Encoding"] == "gzip"
+        assert len(r.json()["data"]["time"]) == 1000
+
+
+def test_coalesce_requests(fake_config):
+    api = FakeAPI(FakeDatabase().populate(n_sensors=1, n_tests=1, n_samples=10), latency=0.2)
+    with serve(api) as host, Client(fake_config.model_copy(update=dict(api_host=host))) as client:
+        client._request_token()
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(client.get("campaign", parameters=dict(limit=1))))
+                   for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(results) == 8 and all(r is results[0] for r in results)
+        assert [r[1] for r in api.requests] == ["auth/token", "campaign"]
+        assert len(client._in_flight) == 0
+
+        # requests are coalesced while in flight only, and not if disabled
+        client.get("campaign", parameters=dict(limit=1))
+        client.config.coalesce_requests = False
+        threads = [threading.Thread(target=client.get, args=("campaign",)) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(api.requests) == 5
@@ -1,9 +1,13 @@
 """
 Test the DataPoints models
 """
-from modeltestsdk.resources import DataPoints, DataPointsList, Timeseries
+from modeltestsdk.resources import DataPoints, DataPointsList, Timeseries, TimeseriesList
 from tests.utils import random_lower_int, random_float
 from uuid import uuid4
+from pydantic import ValidationError
+import numpy as np
+import pandas as pd
+import pytest
 
 
 def test_types(new_datapoints):
@@ -36,3 +40,56 @@ def test_to_qats(new_datapoints):
     assert ts.name == 'unknown'
     assert ts.kind is None
     assert ts.unit is None
+
+
+def test_arrays(new_datapoints):
+    assert isinstance(new_datapoints.time, np.ndarray)
+    assert isinstance(new_datapoints.value, np.ndarray)
+    assert new_datapoints.value.dtype == np.float64
+
+    dp = DataPoints(time=np.arange(3, dtype=np.float32), value=[1, None, 3], timeseries_id='1')
+    assert dp.time.dtype == np.float32
+    assert np.isnan(dp.value[1])
+    assert dp == DataPoints(time=[0, 1, 2], value=[1, np.nan, 3], timeseries_id='1')
+    assert dp != DataPoints(time=[0, 1, 2], value=[1, 2, 3], timeseries_id='1')
+    assert dp.model_dump_json() == '{"client":null,"id":null,"read_only":false,"time":[0.0,1.0,2.0],' \
+                                   '"value":[1.0,null,3.0],"timeseries_id":"1"}'
+
+    with pytest.raises(ValidationError):
+        DataPoints(time=[[0, 1]], value=[[1, 2]], timeseries_id='1')
+
+
+def test_to_pandas_without_copy(new_datapoints):
+    df = new_datapoints.to_pandas()
+    assert np.shares_memory(df.values, new_datapoints.value)
+    assert np.shares_memory(df.index.values, new_datapoints.time)
+
+
+def test_get_data_points(fake_client):
+    ts = fake_client.timeseries.get()[0]
+    dp = fake_client.timeseries.get_data_points(ts.id, dtype=np.float32, cache=False)
+    assert dp.time.dtype == dp.value.dtype == np.float32
+
+
+def test_to_pandas_resolves_names_in_batch(fake_client, fake_api, monkeypatch):
+    campaign = fake_client.campaign.get()[0]
+    timeseries = TimeseriesList([ts for test in campaign.tests() for ts in test.timeseries()])
+    dps_list = DataPointsList([fake_client.timeseries.get_data_points(ts.id, cache=False) for ts in timeseries])
+    fake_client.identity_map.clear()
+
+    n_requests = len(fake_api.requests)
+    df = dps_list.to_pandas()
+    # time series, sensors and tests are fetched in one request each
+    assert len(fake_api.requests) - n_requests == 3
+    expected = [f'{ts.test.number} - {ts.sensor.name}' for ts in timeseries]
+    assert list(df.columns) == expected
+    assert dps_list[0].to_pandas().columns[0] == expected[0]
+
+    # y-label is only set if all sensors have the same kind and unit
+    plotted = dict()
+    monkeypatch.setattr(pd.DataFrame, "plot", lambda self, **kwargs: plotted.update(kwargs), raising=False)
+    dps_list.plot(show=False)
+    assert 'ylabel' not in plotted and plotted['xlabel'] == 'Time [s]'
+    sensor = timeseries[0].sensor
+    DataPointsList([dps for dps, ts in zip(dps_list, timeseries) if ts.sensor_id == sensor.id]).plot(show=False)
+    assert plotted['ylabel'] == f'{sensor.kind.capitalize()} [{sensor.unit}]'
@@ -0,0 +1,74 @@
+"""
+Test metrics of requests and caches
+"""
+import pytest
+
+from modeltestsdk import Client
+from modeltestsdk.metrics import Metrics, endpoint_key
+
+
+def test_endpoint_key():
+    assert endpoint_key("GET", "timeseries", "4175bd27-62e5-46ad-bbce-2f37c131bdb6/data") == "GET timeseries/{id}/data"
+    assert endpoint_key("POST", "campaign") == "POST campaign"
+
+
+def test_metrics():
+    metrics = Metrics(enabled=True)
+    for latency in (.001, .002, .003, .2):
+        metrics.record_request("GET campaign", latency, size=10, from_cache=latency > .1)
+    metrics.record_request("GET campaign", 1.5, retries=2, error=True)
+    metrics.record_cache("datapoints", True)
+
+    stats = metrics.snapshot()
+    m = stats["requests"]["GET campaign"]
+    assert (m["count"], m["errors"], m["retries"], m["bytes"]) == (5, 1, 2, 40)
+    assert (m["cache_hits"], m["cache_misses"], m["cache_hit_ratio"]) == (1, 3, .25)
+    assert m["latency"]["min"] == .001 and m["latency"]["max"] == 1.5
+    assert m["latency"]["p50"] == .005 and m["latency"]["p99"] == 1.5
+    assert sum(m["latency"]["histogram"].values()) == 5
+    assert stats["caches"] == dict(datapoints=dict(hits=1, misses=0, hit_ratio=1.))
+
+    metrics.reset()
+    assert metrics.snapshot() == dict(requests=dict(), caches=dict())
+
+
+def test_client_stats(fake_config):
+    with Client(fake_config.model_copy(update=dict(metrics=True))) as client:
+        ts = client.floater_test.get()[0].timeseries()[0]
+        client.timeseries.get_data_points(ts.id)
+        client.timeseries.get_data_points(ts.id)
+        client.sensor.get_by_id(ts.sensor_id)
+        client.sensor.get_by_id(ts.sensor_id)
+
+        stats = client.stats()
+        data = stats["requests"]["GET timeseries/{id}/data"]
+        assert data["count"] == 1 and data["bytes"] > 0 and data["errors"] == 0
+        assert stats["requests"]["GET floatertest"]["count"] == 1
+        assert stats["caches"]["datapoints"] == dict(hits=1, misses=1, hit_ratio=.5)
+        assert stats["caches"]["identity_map"]["hits"] >= 1
+
+        client.reset_stats()
+        assert client.stats()["requests"] == dict()
+
+
+def test_metrics_disabled(fake_client):
+    fake_client.campaign.get()
+    assert fake_client.stats() == dict(requests=dict(), caches=dict())
+
+
+@pytest.mark.parametrize("datapoints_format", ["json", "npy"])
+def test_streamed_bytes(fake_api, fake_config, monkeypatch, datapoints_format):
+    # responses without their length, read in pieces
+    monkeypatch.setattr(fake_api, "content_length", False)
+    config = fake_config.model_copy(update=dict(metrics=True, datapoints_format=datapoints_format))
+    with Client(config) as client:
+        ts = client.floater_test.get()[0].timeseries()[0]
+        client.timeseries.get_data_points(ts.id, all_data=True, cache=False)
+        assert client.stats()["requests"]["GET timeseries/{id}/data"]["bytes"] > 0
+
+        client.reset_stats()
+        for stream in (True, False):
+            r = client._request("GET", resource="timeseries", endpoint=f"{ts.id}/data",
+                                headers=client.timeseries._data_points_headers(), stream=stream)
+            assert len(r.content) > 0
+        assert client.stats()["requests"]["GET timeseries/{id}/data"]["bytes"] == 2 * len(r.content)
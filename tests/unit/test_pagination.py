@@ -0,0 +1,64 @@
+import asyncio
+import pytest
+from modeltestsdk import AsyncClient
+from modeltestsdk.resources import Sensor, Sensors, Tests
+
+
+def n_list_requests(fake_api, start, resource):
+    return len([r for r in fake_api.requests[start:] if r[0] == "GET" and r[1] == resource])
+
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_iter_pages(fake_client, fake_api, prefetch):
+    campaign = fake_client.campaign.get()[0]
+    n_sensors = len(campaign.sensors())
+    n_requests = len(fake_api.requests)
+    pages = list(fake_client.sensor.iter_pages(filter_by=[fake_client.filter.sensor.campaign_id == campaign.id],
+                                               page_size=3, prefetch=prefetch))
+    assert all(isinstance(p, Sensors) for p in pages)
+    assert [len(p) for p in pages] == [3, n_sensors - 3]
+    assert n_list_requests(fake_api, n_requests, "sensor") == 2
+
+
+def test_iter_pages_full_last_page(fake_client, fake_api):
+    campaign = fake_client.campaign.get()[0]
+    n_sensors = len(campaign.sensors())
+    pages = list(fake_client.sensor.iter_pages(filter_by=[fake_client.filter.sensor.campaign_id == campaign.id],
+                                               page_size=n_sensors))
+    # the empty page confirming the end is not yielded
+    assert [len(p) for p in pages] == [n_sensors]
+
+
+def test_iter_all_is_lazy(fake_client, fake_api):
+    n_requests = len(fake_api.requests)
+    it = fake_client.sensor.iter_all(page_size=1, prefetch=False)
+    assert isinstance(next(it), Sensor)
+    it.close()
+    assert n_list_requests(fake_api, n_requests, "sensor") == 1
+
+
+def test_iter_all_prefetch(fake_client):
+    ids = [s.id for s in fake_client.sensor.iter_all(page_size=3, prefetch=True)]
+    assert ids == [s.id for s in fake_client.sensor.get()]
+
+
+def test_paginate(fake_client, fake_config):
+    fake_client.config.page_size = 2
+    campaign = fake_client.campaign.get()[0]
+    tests = campaign.tests(paginate=True)
+    assert isinstance(tests, Tests)
+    assert [t.id for t in tests] == [t.id for t in campaign.tests()]
+    assert len(campaign.tests(limit=2)) == 2
+    assert len(fake_client.sensor.get(paginate=True)) == len(fake_client.sensor.get())
+
+
+def test_async_iter_all(fake_config):
+    async def main():
+        async with AsyncClient(fake_config) as client:
+            sensors = [s async for s in client.sensor.iter_all(page_size=3)]
+            pages = [p async for p in client.sensor.iter_pages(page_size=3)]
+            return sensors, pages, client.client.sensor.get()
+
+    sensors, pages, expected = asyncio.run(main())
+    assert [s.id for s in sensors] == [s.id for s in expected]
+    assert sum(len(p) for p in pages) == len(expected)
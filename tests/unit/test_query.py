@@ -45,3 +45,21 @@ def test_query_parameters():
     assert query.create_query_parameters(flt_exp, []) == {'filter_by': 'name[eq]=1,type[gte]=1'}
     assert query.create_query_parameters([], sort_exp) == {'sort_by': 'asc(name),desc(type)'}
     assert query.create_query_parameters([], []) == {}
+
+
+def test_set_membership():
+    flt_attr = query.FilterAttribute('id')
+    assert flt_attr.isin(('a', 'b')) == dict(name='id', op='in', val=['a', 'b'])
+    assert flt_attr.in_(['a']) == flt_attr.isin(['a'])
+    assert query.create_query_parameters([flt_attr.isin([1, 'b']), flt_attr == 'c'], []) == \
+        {'filter_by': 'id[in]=1|b,id[eq]=c'}
+
+
+def test_chunk_values():
+    values = [f'{i:04d}' for i in range(10)]
+    chunks = query.chunk_values(values, max_length=4 * 3 + 3 * 2)  # three values and two encoded separators
+    assert [len(c) for c in chunks] == [3, 3, 3, 1]
+    assert sum(chunks, []) == values
+    assert [len(c) for c in query.chunk_values(values, max_length=1000, max_count=4)] == [4, 4, 2]
+    assert query.chunk_values(['too long'], max_length=1) == [['too long']]
+    assert query.chunk_values([], max_length=10) == []
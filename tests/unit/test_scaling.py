@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+from modeltestsdk import Client
+from modeltestsdk.resources import Statistics
+from modeltestsdk.scaling import froude_factors, froude_scale, froude_scale_statistics
+
+
+def test_froude_factors():
+    assert froude_factors('force', 4.) == (2., 64.)
+    assert froude_factors('Angular velocity', 4.) == (2., .5)
+    assert froude_factors('control signal', 4.) is None
+
+
+def test_froude_scale():
+    time, value = froude_scale(np.arange(3.), np.ones(3, dtype=np.float32), 'length', 4.)
+    assert np.array_equal(time, [0., 2., 4.])
+    assert np.array_equal(value, [4., 4., 4.])
+    assert value.dtype == np.float32
+
+    with pytest.raises(ValueError):
+        froude_scale(np.arange(3.), np.ones(3), 'control signal', 4.)
+
+
+def test_froude_scale_statistics():
+    stats = Statistics(min=-1., max=1., std=1., mean=0., m0=1., m1=1., m2=1., m4=1., tp=10.)
+    scaled = froude_scale_statistics(stats, 'length', 4.)
+    assert scaled.max == 4.
+    assert scaled.m0 == 16.
+    assert scaled.m2 == 4.
+    assert scaled.tp == 20.
+
+
+# scaling the stand-in's model (characteristic length 2 m) to 50 m, a length scale ratio of 25: time by 5 and values
+# by 25 to the power of the exponent of each sensor kind
+TIME_FACTOR = 5.
+VALUE_FACTORS = {'length': 25., 'velocity': 5., 'acceleration': 1., 'force': 15625., 'pressure': 25., 'angle': 1.,
+                 'moment': 390625.}
+
+
+@pytest.mark.parametrize("scaling", ["local", "parity"])
+def test_local_scaling_values(fake_config, fake_api, scaling):
+    client = Client(fake_config.model_copy(update=dict(scaling=scaling)))
+    test = client.floater_test.get()[0]
+    for ts in test.timeseries():
+        time, value = fake_api.db.datapoints[ts.id]
+        factor = VALUE_FACTORS[ts.sensor.kind]
+        dps = client.timeseries.get_data_points(ts.id, scaling_length=50., all_data=True)
+        np.testing.assert_allclose(dps.time, time * TIME_FACTOR)
+        np.testing.assert_allclose(dps.value, value * factor)
+
+        # time windows are selected at model scale
+        dps = client.timeseries.get_data_points(ts.id, scaling_length=50., start=2., end=5.)
+        mask = (time >= 2.) & (time <= 5.)
+        np.testing.assert_allclose(dps.time, time[mask] * TIME_FACTOR)
+        np.testing.assert_allclose(dps.value, value[mask] * factor)
+
+        stats = client.timeseries.get_statistics(ts.id, scaling_length=50.)
+        mask = (time >= ts.default_start_time) & (time <= ts.default_end_time)
+        assert stats.max == pytest.approx(value[mask].max() * factor)
+
+
+def test_local_scaling_reuses_cache(fake_client, fake_api):
+    test = fake_client.floater_test.get()[0]
+    ts = test.timeseries()[0]
+    unscaled = fake_client.timeseries.get_data_points(ts.id, all_data=True)
+
+    n_data_requests = len([r for r in fake_api.requests if r[1].endswith("/data")])
+    for scaling_length in (10., 20., 30.):
+        scaled = fake_client.timeseries.get_data_points(ts.id, scaling_length=scaling_length, all_data=True)
+        assert np.allclose(scaled.time, unscaled.time * (scaling_length / 2.) ** .5)
+    assert len([r for r in fake_api.requests if r[1].endswith("/data")]) == n_data_requests
+
+
+def test_froude_parameters_stored(fake_client, fake_api, monkeypatch):
+    calls = []
+    froude_parameters = fake_client.timeseries._froude_parameters
+    monkeypatch.setattr(fake_client.timeseries, '_froude_parameters',
+                        lambda ts_id: calls.append(ts_id) or froude_parameters(ts_id))
+
+    # looked up once per version of the data points, also for time series scaled by the API
+    for ts in (fake_client.floater_test.get()[0].timeseries()[1], fake_client.wave_calibration.get()[0].timeseries()[1]):
+        for _ in range(2):
+            fake_client.timeseries.get_data_points(ts.id, scaling_length=50., all_data=True)
+        assert calls == [ts.id]
+        ts.add_data(np.arange(3.), np.ones(3))
+        fake_client.timeseries.get_data_points(ts.id, scaling_length=50., all_data=True)
+        assert calls == [ts.id, ts.id]
+        calls.clear()
+
+
+def test_server_scaling_for_calibrations(fake_client, fake_api):
+    ts = fake_client.wave_calibration.get()[0].timeseries()[0]
+    fake_client.timeseries.get_data_points(ts.id, scaling_length=50., all_data=True)
+    assert fake_api.requests[-1][2]['scaling_length'] == '50.0'
@@ -1,5 +1,7 @@
-from modeltestsdk.resources import Sensor
+from modeltestsdk import Client
+from modeltestsdk.resources import Sensor, Sensors
 from pandas import DataFrame
+from tests.fake_api import FakeAPI, FakeDatabase, serve
 
 
 def test_types(new_sensor):
@@ -23,3 +25,40 @@ def test_types(new_sensor):
 def test_topandas(new_sensor):
     df = new_sensor.to_pandas()
     assert isinstance(df, DataFrame)
+
+
+def test_get_by_ids(fake_client, fake_api):
+    sensors = fake_client.sensor.get()
+    ids = [s.id for s in sensors][::-1] + ['unknown']
+    n_requests = len(fake_api.requests)
+    fetched = fake_client.sensor.get_by_ids(ids)
+    assert isinstance(fetched, Sensors)
+    assert [s.id for s in fetched] == ids[:-1]
+    assert len(fake_api.requests) == n_requests + 1
+
+    # chunked to respect the URL length, chunks are fetched concurrently
+    fake_client.config.max_url_length = len(fake_client._create_url('sensor')) + 64 + 2 * len(ids[0]) + 3
+    n_requests = len(fake_api.requests)
+    assert [s.id for s in fake_client.sensor.get_by_ids(ids[:-1])] == ids[:-1]
+    assert len(fake_api.requests) == n_requests + (len(sensors) + 1) // 2
+    assert len(fake_client.test.get_by_ids([])) == 0
+
+
+def test_get_by_ids_unsupported(fake_config, caplog):
+    api = FakeAPI(FakeDatabase().populate(n_sensors=3, n_tests=1, n_samples=10))
+    api.unsupported_filters.add('in')
+    with serve(api) as host, Client(fake_config.model_copy(update=dict(api_host=host))) as client:
+        ids = [s.id for s in client.sensor.get()][::-1]
+        n_requests = len(api.requests)
+        fetched = client.sensor.get_by_ids(ids + ['unknown'])
+        assert isinstance(fetched, Sensors)
+        assert [s.id for s in fetched] == ids
+        # unknown identifiers are expected, not errors
+        assert not [r for r in caplog.records if r.module == "concurrency" and r.levelname == "ERROR"]
+
+        # one rejected batch, then one request per item, also in later batches
+        assert len(api.requests) == n_requests + 1 + len(ids) + 1
+        client.identity_map.clear()
+        n_requests = len(api.requests)
+        assert list(client.sensor._get_many(ids)) == ids
+        assert len(api.requests) == n_requests + len(ids)
@@ -0,0 +1,61 @@
+"""
+Test the Test models
+"""
+from modeltestsdk.resources import FloaterTest, WaveCalibration, WindCalibration, Tests
+
+
+def test_get_tests_from_list(fake_client, fake_api):
+    campaign = fake_client.campaign.get()[0]
+    n_requests = len(fake_api.requests)  # authenticated by now
+    tests = campaign.tests()
+    assert len(fake_api.requests) == n_requests + 1
+
+    assert isinstance(tests, Tests)
+    assert {type(t) for t in tests} == {FloaterTest, WaveCalibration, WindCalibration}
+    assert all(t.client is fake_client for t in tests)
+    floater_test = [t for t in tests if isinstance(t, FloaterTest)][0]
+    assert fake_client.test.get_by_id(floater_test.id) == floater_test
+
+
+def test_get_tests_fallback(fake_client, fake_api, monkeypatch):
+    get = fake_client.get
+
+    def get_partial(resource=None, endpoint=None, parameters=None, cache=False):
+        data = get(resource=resource, endpoint=endpoint, parameters=parameters, cache=cache)
+        if resource == 'test':
+            data = [{k: v for k, v in i.items() if k not in ('category', 'wind_spectrum')} for i in data]
+        return data
+
+    monkeypatch.setattr(fake_client, 'get', get_partial)
+    n_requests = len(fake_api.requests)
+    tests = fake_client.test.get()
+    assert {type(t) for t in tests} == {FloaterTest, WaveCalibration, WindCalibration}
+
+    # floater tests and wind calibrations are incomplete without category and wind spectrum, and fetched in batch
+    floater_tests = [t for t in tests if isinstance(t, FloaterTest)]
+    wind_calibrations = [t for t in tests if isinstance(t, WindCalibration)]
+    assert all(t.category for t in floater_tests)
+    assert [t.wind_spectrum for t in wind_calibrations] == ['NPD'] * len(wind_calibrations)
+    resources = [r[1].split('/')[0] for r in fake_api.requests[n_requests:] if r[1] != 'auth/token']
+    assert sorted(resources) == ['floatertest', 'test', 'windcalibration']
+
+    # fetched tests are shared, whichever API they are fetched by
+    n_requests = len(fake_api.requests)
+    assert fake_client.test.get_by_id(floater_tests[0].id) is floater_tests[0]
+    assert fake_client.wind_calibration.get_by_id(wind_calibrations[0].id) is wind_calibrations[0]
+    assert len(fake_api.requests) == n_requests
+
+
+def test_get_tests_unknown_type(fake_client, fake_api, monkeypatch):
+    get = fake_client.get
+
+    def get_unknown(resource=None, endpoint=None, parameters=None, cache=False):
+        data = get(resource=resource, endpoint=endpoint, parameters=parameters, cache=cache)
+        if resource == 'test':
+            data = [dict(i, type='Current Calibration') if i['type'] == 'Floater Test' else i for i in data]
+        return data
+
+    monkeypatch.setattr(fake_client, 'get', get_unknown)
+    tests = fake_client.test.get()
+    # fetched as floater tests, like tests of unknown type always were
+    assert {type(t) for t in tests} == {FloaterTest, WaveCalibration, WindCalibration}
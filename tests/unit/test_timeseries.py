@@ -1,6 +1,15 @@
 """
 Test the Timeseries models
 """
+import threading
+import time
+import numpy as np
+import pytest
+import requests
+from modeltestsdk import Client
+from modeltestsdk.concurrency import BatchError
+from modeltestsdk.resources import Timeseries, TimeseriesList
+from tests.fake_api import FakeAPI, FakeDatabase, serve
 
 
 def test_types(new_timeseries):
@@ -8,3 +17,168 @@ def test_types(new_timeseries):
     assert isinstance(new_timeseries.test_id, str)
     assert new_timeseries.test is None
     assert new_timeseries.sensor is None
+
+
+def test_get_data_concurrently(fake_client):
+    test = fake_client.floater_test.get()[0]
+    tss = test.timeseries()
+    dps = tss.get_data(max_workers=4)
+    assert [dp.timeseries_id for dp in dps] == [ts.id for ts in tss]
+    assert all(len(dp) > 0 for dp in dps)
+
+    tsdb = tss.get_qats_tsdb(max_workers=4)
+    assert tsdb.n == len(tss)
+
+
+def test_get_data_failures(fake_client, caplog):
+    tss = fake_client.floater_test.get()[0].timeseries()
+    broken = Timeseries(client=fake_client, id='missing', sensor_id=tss[0].sensor_id, test_id=tss[0].test_id, fs=1.)
+    tss = TimeseriesList([tss[0], broken, tss[1]])
+
+    with pytest.raises(BatchError) as e:
+        tss.get_data(max_workers=2)
+
+    assert list(e.value.errors) == [1]
+    assert e.value.results[1] is None
+    assert [dp.timeseries_id for dp in e.value.results[::2]] == [tss[0].id, tss[2].id]
+
+    caplog.clear()
+    dps = tss.get_data(max_workers=2, raise_errors=False)
+    assert [dp.timeseries_id for dp in dps] == [tss[0].id, tss[2].id]
+    # skipped failures are logged
+    assert any("time series missing" in r.message for r in caplog.records if r.levelname == "ERROR")
+
+
+@pytest.fixture(scope="module")
+def long_api():
+    return FakeAPI(FakeDatabase().populate(n_sensors=1, n_tests=1, n_samples=5000, fs=10.))
+
+
+@pytest.fixture()
+def long_client(long_api, fake_config):
+    with serve(long_api) as host:
+        with Client(fake_config.model_copy(update=dict(api_host=host, max_workers=3))) as client:
+            yield client
+
+
+def data_requests(api, start):
+    return [r[2] for r in api.requests[start:] if r[1].endswith('/data')]
+
+
+@pytest.mark.parametrize("kwargs", [dict(), dict(start=12.3, end=345.6), dict(end=100.05), dict(start=33.)])
+def test_get_data_chunked(long_client, long_api, kwargs):
+    ts = long_client.floater_test.get()[0].timeseries()[0]
+    whole = long_client.timeseries.get_data_points(ts.id, cache=False, chunk_size=0, **kwargs)
+    n_requests = len(long_api.requests)
+    chunked = long_client.timeseries.get_data_points(ts.id, cache=False, chunk_size=700, **kwargs)
+    assert chunked == whole
+    requests = data_requests(long_api, n_requests)
+    assert len(requests) >= len(whole) // 700
+    assert all(np.isfinite(float(v)) for r in requests for k, v in r.items() if k in ('start_time', 'end_time'))
+
+
+def test_get_data_in_one_go(long_client, long_api):
+    ts = long_client.floater_test.get()[0].timeseries()[0]
+    long_client.config.datapoints_chunk_size = 1000
+
+    # complete, cached, short and intermittent time series are downloaded in one go
+    n_requests = len(long_api.requests)
+    assert len(long_client.timeseries.get_data_points(ts.id, all_data=True, cache=False)) == 5000
+    assert len(long_client.timeseries.get_data_points(ts.id, all_data=True)) == 5000
+    assert len(long_client.timeseries.get_data_points(ts.id, start=0, end=99.9, cache=False)) == 1000
+    ts.intermittent = True
+    long_client.identity_map.put(('timeseries', ts.id), ts)
+    assert len(long_client.timeseries.get_data_points(ts.id, cache=False)) == 4001
+    assert len(data_requests(long_api, n_requests)) == 4
+
+
+def test_get_data_gaps(fake_config):
+    api = FakeAPI(FakeDatabase().populate(n_sensors=1, n_tests=1, n_samples=300, fs=10.))
+    ts_id = next(iter(api.db.datapoints))
+    # gaps within a window, and wider than a window beyond the default time window (3 s to 27 s)
+    time = np.round(np.arange(-50, 300) / 10., 1)
+    time = np.concatenate([time[(time < 10.) | (time > 10.45)], 60. + np.arange(100) / 10.])
+    api.db.set_datapoints(ts_id, time, np.ones_like(time))
+
+    with serve(api) as host, Client(fake_config.model_copy(update=dict(api_host=host))) as client:
+        for cache in (False, True):
+            dps = client.timeseries.get_data_points(ts_id, all_data=True, cache=cache, chunk_size=10)
+            np.testing.assert_array_equal(dps.time, time)
+        dps = client.timeseries.get_data_points(ts_id, start=5., end=65., cache=False, chunk_size=10)
+        np.testing.assert_array_equal(dps.time, time[(time >= 5.) & (time <= 65.)])
+
+
+def test_get_data_nested_concurrency(fake_config, monkeypatch):
+    api = FakeAPI(FakeDatabase().populate(n_sensors=4, n_tests=1, n_samples=5000, fs=10.))
+    in_flight, peak, lock = [0], [0], threading.Lock()
+    handle = api.handle
+
+    def counting_handle(*args):
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        try:
+            time.sleep(0.01)
+            return handle(*args)
+        finally:
+            with lock:
+                in_flight[0] -= 1
+
+    monkeypatch.setattr(api, "handle", counting_handle)
+    config = fake_config.model_copy(update=dict(max_workers=3, datapoints_chunk_size=1000))
+    with serve(api) as host, Client(config.model_copy(update=dict(api_host=host))) as client:
+        tss = client.floater_test.get()[0].timeseries()
+        data = tss._map(lambda ts: client.timeseries.get_data_points(ts.id, cache=False))
+        assert all(len(dps) == 4001 for dps in data)
+    # windows of each time series are fetched serially within the workers fetching the time series
+    assert peak[0] <= 3
+
+
+def test_upload_data_points(fake_client, fake_api, tmp_path, monkeypatch):
+    test = fake_client.floater_test.get()[0]
+    sensors = fake_client.sensor.get()
+    tss = [fake_client.timeseries.create(sensor_id=s.id, test_id=test.id, default_start_time=0., default_end_time=1.,
+                                         fs=10.) for s in sensors[:3]]
+    data = {ts.id: (np.arange(20) / 10., np.full(20, i, dtype=float)) for i, ts in enumerate(tss)}
+    manifest = str(tmp_path / "upload.json")
+    fake_client.config.requests_backoff_factor = 0.
+
+    # the second time series fails for good, the third once
+    post = fake_client.timeseries._post_data_points
+    failures = {tss[1].id: 100, tss[2].id: 1}
+
+    def flaky_post(ts_id, *args, **kwargs):
+        if failures.get(ts_id, 0) > 0:
+            failures[ts_id] -= 1
+            raise requests.exceptions.ConnectionError("connection reset")
+        return post(ts_id, *args, **kwargs)
+
+    monkeypatch.setattr(fake_client.timeseries, "_post_data_points", flaky_post)
+    with pytest.raises(BatchError) as e:
+        fake_client.timeseries.upload_data_points(data, manifest=manifest, max_workers=2, retries=2)
+    assert list(e.value.errors) == [1]
+    assert failures == {tss[1].id: 97, tss[2].id: 0}
+
+    # resumed upload skips what is done, and uploads again what changed
+    monkeypatch.setattr(fake_client.timeseries, "_post_data_points", post)
+    data[tss[0].id] = (data[tss[0].id][0], data[tss[0].id][1] + 1.)
+    assert fake_client.timeseries.upload_data_points(data, manifest=manifest) == {tss[0].id: True, tss[1].id: True,
+                                                                                  tss[2].id: False}
+    for i, ts in enumerate(tss):
+        dps = fake_client.timeseries.get_data_points(ts.id, all_data=True)
+        assert np.array_equal(dps.value, data[ts.id][1])
+
+
+@pytest.mark.parametrize("binary, fmt, supported", [(True, "auto", True), (False, "auto", False),
+                                                    (True, "json", None)])
+def test_data_points_format(fake_config, binary, fmt, supported):
+    api = FakeAPI(FakeDatabase().populate(n_sensors=1, n_tests=1, n_samples=100), binary=binary)
+    with serve(api) as host, Client(fake_config.model_copy(update=dict(api_host=host, datapoints_format=fmt))) as c:
+        ts = c.floater_test.get()[0].timeseries()[0]
+        dps = c.timeseries.get_data_points(ts.id, all_data=True, cache=False)
+        assert np.array_equal(dps.value, api.db.datapoints[ts.id][1])
+        assert c.timeseries._npy_supported is supported
+
+        # binary upload once the API is known to support it, JSON otherwise
+        c.timeseries.add_data_points(ts.id, time=np.arange(10) / 10., values=np.arange(10.))
+        assert np.array_equal(api.db.datapoints[ts.id][1], np.arange(10.))
@@ -0,0 +1,43 @@
+"""
+Test tracing of SDK operations
+"""
+import json
+
+import pytest
+from modeltestsdk.tracing import Tracer
+
+
+def test_tracer():
+    tracer = Tracer()
+    with tracer.span("disabled") as args:
+        args["x"] = 1
+    assert len(tracer) == 0
+
+    tracer.enabled = True
+    with tracer.span("outer", cat="api", n=1):
+        with tracer.span("inner") as args:
+            args["status"] = 200
+    with pytest.raises(KeyError):
+        with tracer.span("failing"):
+            raise KeyError("x")
+
+    inner, outer, failing = tracer.to_chrome_trace()["traceEvents"][1:]
+    assert (inner["name"], inner["args"]) == ("inner", dict(status=200))
+    assert (outer["cat"], outer["args"]) == ("api", dict(n=1))
+    assert outer["ts"] <= inner["ts"] and inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+    assert "KeyError" in failing["args"]["error"]
+
+
+def test_client_trace(fake_client, tmp_path):
+    path = tmp_path / "trace.json"
+    with fake_client.trace(path):
+        tss = fake_client.floater_test.get()[0].timeseries()
+        tss.get_qats_tsdb(max_workers=2)
+    assert not fake_client.tracer.enabled
+
+    events = [e for e in json.loads(path.read_text())["traceEvents"] if e["ph"] == "X"]
+    names = {e["name"] for e in events}
+    assert {"FloaterTestAPI.get", "TestAPI.get_by_id", "TimeseriesAPI.get_data_points", "GET floatertest",
+            "GET timeseries/{id}/data", "TimeseriesList.get_qats_tsdb"} <= names
+    assert {e["cat"] for e in events} >= {"api", "http", "decode", "model", "conversion"}
+    assert all(e["args"].get("status") == 200 for e in events if e["cat"] == "http" and e["name"] != "POST auth/token")
@@ -0,0 +1,66 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from modeltestsdk import AsyncClient, Client
+from modeltestsdk.config import CacheConfig, Config
+from modeltestsdk.transport import ASGITransport, RequestsTransport, Transport, WSGITransport
+from tests.fake_api import FakeAPI, FakeDatabase
+
+
+@pytest.fixture()
+def local_config(tmp_path):
+    # nothing listens on this host, requests never leave the process
+    return Config(api_host="http://modeltest.local", api_user="tester", api_password="password", metrics=True,
+                  requests_compress=True, requests_compress_min_size=1000,
+                  cache_settings=CacheConfig(cache_name=str(tmp_path / "mtdb"), use_cache_dir=False))
+
+
+def test_default_transport(config):
+    client = Client(config)
+    assert isinstance(client.transport, RequestsTransport)
+
+
+@pytest.mark.parametrize("transport", [WSGITransport, lambda api: ASGITransport(api.asgi)])
+@pytest.mark.parametrize("datapoints_format", ["json", "npy"])
+def test_in_process_transport(local_config, transport, datapoints_format):
+    api = FakeAPI(FakeDatabase().populate(n_sensors=2, n_tests=1, n_samples=2000))
+    config = local_config.model_copy(update=dict(datapoints_format=datapoints_format))
+    with Client(config, transport=transport(api)) as client:
+        ts = client.floater_test.get()[0].timeseries()[0]
+        dps = client.timeseries.get_data_points(ts.id, all_data=True)
+        np.testing.assert_array_equal(dps.value, api.db.datapoints[ts.id][1])
+
+        # cached
+        client.timeseries.get_data_points(ts.id, all_data=True)
+        assert client.stats()["caches"]["datapoints"] == dict(hits=1, misses=1, hit_ratio=.5)
+
+        # compressed and binary uploads, errors
+        client.timeseries.add_data_points(ts.id, time=list(range(1000)), values=list(range(1000)))
+        assert api.db.datapoints[ts.id][1].tolist() == list(range(1000))
+        assert api.headers[-1]["Content-Encoding"] == "gzip"
+        with pytest.raises(Exception):
+            client.campaign.get_by_id("does-not-exist")
+
+
+def test_async_client_transport(local_config):
+    api = FakeAPI(FakeDatabase().populate(n_sensors=2, n_tests=1, n_samples=100))
+
+    async def main():
+        async with AsyncClient(local_config, transport=ASGITransport(api.asgi)) as client:
+            tss = await client.timeseries.get()
+            return tss, await asyncio.gather(*[client.timeseries.get_data_points(ts.id, all_data=True, cache=False)
+                                               for ts in tss])
+
+    tss, data = asyncio.run(main())
+    assert [dps.timeseries_id for dps in data] == [ts.id for ts in tss]
+    assert all(len(dps) == 100 for dps in data)
+
+
+def test_transport_abstract():
+    class Incomplete(Transport):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
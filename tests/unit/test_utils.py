@@ -1,4 +1,6 @@
+from modeltestsdk import utils
 from modeltestsdk.utils import make_serializable, to_snake_case, to_camel_case, from_datetime_string, format_class_name
+import json
 import numpy as np
 import pytest
 from datetime import datetime, timedelta
@@ -63,3 +65,72 @@ def test_from_datetime_string():
 def test_format_class_name():
     assert format_class_name('TestAPI') == 'test'
     assert format_class_name('TestTingAPI') == 'testting'
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_to_json(use_orjson, monkeypatch):
+    if not use_orjson:
+        monkeypatch.setattr(utils, "orjson", None)
+    elif utils.orjson is None:
+        pytest.skip("orjson not installed")
+
+    data = {
+        'data': {'time': np.arange(4.), 'value': np.array([1., np.nan, np.inf, -np.inf], dtype=np.float32)},
+        'nan': np.float64('nan'),
+        'int': np.int64(3),
+        'date': datetime(2020, 1, 1, 12),
+        'duration': timedelta(seconds=3),
+        'id': UUID('4175bd27-62e5-46ad-bbce-2f37c131bdb6'),
+        'list': [np.arange(5)[::2], 'NaN', float('nan'), None],
+        'objects': np.array(['a', None], dtype=object),
+    }
+    assert json.loads(utils.to_json(data)) == {
+        'data': {'time': [0., 1., 2., 3.], 'value': [1., None, None, None]},
+        'nan': None,
+        'int': 3,
+        'date': '2020-01-01T12:00:00',
+        'duration': 3.,
+        'id': '4175bd27-62e5-46ad-bbce-2f37c131bdb6',
+        'list': [[0, 2, 4], 'NaN', None, None],
+        'objects': ['a', None],
+    }
+    assert json.loads(utils.to_json([np.arange(3.)])) == [[0., 1., 2.]]
+    assert json.loads(utils.to_json([np.array([[1., np.nan], [np.inf, 2.]])])) == [[[1., None], [None, 2.]]]
+
+
+@pytest.mark.parametrize("value", [
+    np.arange(5.),
+    np.array([1., np.nan, 3., np.inf, -np.inf]),
+    np.ma.masked_array([1., 2., np.nan, 4.], mask=[False, True, False, False]),
+])
+def test_to_json_arrays(value, monkeypatch):
+    # arrays spliced into the document give the same JSON as the json module
+    monkeypatch.setattr(utils, "orjson", None)
+    values = [v if v is not None and np.isfinite(v) else None for v in value.tolist()]
+    expected = json.dumps(dict(time=[0, 1], data=dict(value=values)), separators=(",", ":")).encode()
+    assert utils.to_json(dict(time=[0, 1], data=dict(value=value))) == expected
+
+
+def test_post_arrays(fake_client):
+    ts = fake_client.floater_test.get()[0].timeseries()[0]
+    value = np.array([1., np.nan, 3.])
+    ts.add_data(np.arange(3.), value)
+    dps = fake_client.timeseries.get_data_points(ts.id, all_data=True)
+    assert np.array_equal(dps.value, value, equal_nan=True)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_parse_json_arrays(chunk_size):
+    time, value = np.arange(1000) / 3., np.linspace(-1e10, 1e-10, 1000)
+    doc = json.dumps({'data': {'time': time.tolist(), 'value': [None] + value[1:].tolist()}, 'x': [1]}).encode()
+    chunks = [doc[i:i + chunk_size] for i in range(0, len(doc), chunk_size)]
+    t, v = utils.parse_json_arrays(chunks, ('time', 'value'))
+    assert np.array_equal(t, time) and np.isnan(v[0]) and np.array_equal(v[1:], value[1:])
+    assert utils.parse_json_arrays([b'{"value": [], "time": [1]}'], ('time', 'value'))[1].size == 0
+
+    with pytest.raises(ValueError):
+        utils.parse_json_arrays([b'{"time": [1, 2]}'], ('time', 'value'))
+    with pytest.raises(ValueError):
+        utils.parse_json_arrays([b'{"time": [1, 2'], ('time',))
+    with pytest.raises(ValueError):
+        utils.parse_json_arrays([b'{"time": [1, "a"]}'], ('time',))